@@ -0,0 +1,311 @@
+"""Alert rules evaluated on their own thread, with history and live fan-out.
+
+Each camera can have ``alert_rules``, a list of JSON objects:
+
+    {"type": "presence", "class_name": "person", "seconds": 10}
+    {"type": "count", "class_name": "person", "threshold": 5}
+    {"type": "zone_entry", "class_name": "person", "zone": [[0.1, 0.5], [0.4, 0.5], [0.4, 0.9]]}
+
+``presence`` fires once the class has been in view for ``seconds``,
+``count`` when more than ``threshold`` objects of the class are in one frame
+and ``zone_entry`` when a tracked object's box centre moves into the polygon
+(0-1 frame fractions). ``class_name`` may be left out to match any class.
+Every rule waits ``cooldown`` seconds (default ALERT_COOLDOWN_SECONDS)
+before it fires again.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from queue import Queue, Empty, Full
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from .monitoring.metrics import metrics
+from .renderer import DETECTION_COLORS, FrameDetections
+from .roi import parse_roi
+
+# Alert configuration (overridable through the environment)
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "1000"))
+ALERT_HISTORY = int(os.getenv("ALERT_HISTORY", "200"))
+ALERT_COOLDOWN_SECONDS = float(os.getenv("ALERT_COOLDOWN_SECONDS", "60"))
+ALERT_DEFAULT_RULES = os.getenv("ALERT_DEFAULT_RULES", "")  # JSON rules for cameras without their own
+
+ALERT_KEEPALIVE_SECONDS = 15.0  # SSE comment sent when no alert went out for this long
+SUBSCRIBER_QUEUE_SIZE = 100  # Alerts buffered per SSE client before it misses some
+RULE_TYPES = ("presence", "count", "zone_entry")
+
+
+def parse_alert_rules(value) -> Optional[List[Dict]]:
+    """Validate a camera's alert rules and fill in their defaults"""
+    if value is None or value == [] or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise ValueError("alert_rules must be a JSON list of rules")
+    if not isinstance(value, list) or not all(isinstance(rule, dict) for rule in value):
+        raise ValueError("alert_rules must be a list of rule objects")
+
+    rules = []
+    for rule in value:
+        rule_type = rule.get("type")
+        if rule_type not in RULE_TYPES:
+            raise ValueError(f"Unknown alert rule type {rule_type!r}; choose from {list(RULE_TYPES)}")
+        class_name = rule.get("class_name") or None
+        if class_name is not None and class_name not in DETECTION_COLORS:
+            raise ValueError(f"Unsupported class {class_name!r}; choose from {sorted(DETECTION_COLORS)}")
+        cooldown = rule.get("cooldown", ALERT_COOLDOWN_SECONDS)
+        if not isinstance(cooldown, (int, float)) or cooldown < 0:
+            raise ValueError("cooldown must be a number of seconds >= 0")
+
+        parsed = {
+            "type": rule_type,
+            "class_name": class_name,
+            "cooldown": float(cooldown),
+            "name": str(rule.get("name") or f"{rule_type} {class_name or 'any'}"),
+        }
+        if rule_type == "presence":
+            seconds = rule.get("seconds")
+            if not isinstance(seconds, (int, float)) or seconds <= 0:
+                raise ValueError("presence rules need seconds > 0")
+            parsed["seconds"] = float(seconds)
+        elif rule_type == "count":
+            threshold = rule.get("threshold")
+            if not isinstance(threshold, int) or threshold < 0:
+                raise ValueError("count rules need an integer threshold >= 0")
+            parsed["threshold"] = threshold
+        else:
+            try:
+                parsed["zone"] = parse_roi([rule.get("zone")])[0]
+            except ValueError as e:
+                raise ValueError(f"zone_entry zone: {e}")
+        rules.append(parsed)
+    return rules
+
+
+@dataclass(frozen=True)
+class Observation:
+    """One analysed frame as the alert engine sees it; arrays are shared, not copied"""
+    camera_id: int
+    timestamp: float
+    class_names: List[str]
+    boxes: np.ndarray
+    track_ids: Optional[np.ndarray]
+    frame_size: Tuple[int, int]  # (width, height)
+
+
+@dataclass
+class RuleState:
+    """What a rule remembers about one camera between frames"""
+    last_fired: float = float("-inf")
+    present_since: Optional[float] = None
+    inside: Set[int] = field(default_factory=set)  # Track ids in the zone on the last frame
+
+
+class AlertEngine:
+    """Evaluates alert rules against every analysed frame, away from the camera threads.
+
+    Camera threads call ``submit``, which only queues a reference to the
+    frame's detections; when the queue is full the frame is skipped rather
+    than stalling inference. An engine thread evaluates each camera's rules,
+    keeps the last ``history`` alerts and pushes new ones to every
+    subscribed SSE client.
+    """
+
+    def __init__(self, rules_for: Callable[[int], Optional[List[Dict]]],
+                 camera_name: Callable[[int], str],
+                 max_queue: int = ALERT_QUEUE_SIZE,
+                 history: int = ALERT_HISTORY,
+                 default_rules: str = ALERT_DEFAULT_RULES):
+        self.rules_for = rules_for
+        self.camera_name = camera_name
+        self.default_rules = parse_alert_rules(default_rules) or []
+        self._queue: "Queue[Observation | int]" = Queue(maxsize=max_queue)
+        self._history: deque = deque(maxlen=max(1, history))
+        # Per camera: the rules its states belong to, and one state per rule in the same order
+        self._states: Dict[int, Tuple[List[Dict], List[RuleState]]] = {}
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        metrics.alert_queue_depth.set_function(self._queue.qsize)
+
+    def start(self):
+        """Start the rule evaluation thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="🚨 Alert Engine",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, camera_id: int, detections: FrameDetections, frame_shape) -> bool:
+        """Queue a frame's detections for evaluation; False if it had to be skipped"""
+        observation = Observation(
+            camera_id=camera_id,
+            timestamp=time.time(),
+            class_names=detections.class_names,
+            boxes=detections.boxes,
+            track_ids=detections.track_ids,
+            frame_size=(frame_shape[1], frame_shape[0])
+        )
+        try:
+            self._queue.put_nowait(observation)
+            return True
+        except Full:
+            metrics.record_alert_observation_dropped()
+            return False
+
+    def forget(self, camera_id: int, timeout: float = 1.0):
+        """Drop a stopped camera's rule states once its queued frames have been evaluated"""
+        try:
+            self._queue.put(camera_id, timeout=timeout)
+        except Full:
+            logging.warning(f"Alert queue full; rule states of camera {camera_id} are kept")
+
+    def recent(self, camera_id: Optional[int] = None, after_id: int = 0) -> List[Dict]:
+        """Alerts still in the history, newest first"""
+        with self._lock:
+            alerts = list(self._history)
+        return [
+            alert for alert in reversed(alerts)
+            if alert["id"] > after_id and (camera_id is None or alert["camera_id"] == camera_id)
+        ]
+
+    @contextlib.contextmanager
+    def subscribe(self):
+        """asyncio.Queue receiving every new alert while the context is open"""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.append(subscriber)
+        try:
+            yield subscriber[1]
+        finally:
+            with self._lock:
+                self._subscribers.remove(subscriber)
+
+    def _run(self):
+        while self._running:
+            try:
+                observation = self._queue.get(timeout=0.5)
+            except Empty:
+                continue
+            if not isinstance(observation, Observation):
+                self._states.pop(observation, None)  # Queued by forget()
+                continue
+            try:
+                self._evaluate(observation)
+            except Exception as e:
+                logging.error(f"Error evaluating alert rules for camera {observation.camera_id}: {str(e)}")
+
+    def _evaluate(self, observation: Observation):
+        rules = self.rules_for(observation.camera_id) or self.default_rules
+        known = self._states.get(observation.camera_id)
+        if known is None or (known[0] is not rules and known[0] != rules):
+            # New camera or edited rules: start every rule afresh
+            known = self._states[observation.camera_id] = (rules, [RuleState() for _ in rules])
+        for rule, state in zip(*known):
+            details = getattr(self, f"_check_{rule['type']}")(rule, state, observation)
+            if details is None or observation.timestamp - state.last_fired < rule["cooldown"]:
+                continue
+            state.last_fired = observation.timestamp
+            self._publish(rule, observation, **details)
+
+    @staticmethod
+    def _matches(rule: Dict, observation: Observation) -> np.ndarray:
+        if rule["class_name"] is None:
+            return np.ones(len(observation.class_names), dtype=bool)
+        return np.array([name == rule["class_name"] for name in observation.class_names], dtype=bool)
+
+    def _check_presence(self, rule: Dict, state: RuleState, observation: Observation) -> Optional[Dict]:
+        # Only analysed frames arrive here (motion-skipped ones do not), so
+        # the class has left once an analysed frame no longer shows it
+        if not self._matches(rule, observation).any():
+            state.present_since = None
+            return None
+        now = observation.timestamp
+        if state.present_since is None:
+            state.present_since = now
+        seconds = now - state.present_since
+        if seconds < rule["seconds"]:
+            return None
+        return {"message": f"{rule['class_name'] or 'object'} present for {seconds:.1f}s",
+                "seconds": round(seconds, 1)}
+
+    def _check_count(self, rule: Dict, state: RuleState, observation: Observation) -> Optional[Dict]:
+        count = int(self._matches(rule, observation).sum())
+        if count <= rule["threshold"]:
+            return None
+        return {"message": f"{count} {rule['class_name'] or 'object'} detections (more than {rule['threshold']})",
+                "count": count}
+
+    def _check_zone_entry(self, rule: Dict, state: RuleState, observation: Observation) -> Optional[Dict]:
+        matches = self._matches(rule, observation)
+        if observation.track_ids is None or not matches.any():
+            state.inside = set()
+            return None
+        width, height = observation.frame_size
+        zone = (np.array(rule["zone"]) * [width, height]).astype(np.float32)
+        boxes = observation.boxes[matches]
+        centres = (boxes[:, :2] + boxes[:, 2:]) / 2
+        inside = {
+            int(track_id)
+            for track_id, (x, y) in zip(observation.track_ids[matches], centres)
+            if cv2.pointPolygonTest(zone, (float(x), float(y)), False) >= 0
+        }
+        entered = sorted(inside - state.inside)
+        state.inside = inside
+        if not entered:
+            return None
+        return {"message": f"{rule['class_name'] or 'object'} #{entered[0]} entered {rule['name']}",
+                "track_ids": entered}
+
+    def _publish(self, rule: Dict, observation: Observation, message: str, **details):
+        with self._lock:
+            self._last_id += 1
+            alert = {
+                "id": self._last_id,
+                "camera_id": observation.camera_id,
+                "camera_name": self.camera_name(observation.camera_id),
+                "rule": rule["name"],
+                "type": rule["type"],
+                "class_name": rule["class_name"],
+                "message": message,
+                "timestamp": datetime.utcfromtimestamp(observation.timestamp).isoformat(),
+                **details,
+            }
+            self._history.append(alert)
+            subscribers = list(self._subscribers)
+        metrics.record_alert(str(observation.camera_id), rule["type"])
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, alert)
+            except RuntimeError:
+                pass  # The client's event loop has already closed
+
+
+def _offer(queue: asyncio.Queue, alert: Dict):
+    try:
+        queue.put_nowait(alert)
+    except asyncio.QueueFull:
+        pass  # A slow client misses alerts; it can catch up from the history with Last-Event-ID
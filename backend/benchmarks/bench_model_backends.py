@@ -0,0 +1,150 @@
+"""Compare latency and accuracy of the model backends on a set of test frames.
+
+Every backend runs the same frames; its detections are matched (same class,
+IoU >= 0.5) against the PyTorch model's, which serve as the reference.
+Frames default to the sample images bundled with ultralytics; pass a
+directory of images or a video with --frames to use footage from your own
+cameras. Missing exports are created in MODEL_EXPORT_DIR first.
+
+Usage:
+    python -m backend.benchmarks.bench_model_backends --backend pytorch onnx onnx-int8 --iterations 20
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from ultralytics.utils import ASSETS
+
+from backend.model_export import MODEL_BACKENDS, MODEL_WEIGHTS, load_model
+from backend.tracker import box_iou
+
+MATCH_IOU = 0.5
+
+
+def load_frames(source, limit):
+    """Images from a directory (or a single image), or frames spread over a video"""
+    path = Path(source)
+    if path.is_dir():
+        images = sorted(p for p in path.iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".bmp"))
+        return [cv2.imread(str(p)) for p in images[:limit]]
+    if path.suffix.lower() in (".jpg", ".jpeg", ".png", ".bmp"):
+        return [cv2.imread(str(path))]
+
+    cap = cv2.VideoCapture(str(path))
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or limit
+    frames = []
+    for index in np.linspace(0, total - 1, min(limit, total)).astype(int):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+        ok, frame = cap.read()
+        if ok:
+            frames.append(frame)
+    cap.release()
+    return frames
+
+
+def detections(result):
+    """(boxes, classes, confidences) of one YOLO result"""
+    data = result.boxes.data.cpu().numpy() if result.boxes is not None else np.zeros((0, 6))
+    return data[:, :4], data[:, 5].astype(int), data[:, 4]
+
+
+def compare(reference, candidate):
+    """Greedy same-class IoU matching; returns (matches, IoUs, confidence differences)"""
+    ref_boxes, ref_classes, ref_conf = reference
+    boxes, classes, conf = candidate
+    if not len(ref_boxes) or not len(boxes):
+        return 0, [], []
+    iou = box_iou(ref_boxes, boxes)
+    iou[ref_classes[:, None] != classes[None, :]] = 0.0
+    ious, conf_diffs = [], []
+    while True:
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] < MATCH_IOU:
+            break
+        ious.append(float(iou[i, j]))
+        conf_diffs.append(abs(float(ref_conf[i] - conf[j])))
+        iou[i, :] = 0.0
+        iou[:, j] = 0.0
+    return len(ious), ious, conf_diffs
+
+
+def run_backend(model_type, backend, frames, iterations, imgsz, conf):
+    """Per-frame detections of the first pass and the latency of every pass"""
+    model = load_model(model_type, backend)
+    model(frames[0], verbose=False, imgsz=imgsz, conf=conf)  # Warm-up
+    outputs, durations = [], []
+    for iteration in range(iterations):
+        for frame in frames:
+            start_time = time.perf_counter()
+            result = model(frame, verbose=False, imgsz=imgsz, conf=conf)[0]
+            durations.append(time.perf_counter() - start_time)
+            if iteration == 0:
+                outputs.append(detections(result))
+    return outputs, np.asarray(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-type", default="objectDetection", choices=list(MODEL_WEIGHTS))
+    parser.add_argument("--backend", nargs="+", default=["pytorch", "onnx", "onnx-int8"],
+                        choices=list(MODEL_BACKENDS))
+    parser.add_argument("--frames", default=str(ASSETS), help="Image directory, image or video")
+    parser.add_argument("--max-frames", type=int, default=20)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--conf", type=float, default=0.25, help="Confidence threshold for all backends")
+    parser.add_argument("--iterations", type=int, default=10, help="Passes over the frames per backend")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    frames = [f for f in load_frames(args.frames, args.max_frames) if f is not None]
+    if not frames:
+        parser.error(f"No frames could be read from {args.frames}")
+
+    backends = ["pytorch"] + [b for b in args.backend if b != "pytorch"]
+    reference = None
+    results = []
+    for backend in backends:
+        outputs, durations = run_backend(
+            args.model_type, backend, frames, args.iterations, args.imgsz, args.conf
+        )
+        if reference is None:
+            reference = outputs
+
+        matched, ious, conf_diffs = 0, [], []
+        for ref, out in zip(reference, outputs):
+            count, frame_ious, frame_conf_diffs = compare(ref, out)
+            matched += count
+            ious += frame_ious
+            conf_diffs += frame_conf_diffs
+        ref_total = sum(len(r[0]) for r in reference)
+        total = sum(len(o[0]) for o in outputs)
+
+        results.append({
+            "backend": backend,
+            "mean_ms": round(float(durations.mean()) * 1000, 2),
+            "p95_ms": round(float(np.percentile(durations, 95)) * 1000, 2),
+            "speedup": round(float(results[0]["mean_ms"] / (durations.mean() * 1000)), 2) if results else 1.0,
+            "detections": total,
+            "recall_vs_pytorch": round(matched / ref_total, 4) if ref_total else None,
+            "precision_vs_pytorch": round(matched / total, 4) if total else None,
+            "mean_iou": round(float(np.mean(ious)), 4) if ious else None,
+            "mean_confidence_diff": round(float(np.mean(conf_diffs)), 4) if conf_diffs else None,
+        })
+        print(json.dumps(results[-1]), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "model_backends",
+                "model_type": args.model_type,
+                "frames": len(frames),
+                "imgsz": args.imgsz,
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Measure how many cameras one node can run through the live pipeline.
+
+Starts 1..N fake cameras and drives the real capture loop (FrameGrabber ->
+motion gate -> inference -> tracking/rendering -> FrameHub) with viewer
+threads pulling JPEGs from the hub, as the stream endpoints do. Cameras
+play local video files (round-robin over --source) or a generated scene
+with moving boxes, either at --fps or as fast as the pipeline allows
+(--fps 0). For every camera count it prints throughput, stage latency
+percentiles, CPU and RSS as JSON lines; --output writes them to a file so
+runs of different versions can be compared.
+
+The load controller is not started, so every camera keeps the requested
+rate and input size. No database is needed: events queue up in the
+(unstarted) event writer and are dropped once it is full. The fake cameras
+and every setting changed on ``backend.main`` are undone afterwards, so the
+benchmark can also be run from a live process.
+
+Usage:
+    python -m backend.benchmarks.bench_pipeline --cameras 1 2 4 8 --fps 15 --seconds 30
+    python -m backend.benchmarks.bench_pipeline --cameras 4 --fps 0 --source lobby.mp4 yard.mp4
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import cv2
+import numpy as np
+import psutil
+
+from backend import main as pipeline
+from backend.camera_registry import CameraInfo
+from backend.frame_grabber import FrameGrabber, camera_source
+from backend.frame_hub import JPEG_TIERS
+from backend.model_export import MODEL_BACKENDS, MODEL_WEIGHTS
+from backend.pipeline_stats import PIPELINE_STAGES, pipeline_stats
+from backend.process_pool import InferenceProcessPool
+
+SAMPLE_INTERVAL = 0.5  # Seconds between CPU/RSS samples
+
+
+def generate_video(path, width, height, fps, seconds=10, boxes=6):
+    """A textured background with boxes moving across it, so every frame has motion"""
+    rng = np.random.default_rng(0)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (0, 0), 5)
+    positions = rng.uniform(0, 1, (boxes, 2)) * [width, height]
+    velocities = rng.uniform(-1, 1, (boxes, 2)) * [width, height] / (fps * 4)
+    colors = rng.integers(0, 255, (boxes, 3)).tolist()
+    size = np.array([width, height]) // 8
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for _ in range(int(seconds * fps)):
+        frame = background.copy()
+        positions = (positions + velocities) % [width, height]
+        for (x, y), color in zip(positions.astype(int), colors):
+            cv2.rectangle(frame, (x, y), (x + size[0], y + size[1]), color, -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def process_tree():
+    """This process and its worker processes"""
+    process = psutil.Process()
+    return [process] + process.children(recursive=True)
+
+
+def cpu_seconds(processes):
+    total = 0.0
+    for process in processes:
+        try:
+            times = process.cpu_times()
+            total += times.user + times.system
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+def rss_bytes(processes):
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+def view(camera_id, tier, stop, served):
+    """Pull every new frame of a camera from the hub, like an MJPEG viewer"""
+    last_seq = 0
+    while not stop.is_set():
+        last_seq, jpeg = pipeline.frame_hub.wait_for_frame(camera_id, last_seq, timeout=0.5, tier=tier)
+        if jpeg is not None:
+            served[camera_id] += 1
+
+
+def start_cameras(count, sources, args):
+    """Start count pipeline threads the way /start_camera_stream does"""
+    cameras = [
+        CameraInfo(
+            id=camera_id, source_name=f"Bench {camera_id}", stream_type="File",
+            stream=sources[(camera_id - 1) % len(sources)], location=None, created_at=None,
+            model_backend=args.backend
+        )
+        for camera_id in range(1, count + 1)
+    ]
+    pipeline.camera_registry.set_cameras(cameras)  # No database needed
+
+    model = None
+    if pipeline.inference_pool is None:
+        model = pipeline.model_registry.get(args.model_type, args.backend)
+    threads = {}
+    for camera in cameras:
+        camera_id = camera.id
+        pipeline.camera_models[camera_id] = model
+        pipeline.camera_model_types[camera_id] = args.model_type
+        pipeline.frame_grabbers[camera_id] = FrameGrabber(
+            camera_id, camera_source(camera.stream), fps=args.fps
+        )
+        pipeline.camera_running[camera_id] = True
+        threads[camera_id] = threading.Thread(
+            target=pipeline.capture_frames_for_camera, args=(camera_id,), daemon=True
+        )
+        threads[camera_id].start()
+    return threads
+
+
+def stop_cameras(threads):
+    for camera_id in threads:
+        pipeline.camera_running[camera_id] = False
+    for camera_id, thread in threads.items():
+        thread.join(timeout=10)
+        pipeline.frame_grabbers.pop(camera_id, None)
+        pipeline.frame_hub.remove(camera_id)
+        pipeline.camera_running.pop(camera_id, None)
+        pipeline.camera_models.pop(camera_id, None)
+        pipeline.camera_model_types.pop(camera_id, None)
+        if pipeline.inference_pool is not None:
+            pipeline.inference_pool.release(camera_id)
+
+
+@contextlib.contextmanager
+def pipeline_settings(args):
+    """Point backend.main at the benchmark's settings and restore its own afterwards"""
+    levels, pool = pipeline.load_controller.levels, pipeline.inference_pool
+    scheduler_running = pipeline.inference_scheduler.running
+    # One fixed level: no adaptation, every camera at the requested rate and size
+    pipeline.load_controller.levels = [(args.fps, args.imgsz)]  # 0 fps is uncapped
+    if args.workers > 0:
+        pipeline.inference_pool = InferenceProcessPool(args.workers).start()
+    pipeline.inference_scheduler.start()
+    try:
+        yield
+    finally:
+        if not scheduler_running:
+            pipeline.inference_scheduler.stop()
+        if pipeline.inference_pool is not pool:
+            pipeline.inference_pool.stop()
+        pipeline.load_controller.levels, pipeline.inference_pool = levels, pool
+        pipeline.camera_registry.invalidate()  # Drops the fake cameras; the next lookup reads the database
+
+
+def run(count, sources, args):
+    """Run count cameras for the warm-up plus measurement time and summarise"""
+    threads = start_cameras(count, sources, args)
+    stop = threading.Event()
+    served = {camera_id: 0 for camera_id in threads}
+    viewers = [
+        threading.Thread(target=view, args=(camera_id, args.tier, stop, served), daemon=True)
+        for camera_id in threads for _ in range(args.viewers)
+    ]
+    for viewer in viewers:
+        viewer.start()
+    try:
+        time.sleep(args.warmup)
+        # Start the measurement with empty windows
+        for camera_id in threads:
+            pipeline_stats.remove(camera_id)
+        for camera_id in served:
+            served[camera_id] = 0
+        processes = process_tree()
+        start_cpu, start_time = cpu_seconds(processes), time.perf_counter()
+        rss_samples = []
+        deadline = start_time + args.seconds
+        while time.perf_counter() < deadline:
+            time.sleep(SAMPLE_INTERVAL)
+            rss_samples.append(rss_bytes(processes))
+        elapsed = time.perf_counter() - start_time
+        cpu = cpu_seconds(processes) - start_cpu
+
+        stages = {stage: pipeline_stats.stage_summary(stage) for stage in PIPELINE_STAGES}
+        per_camera = [
+            pipeline_stats.snapshot(camera_id)["cameras"].get(str(camera_id), {})
+            .get("stages", {}).get("end_to_end", {}).get("count", 0) / elapsed
+            for camera_id in threads
+        ]
+        decode_fps = [pipeline.frame_grabbers[camera_id].decode_fps for camera_id in threads]
+    finally:
+        stop.set()
+        stop_cameras(threads)
+        for viewer in viewers:
+            viewer.join(timeout=2)
+
+    frames = stages["end_to_end"]["count"]
+    cpu_percent = cpu / elapsed * 100
+    return {
+        "cameras": count,
+        "target_fps": args.fps or None,
+        "fps_total": round(frames / elapsed, 2),
+        "fps_per_camera_mean": round(float(np.mean(per_camera)), 2),
+        "fps_per_camera_min": round(float(np.min(per_camera)), 2),
+        "decode_fps_per_camera_mean": round(float(np.mean(decode_fps)), 2),
+        "served_fps_total": round(sum(served.values()) / elapsed, 2),
+        "latency_ms": {
+            stage: {k: v for k, v in summary.items() if k != "count"}
+            for stage, summary in stages.items() if summary["count"]
+        },
+        "cpu_percent": round(cpu_percent, 1),  # 100 = one core
+        "cpu_percent_per_camera": round(cpu_percent / count, 1),
+        "rss_mb_mean": round(float(np.mean(rss_samples)) / 2**20, 1),
+        "rss_mb_max": round(float(np.max(rss_samples)) / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Camera counts to measure")
+    parser.add_argument("--source", nargs="+", help="Video files the cameras play (default: generated)")
+    parser.add_argument("--fps", type=float, default=15.0, help="Frames per second per camera; 0 for as fast as possible")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--width", type=int, default=1280, help="Size of the generated video")
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--model-type", default="objectDetection", choices=list(MODEL_WEIGHTS))
+    parser.add_argument("--backend", default="pytorch", choices=list(MODEL_BACKENDS))
+    parser.add_argument("--workers", type=int, default=0, help="Inference worker processes; 0 runs in-process")
+    parser.add_argument("--viewers", type=int, default=1, help="Stream viewers per camera")
+    parser.add_argument("--tier", default="medium", choices=list(JPEG_TIERS))
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds before measuring")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Measurement time per camera count")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    logging.getLogger("app").setLevel(logging.WARNING)  # Camera start banners
+    temp_dir = tempfile.TemporaryDirectory()
+    sources = args.source or [generate_video(
+        os.path.join(temp_dir.name, "scene.mp4"), args.width, args.height, args.fps or 30
+    )]
+
+    results = []
+    try:
+        with pipeline_settings(args):
+            for count in args.cameras:
+                results.append(run(count, sources, args))
+                print(json.dumps(results[-1]), flush=True)
+    finally:
+        temp_dir.cleanup()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "pipeline",
+                "model_type": args.model_type,
+                "backend": args.backend,
+                "workers": args.workers,
+                "sources": args.source or [f"generated {args.width}x{args.height}"],
+                "fps": args.fps,
+                "imgsz": args.imgsz,
+                "viewers_per_camera": args.viewers,
+                "seconds": args.seconds,
+                "cpu_count": os.cpu_count(),
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
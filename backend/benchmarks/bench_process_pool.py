@@ -0,0 +1,92 @@
+"""Measure how process-pool throughput scales with the number of workers.
+
+Runs synthetic camera threads against InferenceProcessPool with 1..N workers
+and prints frames/s and latency per worker count as JSON.
+
+Usage:
+    python -m backend.benchmarks.bench_process_pool --max-workers 4 --seconds 20
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from backend.process_pool import InferenceProcessPool
+
+
+def run_cameras(pool, frames, cameras, model_type, seconds):
+    """Drive the pool from several camera threads and collect per-frame latencies"""
+    latencies = [[] for _ in range(cameras)]
+    deadline = time.perf_counter() + seconds
+
+    def camera_loop(camera_id):
+        i = 0
+        while time.perf_counter() < deadline:
+            start_time = time.perf_counter()
+            pool.process(camera_id, model_type, frames[i % len(frames)], timeout=60)
+            latencies[camera_id].append(time.perf_counter() - start_time)
+            i += 1
+
+    threads = [threading.Thread(target=camera_loop, args=(c,)) for c in range(cameras)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.asarray(l) for l in latencies if l])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cameras", type=int, default=8, help="Concurrent camera threads")
+    parser.add_argument("--seconds", type=float, default=15.0, help="Measurement time per worker count")
+    parser.add_argument("--model-type", default="objectDetection")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Intra-op threads per worker; 0 splits the cores between the workers")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8) for _ in range(8)]
+
+    results = []
+    for workers in range(1, args.max_workers + 1):
+        pool = InferenceProcessPool(workers, threads=args.threads).start()
+        try:
+            # Let every worker load its model before measuring
+            run_cameras(pool, frames, workers, args.model_type, seconds=0.1)
+            latencies = run_cameras(pool, frames, args.cameras, args.model_type, args.seconds)
+        finally:
+            pool.stop()
+
+        fps = len(latencies) / args.seconds
+        results.append({
+            "workers": workers,
+            "threads_per_worker": pool.threads,
+            "frames": int(len(latencies)),
+            "fps": round(fps, 2),
+            "speedup": round(fps / results[0]["fps"], 2) if results else 1.0,
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+        })
+        print(json.dumps(results[-1]), flush=True)
+
+    report = {
+        "benchmark": "process_pool",
+        "model_type": args.model_type,
+        "cameras": args.cameras,
+        "frame_size": [args.width, args.height],
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
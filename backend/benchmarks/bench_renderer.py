@@ -0,0 +1,256 @@
+"""Compare the vectorized renderer with the per-box loop implementation.
+
+Builds synthetic YOLO results for crowded 1080p frames (20+ people with
+boxes, masks or keypoints) and times both implementations on them.
+
+Usage:
+    python -m backend.benchmarks.bench_renderer --people 25 --iterations 50
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+from backend.renderer import (
+    DETECTION_COLORS, KEYPOINT_COLOR, SKELETON_COLOR, annotate_result
+)
+
+LEGACY_SKELETON = [
+    [16,14], [14,12], [17,15], [15,13], [12,13], [6,12], [7,13],
+    [6,7], [6,8], [7,9], [8,10], [9,11], [2,3], [1,2], [1,3],
+    [2,4], [3,5], [4,6], [5,7]
+]
+NAMES = {0: "person", 1: "bicycle", 39: "bottle", 58: "potted plant"}
+
+
+def legacy_annotate(frame, result):
+    """The per-box / per-keypoint implementation the renderer replaced"""
+    annotated_frame = frame.copy()
+    # Handle pose estimation
+    if hasattr(result, 'keypoints') and result.keypoints is not None:
+        for person in result.keypoints:
+            keypoints = person.data[0].cpu().numpy()
+
+            # Draw keypoints
+            for kp in keypoints:
+                if kp[2] > 0.5:  # Confidence threshold
+                    x, y = int(kp[0]), int(kp[1])
+                    cv2.circle(annotated_frame, (x, y), 4, KEYPOINT_COLOR, -1)
+
+            # Draw skeleton
+            for connection in LEGACY_SKELETON:
+                start_idx = connection[0] - 1
+                end_idx = connection[1] - 1
+
+                if (keypoints[start_idx][2] > 0.5 and
+                    keypoints[end_idx][2] > 0.5):
+
+                    start_point = (int(keypoints[start_idx][0]),
+                         int(keypoints[start_idx][1]))
+                    end_point = (int(keypoints[end_idx][0]),
+                       int(keypoints[end_idx][1]))
+
+                    cv2.line(annotated_frame, start_point, end_point,
+                            SKELETON_COLOR, 2)
+
+    # Handle segmentation
+    if hasattr(result, 'masks') and result.masks is not None:
+        for i, mask in enumerate(result.masks):
+            try:
+                class_id = int(result.boxes[i].cls[0])
+                class_name = result.names[class_id]
+
+                if class_name in DETECTION_COLORS:
+                    mask_array = mask.data.cpu().numpy()[0]
+
+                    # Resize mask if needed
+                    if mask_array.shape[:2] != frame.shape[:2]:
+                        mask_array = cv2.resize(
+                            mask_array,
+                            (frame.shape[1], frame.shape[0]),
+                            interpolation=cv2.INTER_NEAREST
+                        )
+
+                    # Create and apply mask overlay
+                    binary_mask = (mask_array > 0.5).astype(np.uint8)
+                    color = DETECTION_COLORS[class_name]
+                    mask_overlay = np.zeros_like(frame)
+                    mask_overlay[binary_mask == 1] = color
+
+                    # Blend with original frame
+                    mask_area = (binary_mask > 0)
+                    annotated_frame[mask_area] = cv2.addWeighted(
+                        annotated_frame[mask_area],
+                        0.6,  # Original frame weight
+                        mask_overlay[mask_area],
+                        0.4,  # Mask weight
+                        0
+                    )
+
+            except Exception as e:
+                print(f"Error processing mask {i}: {str(e)}")
+                continue
+
+    # Handle object detection boxes
+    if hasattr(result, 'boxes') and result.boxes is not None:
+        for box in result.boxes:
+            try:
+                # Get box information
+                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+                class_id = int(box.cls[0])
+                confidence = float(box.conf[0])
+                class_name = result.names[class_id]
+
+                if class_name in DETECTION_COLORS:
+                    color = DETECTION_COLORS[class_name]
+                    # Draw bounding box
+                    cv2.rectangle(
+                        annotated_frame,
+                        (int(x1), int(y1)),
+                        (int(x2), int(y2)),
+                        color,
+                        2
+                    )
+
+                    # Add label
+                    label = f"{class_name} {confidence:.2f}"
+                    label_size, baseline = cv2.getTextSize(
+                        label,
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5,
+                        2
+                    )
+
+                    # Draw label background
+                    label_y = max(y1 - 10, label_size[1])
+                    cv2.rectangle(
+                        annotated_frame,
+                        (int(x1), int(label_y - label_size[1])),
+                        (int(x1 + label_size[0]), int(label_y + baseline)),
+                        color,
+                        cv2.FILLED
+                    )
+
+                    # Draw label text
+                    cv2.putText(
+                        annotated_frame,
+                        label,
+                        (int(x1), int(label_y)),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5,
+                        (255, 255, 255),
+                        2
+                    )
+
+            except Exception as e:
+                print(f"Error processing box: {str(e)}")
+                continue
+
+    # Add frame metadata
+    cv2.putText(
+        annotated_frame,
+        f"Frame Size: {frame.shape[1]}x{frame.shape[0]}",
+        (10, 30),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (255, 255, 255),
+        2
+    )
+
+    return annotated_frame
+
+
+def synthetic_result(frame, task, people, extra_objects, rng):
+    """A YOLO Results object with `people` persons plus some other objects"""
+    height, width = frame.shape[:2]
+    count = people + extra_objects
+    x1 = rng.uniform(0, width - 200, count)
+    y1 = rng.uniform(0, height - 400, count)
+    w = rng.uniform(80, 200, count)
+    h = rng.uniform(200, 400, count)
+    classes = np.concatenate([
+        np.zeros(people),
+        rng.choice([1, 39, 58], extra_objects)
+    ])
+    boxes = torch.tensor(np.stack([
+        x1, y1, x1 + w, y1 + h, rng.uniform(0.3, 0.99, count), classes
+    ], axis=1), dtype=torch.float32)
+
+    masks = keypoints = None
+    if task == "segment":
+        # Masks at the letterboxed model resolution, as YOLO returns them
+        mask_h, mask_w = 384, 640
+        scale = mask_w / width
+        pad_y = (mask_h - height * scale) / 2
+        masks = torch.zeros((count, mask_h, mask_w))
+        for i in range(count):
+            cx = int((x1[i] + w[i] / 2) * scale)
+            cy = int((y1[i] + h[i] / 2) * scale + pad_y)
+            yy, xx = np.ogrid[:mask_h, :mask_w]
+            ellipse = ((xx - cx) / (w[i] * scale / 2)) ** 2 + ((yy - cy) / (h[i] * scale / 2)) ** 2 <= 1
+            masks[i] = torch.from_numpy(ellipse.astype(np.float32))
+        boxes = boxes[:count]
+    elif task == "pose":
+        boxes = boxes[:people]
+        joints = np.stack([
+            x1[:people, None] + rng.uniform(0, 1, (people, 17)) * w[:people, None],
+            y1[:people, None] + rng.uniform(0, 1, (people, 17)) * h[:people, None],
+            rng.uniform(0.3, 1.0, (people, 17))
+        ], axis=2)
+        keypoints = torch.tensor(joints, dtype=torch.float32)
+
+    return Results(frame, path="synthetic", names=NAMES, boxes=boxes, masks=masks, keypoints=keypoints)
+
+
+def time_it(fn, iterations):
+    fn()  # Warm-up
+    durations = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--people", type=int, default=25)
+    parser.add_argument("--extra-objects", type=int, default=10, help="Detections of other classes")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8)
+
+    results = []
+    for task in ("detect", "segment", "pose"):
+        result = synthetic_result(frame, task, args.people, args.extra_objects, rng)
+        legacy = np.asarray(time_it(lambda: legacy_annotate(frame, result), args.iterations))
+        current = np.asarray(time_it(lambda: annotate_result(frame, result), args.iterations))
+        results.append({
+            "task": task,
+            "legacy_mean_ms": round(float(legacy.mean()) * 1000, 2),
+            "renderer_mean_ms": round(float(current.mean()) * 1000, 2),
+            "legacy_p95_ms": round(float(np.percentile(legacy, 95)) * 1000, 2),
+            "renderer_p95_ms": round(float(np.percentile(current, 95)) * 1000, 2),
+            "speedup": round(float(legacy.mean() / current.mean()), 2),
+        })
+        print(json.dumps(results[-1]), flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "renderer",
+                "frame_size": [1920, 1080],
+                "people": args.people,
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
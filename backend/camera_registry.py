@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .db_settings import SessionLocal
+from .models import Camera
+
+
+@dataclass(frozen=True)
+class CameraInfo:
+    """Read-only copy of a Camera row, safe to share between threads"""
+    id: int
+    source_name: str
+    stream_type: Optional[str]
+    stream: Optional[str]
+    location: Optional[str]
+    created_at: Optional[datetime]
+    motion_threshold: Optional[float] = None
+    priority: Optional[int] = None
+    roi: Optional[List] = None
+    allowed_classes: Optional[List[str]] = None
+    model_backend: Optional[str] = None
+    alert_rules: Optional[List[Dict]] = None
+
+    @classmethod
+    def from_row(cls, camera: Camera) -> "CameraInfo":
+        return cls(
+            id=camera.id,
+            source_name=camera.source_name,
+            stream_type=camera.stream_type,
+            stream=camera.stream,
+            location=camera.location,
+            created_at=camera.created_at,
+            motion_threshold=camera.motion_threshold,
+            priority=camera.priority,
+            roi=camera.roi,
+            allowed_classes=camera.allowed_classes,
+            model_backend=camera.model_backend,
+            alert_rules=camera.alert_rules
+        )
+
+    def to_dict(self) -> Dict:
+        """Shape returned by GET /api/cameras"""
+        data = asdict(self)
+        data["created_at"] = self.created_at.strftime("%Y-%m-%d %H:%M:%S") if self.created_at else None
+        return data
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names the current ETag (weak comparison, as for GET)"""
+    for tag in (if_none_match or "").split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+class CameraRegistry:
+    """All cameras held in memory so lookups never touch the database.
+
+    The table is read once and again only after ``invalidate()``, which
+    every endpoint that changes cameras calls. The serialized camera list
+    and its ETag are computed at load time, so polling clients cost a dict
+    lookup and, when nothing changed, an empty 304.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._cameras: Dict[int, CameraInfo] = {}
+        self._payload = b"[]"
+        self._etag = ""
+        self._stale = True
+
+    def load(self):
+        """(Re)read every camera from the database"""
+        db = self.session_factory()
+        try:
+            cameras = [CameraInfo.from_row(c) for c in db.query(Camera).order_by(Camera.id).all()]
+        finally:
+            db.close()
+        self.set_cameras(cameras)
+        logging.info(f"Camera registry loaded {len(cameras)} cameras")
+
+    def set_cameras(self, cameras: List[CameraInfo]):
+        """Replace the cached cameras, e.g. with fake ones for a benchmark"""
+        payload = json.dumps([c.to_dict() for c in cameras]).encode()
+        with self._lock:
+            self._cameras = {c.id: c for c in cameras}
+            self._payload = payload
+            self._etag = f'"{hashlib.sha1(payload).hexdigest()[:16]}"'
+            self._stale = False
+
+    def invalidate(self):
+        """Mark the cache stale; the next lookup reloads it"""
+        with self._lock:
+            self._stale = True
+
+    def _ensure_loaded(self):
+        if self._stale:
+            self.load()
+
+    def get(self, camera_id: int) -> Optional[CameraInfo]:
+        self._ensure_loaded()
+        return self._cameras.get(camera_id)
+
+    def name(self, camera_id: int) -> str:
+        """Display name of a camera, with a fallback for unknown ids"""
+        camera = self.get(camera_id)
+        return camera.source_name if camera else f"Camera {camera_id}"
+
+    def all(self) -> List[CameraInfo]:
+        self._ensure_loaded()
+        return list(self._cameras.values())
+
+    def live(self) -> List[CameraInfo]:
+        """Cameras with stream_type 'live'"""
+        return [c for c in self.all() if c.stream_type == 'live']
+
+    def snapshot(self) -> Tuple[str, bytes]:
+        """ETag and JSON body for GET /api/cameras"""
+        self._ensure_loaded()
+        with self._lock:
+            return self._etag, self._payload
+
+
+# Global registry instance
+camera_registry = CameraRegistry()
@@ -0,0 +1,297 @@
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from queue import Queue, Empty, Full
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .frame_hub import encode_jpeg
+from .monitoring.metrics import metrics
+
+# Clip configuration (overridable through the environment)
+CLIP_DIR = os.getenv("CLIP_DIR", "clips")
+CLIP_BUFFER_DIR = os.getenv("CLIP_BUFFER_DIR", os.path.join(CLIP_DIR, ".buffers"))  # tmpfs keeps writes off disk
+CLIP_BUFFER_MB = float(os.getenv("CLIP_BUFFER_MB", "64"))  # Ring buffer size per camera; 0 disables clips
+CLIP_PRE_SECONDS = float(os.getenv("CLIP_PRE_SECONDS", "5"))
+CLIP_POST_SECONDS = float(os.getenv("CLIP_POST_SECONDS", "5"))
+CLIP_FPS = float(os.getenv("CLIP_FPS", "10"))  # Most frames per second kept in the buffer
+CLIP_TIER = os.getenv("CLIP_TIER", "medium")  # JPEG tier the buffered frames are encoded with
+
+CLIP_INDEX_SLOTS = 8192  # Frames remembered per ring; enough for the buffer at any sensible frame size
+CLIP_QUEUE_SIZE = 64  # Frames waiting for the encoder, across all cameras
+CLIP_FOURCC = "mp4v"
+
+
+class FrameRing:
+    """Recent JPEG frames of one camera in a fixed-size memory-mapped file.
+
+    Frames are appended one after another and wrap to the start of the file
+    when they no longer fit before its end. Positions are kept as absolute
+    byte counts, so a frame is intact as long as its start lies within
+    ``capacity`` bytes of the write position. Readers copy frames out and
+    then check they were not overwritten meanwhile, so appends never wait
+    for a reader.
+    """
+
+    def __init__(self, path: str, capacity: int, slots: int = CLIP_INDEX_SLOTS):
+        self.path = path
+        self.capacity = capacity
+        self._data = np.memmap(path, dtype=np.uint8, mode="w+", shape=(capacity,))
+        self._times = np.zeros(slots, np.float64)
+        self._starts = np.zeros(slots, np.int64)
+        self._lengths = np.zeros(slots, np.int64)
+        self._count = 0    # Frames appended so far
+        self._written = 0  # Absolute byte position the next frame goes after
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, jpeg: bytes) -> bool:
+        """Store a frame, overwriting the oldest ones; only one thread may append"""
+        size = len(jpeg)
+        if size > self.capacity:
+            return False
+        start = self._written
+        offset = start % self.capacity
+        if offset + size > self.capacity:
+            # Skip the tail of the file rather than splitting the frame
+            start += self.capacity - offset
+            offset = 0
+        with self._lock:
+            # Move the write position first so readers see which frames are being overwritten
+            self._written = start + size
+        self._data[offset:offset + size] = np.frombuffer(jpeg, np.uint8)
+        with self._lock:
+            slot = self._count % len(self._times)
+            self._times[slot] = timestamp
+            self._starts[slot] = start
+            self._lengths[slot] = size
+            self._count += 1
+        return True
+
+    def frames(self, start_time: float, end_time: float) -> List[Tuple[float, bytes]]:
+        """Intact frames with timestamps in [start_time, end_time], oldest first"""
+        with self._lock:
+            count = min(self._count, len(self._times))
+            slots = (np.arange(self._count - count, self._count) % len(self._times))
+            times = self._times[slots]
+            keep = (times >= start_time) & (times <= end_time)
+            keep &= self._starts[slots] >= self._written - self.capacity
+            slots = slots[keep]
+            times, starts, lengths = times[keep], self._starts[slots], self._lengths[slots]
+
+        frames = []
+        for timestamp, start, length in zip(times, starts, lengths):
+            offset = int(start % self.capacity)
+            frames.append((float(timestamp), int(start), self._data[offset:offset + length].tobytes()))
+
+        with self._lock:
+            oldest = self._written - self.capacity
+        return [(timestamp, jpeg) for timestamp, start, jpeg in frames if start >= oldest]
+
+    def close(self):
+        del self._data
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+@dataclass(order=True)
+class ClipRequest:
+    due: float  # Wall-clock time once every frame of the clip has been buffered
+    order: int
+    camera_id: int = field(compare=False)
+    event_time: float = field(compare=False)
+    path: str = field(compare=False)
+    result: Future = field(compare=False, default_factory=Future)  # path once written, else None
+
+
+class ClipRecorder:
+    """Keeps recent frames of every camera and saves clips around detection events.
+
+    Camera threads hand over annotated frames with ``add_frame``, which
+    only queues them. An encoder thread JPEG-encodes them (at most ``fps``
+    per camera) into each camera's ``FrameRing``, so memory per camera is
+    fixed at ``buffer_mb`` whatever its frame rate. A writer thread saves
+    the ``pre_seconds`` before and ``post_seconds`` after each requested
+    event once they have been buffered; ``request_clip`` returns a future
+    of the clip's path, which is None if no clip could be written.
+    """
+
+    def __init__(self, clip_dir: str = CLIP_DIR, buffer_dir: str = CLIP_BUFFER_DIR,
+                 buffer_mb: float = CLIP_BUFFER_MB,
+                 pre_seconds: float = CLIP_PRE_SECONDS,
+                 post_seconds: float = CLIP_POST_SECONDS,
+                 fps: float = CLIP_FPS,
+                 tier: str = CLIP_TIER):
+        self.clip_dir = clip_dir
+        self.buffer_dir = buffer_dir
+        self.capacity = int(buffer_mb * 1024 * 1024)
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+        self.tier = tier
+        self._rings: Dict[int, FrameRing] = {}
+        self._last_added: Dict[int, float] = {}
+        self._frames: "Queue[Tuple[int, float, np.ndarray]]" = Queue(maxsize=CLIP_QUEUE_SIZE)
+        self._clips: List[ClipRequest] = []
+        self._clip_order = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def start(self):
+        """Start the encoder and writer threads"""
+        if not self.enabled or self._running:
+            return
+        os.makedirs(self.buffer_dir, exist_ok=True)
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._encode_frames, name="🎞️ Clip Encoder", daemon=True),
+            threading.Thread(target=self._write_clips, name="💾 Clip Writer", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop both threads; clips that are not due yet are abandoned and resolve to None"""
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        with self._condition:
+            abandoned, self._clips = self._clips, []
+        for request in abandoned:
+            request.result.set_result(None)
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
+
+    def add_frame(self, camera_id: int, frame: np.ndarray, timestamp: Optional[float] = None):
+        """Offer a camera's frame to its buffer without ever blocking the caller"""
+        if not self._running:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        if timestamp - self._last_added.get(camera_id, 0.0) < self.frame_interval:
+            return
+        try:
+            self._frames.put_nowait((camera_id, timestamp, frame))
+            self._last_added[camera_id] = timestamp
+        except Full:
+            metrics.record_clip_frame_dropped(str(camera_id))
+
+    def request_clip(self, camera_id: int, event_time: datetime, name) -> Optional[Future]:
+        """Schedule a clip around an event, as soon as it happens.
+
+        The future resolves to the clip's path relative to clip_dir once the
+        file is written, or to None if nothing was buffered or writing
+        failed. Returns None when clips are disabled.
+        """
+        if not self._running:
+            return None
+        if event_time.tzinfo is None:
+            event_time = event_time.replace(tzinfo=timezone.utc)  # Events are stored in naive UTC
+        path = os.path.join(str(camera_id), f"{event_time:%Y%m%d-%H%M%S}-{name}.mp4")
+        request = ClipRequest(
+            due=event_time.timestamp() + self.post_seconds,
+            order=next(self._clip_order),
+            camera_id=camera_id,
+            event_time=event_time.timestamp(),
+            path=path
+        )
+        with self._condition:
+            heapq.heappush(self._clips, request)
+            self._condition.notify()
+        return request.result
+
+    def _ring(self, camera_id: int) -> FrameRing:
+        ring = self._rings.get(camera_id)
+        if ring is None:
+            path = os.path.join(self.buffer_dir, f"camera-{camera_id}.ring")
+            ring = self._rings[camera_id] = FrameRing(path, self.capacity)
+        return ring
+
+    def _encode_frames(self):
+        while self._running:
+            try:
+                camera_id, timestamp, frame = self._frames.get(timeout=0.5)
+            except Empty:
+                continue
+            try:
+                self._ring(camera_id).append(timestamp, encode_jpeg(frame, self.tier))
+            except Exception as e:
+                logging.error(f"Error buffering frame for camera {camera_id}: {str(e)}")
+
+    def _write_clips(self):
+        while self._running:
+            with self._condition:
+                if not self._clips:
+                    self._condition.wait(timeout=1.0)
+                    continue
+                delay = self._clips[0].due - time.time()
+                if delay > 0:
+                    self._condition.wait(timeout=min(delay, 1.0))
+                    continue
+                request = heapq.heappop(self._clips)
+            request.result.set_result(request.path if self._write_clip(request) else None)
+
+    def _write_clip(self, request: ClipRequest) -> bool:
+        """Decode the buffered frames around an event and save them as a video; False if none was written"""
+        start_time = time.perf_counter()
+        ring = self._rings.get(request.camera_id)
+        frames = ring.frames(
+            request.event_time - self.pre_seconds, request.event_time + self.post_seconds
+        ) if ring is not None else []
+        if not frames:
+            logging.warning(f"No buffered frames for clip {request.path}")
+            metrics.record_clip("empty")
+            return False
+
+        target = os.path.join(self.clip_dir, request.path)
+        # Written under a hidden name first; VideoWriter picks the container from the extension
+        partial = os.path.join(os.path.dirname(target), f".partial-{os.path.basename(target)}")
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            span = frames[-1][0] - frames[0][0]
+            fps = (len(frames) - 1) / span if span > 0 else 1.0
+            writer = None
+            try:
+                for _, jpeg in frames:
+                    image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+                    if image is None:
+                        continue
+                    if writer is None:
+                        size = (image.shape[1], image.shape[0])
+                        writer = cv2.VideoWriter(partial, cv2.VideoWriter_fourcc(*CLIP_FOURCC), fps, size)
+                    elif (image.shape[1], image.shape[0]) != size:
+                        image = cv2.resize(image, size)  # The camera changed resolution mid-clip
+                    writer.write(image)
+            finally:
+                if writer is not None:
+                    writer.release()
+            if writer is None:
+                raise RuntimeError("no buffered frame could be decoded")
+            os.replace(partial, target)
+            metrics.record_clip("written", time.perf_counter() - start_time)
+            return True
+        except Exception as e:
+            logging.error(f"Error writing clip {request.path}: {str(e)}")
+            metrics.record_clip("error")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            return False
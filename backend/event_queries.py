@@ -0,0 +1,200 @@
+"""Paged reads and streaming exports of raw detection events.
+
+Pages are ordered newest first and use keyset pagination on
+``(timestamp, id)``: the cursor is the last row of the previous page, so
+every page is an index range scan however deep the client pages. Exports
+read the events through a server-side cursor in chunks of plain rows (no
+ORM objects) and stream CSV or Parquet, so memory stays constant whatever
+the size of the export.
+"""
+import base64
+import csv
+import io
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+
+from .models import DetectionEvent
+
+EVENT_EXPORT_CHUNK_ROWS = int(os.getenv("EVENT_EXPORT_CHUNK_ROWS", "5000"))  # Rows fetched per round trip
+
+EVENT_PAGE_MAX = 1000
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EVENT_COLUMNS = (
+    DetectionEvent.id,
+    DetectionEvent.timestamp,
+    DetectionEvent.camera_id,
+    DetectionEvent.camera_name,
+    DetectionEvent.model_type,
+    DetectionEvent.class_name,
+    DetectionEvent.track_id,
+    DetectionEvent.dwell_seconds,
+    DetectionEvent.clip_path,
+)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Events are stored as naive UTC; convert aware datetimes to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Which events to read; ``start`` is inclusive and ``end`` exclusive"""
+    camera_id: Optional[int] = None
+    model_type: Optional[str] = None
+    class_name: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    def apply(self, statement):
+        statement = statement.where(DetectionEvent.timestamp.is_not(None))
+        if self.camera_id is not None:
+            statement = statement.where(DetectionEvent.camera_id == self.camera_id)
+        if self.model_type:
+            statement = statement.where(DetectionEvent.model_type == self.model_type)
+        if self.class_name:
+            statement = statement.where(DetectionEvent.class_name == self.class_name)
+        if self.start is not None:
+            statement = statement.where(DetectionEvent.timestamp >= _naive_utc(self.start))
+        if self.end is not None:
+            statement = statement.where(DetectionEvent.timestamp < _naive_utc(self.end))
+        return statement
+
+
+def encode_cursor(timestamp: datetime, event_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{event_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(timestamp, id) of the last event of the previous page; ValueError if malformed"""
+    try:
+        timestamp, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(event_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def page(db, filters: EventFilter, limit: int = 100,
+         cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """One page of events, newest first, and the cursor of the next page (None at the end)"""
+    statement = filters.apply(select(*EVENT_COLUMNS))
+    if cursor:
+        timestamp, event_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(DetectionEvent.timestamp, DetectionEvent.id) < tuple_(timestamp, event_id)
+        )
+    statement = statement.order_by(DetectionEvent.timestamp.desc(), DetectionEvent.id.desc())
+    rows = db.execute(statement.limit(limit + 1)).mappings().all()
+
+    events = [dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(events[-1]["timestamp"], events[-1]["id"])
+    return events, next_cursor
+
+
+def check_export_format(export_format: str) -> str:
+    """Validate an export format before the response starts streaming"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}; choose from {sorted(EXPORT_FORMATS)}")
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+    return export_format
+
+
+def _row_chunks(engine, filters: EventFilter, chunk_rows: int) -> Iterator[List]:
+    """Matching events, oldest first, fetched chunk_rows at a time through a server-side cursor"""
+    statement = filters.apply(select(*EVENT_COLUMNS)).order_by(
+        DetectionEvent.timestamp, DetectionEvent.id
+    )
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_rows).execute(statement)
+        for rows in result.partitions():
+            yield rows
+
+
+def csv_chunks(engine, filters: EventFilter,
+               chunk_rows: int = EVENT_EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Events as CSV, one encoded chunk per fetched batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in EVENT_COLUMNS])
+    yield buffer.getvalue().encode()
+    for rows in _row_chunks(engine, filters, chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands back whatever was written since the last call"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_chunks(engine, filters: EventFilter,
+                   chunk_rows: int = EVENT_EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Events as a Parquet file, one row group per fetched batch of rows"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("timestamp", pa.timestamp("us")),
+        ("camera_id", pa.int64()),
+        ("camera_name", pa.string()),
+        ("model_type", pa.string()),
+        ("class_name", pa.string()),
+        ("track_id", pa.int64()),
+        ("dwell_seconds", pa.float64()),
+        ("clip_path", pa.string()),
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in _row_chunks(engine, filters, chunk_rows):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.take()
+    yield sink.take()  # Footer
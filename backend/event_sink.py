@@ -0,0 +1,131 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from queue import Queue, Empty, Full
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from .models import DetectionEvent
+from .rollups import increment_rollups
+from .monitoring.metrics import metrics
+
+# Event writer configuration (overridable through the environment)
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "10000"))
+EVENT_FLUSH_ROWS = int(os.getenv("EVENT_FLUSH_ROWS", "200"))
+EVENT_FLUSH_INTERVAL_MS = float(os.getenv("EVENT_FLUSH_INTERVAL_MS", "1000"))
+
+EVENT_STOP_POLL_SECONDS = 0.1  # Longest the writer waits before noticing stop()
+
+
+class EventSink:
+    """Collects detection events on a bounded queue and writes them in bulk.
+
+    Camera threads only pay for a ``put_nowait``; a background thread turns
+    the queue into multi-row INSERTs every ``flush_rows`` events or
+    ``flush_interval_ms``, whichever comes first. When the queue is full new
+    events are dropped (and counted) rather than stalling inference.
+    """
+
+    def __init__(self, session_factory, camera_name: Callable[[int], str],
+                 max_queue: int = EVENT_QUEUE_SIZE,
+                 flush_rows: int = EVENT_FLUSH_ROWS,
+                 flush_interval_ms: float = EVENT_FLUSH_INTERVAL_MS):
+        self.session_factory = session_factory
+        self.camera_name = camera_name
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000.0
+        self._queue: "Queue[Dict]" = Queue(maxsize=max_queue)
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        metrics.event_queue_depth.set_function(self._queue.qsize)
+
+    def start(self):
+        """Start the background writer"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="💾 Event Writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer after flushing every event still queued"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, class_name: str, model_type: str, camera_id: int,
+               timestamp: Optional[datetime] = None,
+               camera_name: Optional[str] = None,
+               track_id: Optional[int] = None,
+               dwell_seconds: Optional[float] = None,
+               clip_path: Optional[str] = None) -> bool:
+        """Queue an event for writing; returns False if it had to be dropped"""
+        row = {
+            "class_name": class_name,
+            "model_type": model_type,
+            "camera_id": camera_id,
+            "camera_name": camera_name or self.camera_name(camera_id),
+            "timestamp": timestamp or datetime.utcnow(),
+            "track_id": track_id,
+            "dwell_seconds": dwell_seconds,
+            "clip_path": clip_path,
+        }
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except Full:
+            metrics.record_dropped_events("queue_full")
+            return False
+
+    def _take_batch(self) -> List[Dict]:
+        """Wait for the first event, then collect until the batch is full or time is up"""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except Empty:
+            return []
+
+        deadline = time.perf_counter() + self.flush_interval
+        while len(batch) < self.flush_rows:
+            remaining = deadline - time.perf_counter()
+            waiting = remaining > 0 and self._running
+            try:
+                if waiting:
+                    # Wait in short slices so that stop() does not sit out the whole interval
+                    batch.append(self._queue.get(timeout=min(remaining, EVENT_STOP_POLL_SECONDS)))
+                else:
+                    # Out of time (or shutting down): take only what is already queued
+                    batch.append(self._queue.get_nowait())
+            except Empty:
+                if not waiting:
+                    break
+        return batch
+
+    def _run(self):
+        while self._running or not self._queue.empty():
+            batch = self._take_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, rows: List[Dict]):
+        """Write a batch of events with one multi-row INSERT and update the rollups"""
+        start_time = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(DetectionEvent), rows)
+            increment_rollups(db, rows)
+            db.commit()
+            metrics.record_event_flush(len(rows), time.perf_counter() - start_time)
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Error saving {len(rows)} events to database: {str(e)}")
+            metrics.record_dropped_events("db_error", len(rows))
+        finally:
+            db.close()
@@ -0,0 +1,300 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+import cv2
+import numpy as np
+
+from .monitoring.metrics import metrics
+from .replay import (
+    RECORDING_MAX_SECONDS, FrameRecorder, ReplayCapture, is_lockstep_source, is_replay_source
+)
+
+# Capture configuration (overridable through the environment)
+CAPTURE_BACKOFF_INITIAL = float(os.getenv("CAPTURE_BACKOFF_INITIAL", "0.5"))
+CAPTURE_BACKOFF_MAX = float(os.getenv("CAPTURE_BACKOFF_MAX", "30"))
+CAPTURE_STALL_SECONDS = float(os.getenv("CAPTURE_STALL_SECONDS", "5"))
+CAPTURE_FFMPEG_OPTIONS = os.getenv(
+    "CAPTURE_FFMPEG_OPTIONS", "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"
+)
+
+CAPTURE_TIMEOUT_MS = 5000  # Longest an open or a read of a network stream may block
+READ_ERROR_DELAY = 0.1  # Pause between failed reads before the stream counts as stalled
+FPS_WINDOW_SECONDS = 1.0  # Decode FPS is measured over windows this long
+NETWORK_SCHEMES = ("rtsp://", "rtsps://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+_ffmpeg_options_lock = threading.Lock()
+
+
+def camera_source(stream: Optional[str]) -> Union[int, str]:
+    """VideoCapture source for a camera's stream setting: a device index, URL or file path"""
+    stream = (stream or "").strip()
+    if not stream:
+        return 0  # Default webcam
+    if stream.isdigit():
+        return int(stream)
+    return stream
+
+
+def is_network_source(source: Union[int, str]) -> bool:
+    return isinstance(source, str) and source.lower().startswith(NETWORK_SCHEMES)
+
+
+def redact_source(source: Union[int, str]) -> str:
+    """Source for logs and the API, without any credentials in the URL"""
+    return re.sub(r"//[^/@]*@", "//***@", str(source))
+
+
+def open_capture(source: Union[int, str], stop: Optional[threading.Event] = None) -> cv2.VideoCapture:
+    """Open a source with options that keep latency low and calls bounded; stop interrupts replays"""
+    if is_replay_source(source):
+        return ReplayCapture(source, stop)
+    if is_network_source(source):
+        params = [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, CAPTURE_TIMEOUT_MS,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, CAPTURE_TIMEOUT_MS,
+        ]
+        # FFmpeg reads its options from the environment when a stream is opened
+        with _ffmpeg_options_lock:
+            previous = os.environ.get("OPENCV_FFMPEG_CAPTURE_OPTIONS")
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = CAPTURE_FFMPEG_OPTIONS
+            try:
+                cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params)
+            finally:
+                if previous is None:
+                    os.environ.pop("OPENCV_FFMPEG_CAPTURE_OPTIONS", None)
+                else:
+                    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = previous
+    else:
+        cap = cv2.VideoCapture(source)
+
+    # Keep OpenCV's own queue as short as the backend allows
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+@dataclass(frozen=True)
+class CapturedFrame:
+    """A decoded frame, its sequence number and when it was decoded (perf_counter clock)"""
+    seq: int
+    captured_at: float
+    image: np.ndarray
+
+
+class FrameGrabber:
+    """Opens a camera source on its own thread and keeps only the newest frame.
+
+    The grabber holds a single slot: every new frame replaces the previous
+    one, so a consumer that is slower than the camera always gets the most
+    recent frame instead of working through a backlog. Frames replaced before
+    anyone read them are counted as dropped.
+
+    The source (device index, RTSP/HTTP URL or video file) is reopened with
+    exponential backoff whenever it cannot be opened or stops delivering
+    frames for ``stall_seconds``. Video files are played at their own frame
+    rate (or ``fps``) and loop, so a recording can stand in for a live camera.
+    ``start_recording`` saves every decoded frame for exact replays later;
+    a ``replay://...?speed=0`` source is delivered in lockstep instead, each
+    frame waiting until the previous one has been read.
+    """
+
+    def __init__(self, camera_id, source: Union[int, str],
+                 backoff_initial: float = CAPTURE_BACKOFF_INITIAL,
+                 backoff_max: float = CAPTURE_BACKOFF_MAX,
+                 stall_seconds: float = CAPTURE_STALL_SECONDS,
+                 fps: Optional[float] = None):
+        self.camera_id = camera_id
+        self.source = source
+        self.backoff_initial = backoff_initial
+        self.backoff_max = max(backoff_initial, backoff_max)
+        self.stall_seconds = stall_seconds
+        self.fps = fps  # Playback rate for files: None uses the file's own, 0 decodes flat out
+        # Replays pace themselves from their recorded timestamps
+        self.is_file = (isinstance(source, str) and not is_network_source(source)
+                        and not is_replay_source(source))
+        self.lockstep = is_lockstep_source(source)
+        self.recorder: Optional[FrameRecorder] = None
+
+        self.state = "stopped"
+        self.decode_fps = 0.0
+        self.reconnects = 0
+        self.last_frame_at: Optional[float] = None
+
+        self._condition = threading.Condition()
+        self._frame: Optional[np.ndarray] = None
+        self._captured_at = 0.0
+        self._seq = 0       # Sequence number of the frame in the slot
+        self._read_seq = 0  # Sequence number of the last frame handed out
+        self._stop = threading.Event()
+        self._stop.set()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set()
+
+    def start(self):
+        """Start the capture thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"📷 Grabber {self.camera_id}",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the capture thread and wake any waiting reader"""
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self._set_state("stopped")
+        self.stop_recording()
+
+    def start_recording(self, path: str, max_seconds: float = RECORDING_MAX_SECONDS) -> FrameRecorder:
+        """Save every frame decoded from now on, with its capture time, as a recording"""
+        recorder = FrameRecorder(self.camera_id, path, max_seconds, source=redact_source(self.source))
+        self.recorder = recorder.start()
+        return recorder
+
+    def stop_recording(self) -> Optional[Dict]:
+        """Finish the current recording, if any, and return its metadata"""
+        recorder, self.recorder = self.recorder, None
+        return recorder.stop() if recorder is not None else None
+
+    def read_frame(self, timeout: float = 1.0) -> Optional[CapturedFrame]:
+        """Wait for a frame newer than the last one read and return it with its sequence number and decode time"""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._seq != self._read_seq or not self.running,
+                timeout=timeout
+            ):
+                return None
+            if self._seq == self._read_seq:
+                return None
+            self._read_seq = self._seq
+            self._condition.notify_all()  # Wakes a lockstep grabber waiting to read the next frame
+            return CapturedFrame(self._seq, self._captured_at, self._frame)
+
+    def status(self) -> Dict:
+        """Connection state and decode rate, as reported by the API"""
+        return {
+            "camera_id": self.camera_id,
+            "source": redact_source(self.source),
+            "state": self.state,
+            "decode_fps": round(self.decode_fps, 1),
+            "reconnects": self.reconnects,
+            "recording": self.recorder.info() if self.recorder is not None else None,
+            "last_frame_age": (
+                round(time.monotonic() - self.last_frame_at, 1) if self.last_frame_at else None
+            ),
+        }
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        metrics.record_capture_state(str(self.camera_id), state)
+        # Log transitions to and from live only, so a dead source does not flood the log
+        if state == "live":
+            logging.info(f"Camera {self.camera_id} is live ({redact_source(self.source)})")
+        elif previous == "live" and state != "stopped":
+            logging.warning(f"Camera {self.camera_id} is {state} ({redact_source(self.source)})")
+
+    def _run(self):
+        backoff = self.backoff_initial
+        while self.running:
+            self._set_state("connecting")
+            cap = open_capture(self.source, self._stop)
+            try:
+                if cap.isOpened() and self._read_frames(cap):
+                    backoff = self.backoff_initial  # The connection worked for a while
+            finally:
+                cap.release()
+
+            if not self.running:
+                break
+            self._set_state("stalled")
+            self.decode_fps = 0.0
+            metrics.record_decode_fps(str(self.camera_id), 0.0)
+            # Sleep without holding a core, waking early if the grabber is stopped
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.backoff_max)
+            self.reconnects += 1
+            metrics.record_capture_reconnect(str(self.camera_id))
+
+    def _read_frames(self, cap: cv2.VideoCapture) -> bool:
+        """Read until the source fails or stalls; True if any frame arrived"""
+        frame_interval = 0.0
+        if self.is_file and self.fps != 0:
+            fps = self.fps or cap.get(cv2.CAP_PROP_FPS)
+            frame_interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+        next_frame_at = time.monotonic()
+        last_success = time.monotonic()
+        window_start, window_frames = time.monotonic(), 0
+        got_frame = False
+        frames_since_rewind = 0
+
+        while self.running:
+            if self.lockstep:
+                # Hand over every frame: wait until the last one has been read
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._seq == self._read_seq or not self.running
+                    )
+                last_success = time.monotonic()
+            ret, frame = cap.read()
+            now = time.monotonic()
+            if not ret:
+                if not self.running:
+                    break  # A replay's wait was cut short by stop()
+                if self.is_file and frames_since_rewind and cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                    frames_since_rewind = 0
+                    continue  # End of the recording: loop it
+                self._set_state("stalled")
+                if now - last_success >= self.stall_seconds:
+                    return got_frame
+                self._stop.wait(READ_ERROR_DELAY)
+                continue
+
+            got_frame = True
+            frames_since_rewind += 1
+            last_success = self.last_frame_at = now
+            self._set_state("live")
+            with self._condition:
+                if self._seq != self._read_seq:
+                    # The previous frame was never consumed
+                    metrics.record_dropped_frame(str(self.camera_id))
+                self._frame = frame
+                self._captured_at = time.perf_counter()
+                self._seq += 1
+                self._condition.notify_all()
+
+            recorder = self.recorder
+            if recorder is not None and not recorder.done:
+                recorder.add(now, frame)  # Queues only; frames it cannot keep up with are dropped
+
+            window_frames += 1
+            if now - window_start >= FPS_WINDOW_SECONDS:
+                self.decode_fps = window_frames / (now - window_start)
+                metrics.record_decode_fps(str(self.camera_id), self.decode_fps)
+                window_start, window_frames = now, 0
+
+            if frame_interval:
+                # Play files in real time rather than as fast as they decode
+                next_frame_at = max(next_frame_at + frame_interval, now - frame_interval)
+                delay = next_frame_at - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+        return got_frame
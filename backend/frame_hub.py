@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .monitoring.metrics import metrics
+from .pipeline_stats import pipeline_stats
+
+
+def _parse_tiers(spec: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "name:max_width:quality,..." where a max_width of 0 keeps the native size"""
+    tiers = {}
+    for item in spec.split(","):
+        name, max_width, quality = item.strip().split(":")
+        tiers[name] = (int(max_width), int(quality))
+    return tiers
+
+# JPEG tiers viewers can ask for: name -> (max width, JPEG quality)
+JPEG_TIERS = _parse_tiers(os.getenv("JPEG_TIERS", "thumbnail:480:70,medium:960:80,full:0:90"))
+DEFAULT_TIER = "full"
+
+
+def encode_jpeg(image: np.ndarray, tier: str) -> bytes:
+    """Downscale an image to a tier's maximum width and JPEG-encode it at the tier's quality"""
+    max_width, quality = JPEG_TIERS[tier]
+    if max_width and image.shape[1] > max_width:
+        height = round(image.shape[0] * max_width / image.shape[1])
+        image = cv2.resize(image, (max_width, height), interpolation=cv2.INTER_AREA)
+    _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes()
+
+
+class PublishedFrame:
+    """An annotated frame plus the JPEG tiers encoded from it so far"""
+
+    def __init__(self, seq: int, frame: np.ndarray, camera_id: Optional[int] = None):
+        self.seq = seq
+        self.camera_id = camera_id
+        self.frame = frame
+        self._jpegs: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, tier: str) -> Optional[bytes]:
+        return self._jpegs.get(tier)
+
+    def encode(self, tier: str) -> bytes:
+        """Encode this frame for a tier once; later viewers share the result"""
+        with self._lock:
+            jpeg = self._jpegs.get(tier)
+            if jpeg is not None:
+                return jpeg
+
+            start_time = time.perf_counter()
+            jpeg = self._jpegs[tier] = encode_jpeg(self.frame, tier)
+            duration = time.perf_counter() - start_time
+            metrics.record_jpeg_encode(tier, duration)
+            if self.camera_id is not None:
+                pipeline_stats.record(self.camera_id, "encode", duration)
+            return jpeg
+
+
+class FrameHub:
+    """Holds the latest annotated frame per camera and wakes viewers when it changes.
+
+    Every published frame gets a sequence number. Viewers remember the last
+    sequence number they sent and wait for a newer one, so a slow viewer
+    simply skips to the newest frame instead of falling behind.
+
+    Frames are published raw and only encoded when a viewer asks for them,
+    at most once per tier, so a camera nobody is watching costs no encoding.
+    Camera threads publish; both threads (``wait_for_frame``) and asyncio
+    handlers (``next_frame``) can wait.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._frames: Dict[int, PublishedFrame] = {}
+        self._last_seq = 0
+        self._waiters: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._viewers: Dict[int, int] = {}
+
+    def publish(self, camera_id: int, frame: np.ndarray):
+        """Store a new frame for camera_id and wake everyone waiting on it"""
+        with self._condition:
+            self._last_seq += 1  # Shared counter so a restarted camera never repeats a number
+            self._frames[camera_id] = PublishedFrame(self._last_seq, frame, camera_id)
+            waiters = self._waiters.pop(camera_id, [])
+            self._condition.notify_all()
+        self._wake(waiters)
+
+    def remove(self, camera_id: int):
+        """Forget a stopped camera and release its viewers"""
+        with self._condition:
+            self._frames.pop(camera_id, None)
+            waiters = self._waiters.pop(camera_id, [])
+            self._condition.notify_all()
+        self._wake(waiters)
+
+    def latest(self, camera_id: int, tier: str = DEFAULT_TIER) -> Optional[bytes]:
+        """Return the newest frame for camera_id encoded for tier, if any"""
+        with self._condition:
+            entry = self._frames.get(camera_id)
+        return entry.encode(tier) if entry else None
+
+    def __contains__(self, camera_id: int) -> bool:
+        with self._condition:
+            return camera_id in self._frames
+
+    @contextlib.contextmanager
+    def subscribe(self, camera_id: int):
+        """Count a viewer of camera_id for as long as the context is open"""
+        with self._condition:
+            self._viewers[camera_id] = self._viewers.get(camera_id, 0) + 1
+            metrics.stream_viewers.labels(camera_id=str(camera_id)).set(self._viewers[camera_id])
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._viewers[camera_id] -= 1
+                metrics.stream_viewers.labels(camera_id=str(camera_id)).set(self._viewers[camera_id])
+
+    def viewers(self, camera_id: int) -> int:
+        """Number of open streams for camera_id"""
+        with self._condition:
+            return self._viewers.get(camera_id, 0)
+
+    def wait_for_frame(self, camera_id: int, last_seq: int = 0, timeout: float = 1.0,
+                       tier: str = DEFAULT_TIER) -> Tuple[int, Optional[bytes]]:
+        """Block until a frame newer than last_seq exists; (last_seq, None) on timeout"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._seq_of(camera_id, last_seq) != last_seq,
+                timeout=timeout
+            )
+            entry = self._frames.get(camera_id)
+        if entry is None or entry.seq == last_seq:
+            return last_seq, None
+        return entry.seq, entry.encode(tier)
+
+    async def next_frame(self, camera_id: int, last_seq: int = 0, timeout: float = 1.0,
+                         tier: str = DEFAULT_TIER) -> Tuple[int, Optional[bytes]]:
+        """Async version of wait_for_frame that does not tie up a thread per viewer"""
+        entry = await self._next_entry(camera_id, last_seq, timeout)
+        if entry is None:
+            return last_seq, None
+
+        jpeg = entry.cached(tier)
+        if jpeg is None:
+            # Encoding releases the GIL; keep it off the event loop
+            jpeg = await asyncio.to_thread(entry.encode, tier)
+        return entry.seq, jpeg
+
+    def _seq_of(self, camera_id: int, default: int) -> int:
+        entry = self._frames.get(camera_id)
+        return entry.seq if entry is not None else default
+
+    async def _next_entry(self, camera_id: int, last_seq: int,
+                          timeout: float) -> Optional[PublishedFrame]:
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            entry = self._frames.get(camera_id)
+            if entry is not None and entry.seq != last_seq:
+                return entry
+            waiter = loop.create_future()
+            self._waiters.setdefault(camera_id, []).append((loop, waiter))
+
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            with self._condition:
+                waiters = self._waiters.get(camera_id, [])
+                if (loop, waiter) in waiters:
+                    waiters.remove((loop, waiter))
+
+        with self._condition:
+            entry = self._frames.get(camera_id)
+        if entry is None or entry.seq == last_seq:
+            return None
+        return entry
+
+    @staticmethod
+    def _wake(waiters):
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, waiter)
+            except RuntimeError:
+                pass  # The viewer's event loop has already closed
+
+
+def _resolve(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from queue import Queue, Empty
+from typing import Any, Dict, List, Optional
+
+from .monitoring.metrics import metrics
+
+# Batching configuration (overridable through the environment)
+INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "8"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+
+
+@dataclass
+class InferenceRequest:
+    """A single frame waiting to be run through a model"""
+    model: Any
+    frame: Any
+    predict_kwargs: Dict[str, Any] = field(default_factory=dict)
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def group_key(self):
+        """Requests sharing a model and predict options can run in one call"""
+        options = tuple(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in sorted(self.predict_kwargs.items())
+        )
+        return id(self.model), options
+
+
+class InferenceScheduler:
+    """Collects frames from all camera threads and runs them as batched YOLO calls.
+
+    Camera threads call ``submit`` (or the blocking ``infer``) and get the
+    result for their own frame back. A single worker thread drains the queue,
+    waiting at most ``max_wait_ms`` after the first frame for up to
+    ``batch_size`` frames, so the model is only ever driven from one thread.
+    """
+
+    def __init__(self, batch_size: int = INFERENCE_BATCH_SIZE,
+                 max_wait_ms: float = INFERENCE_MAX_WAIT_MS):
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "Queue[InferenceRequest]" = Queue()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the batching worker thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run,
+            name="🧠 Inference Scheduler",
+            daemon=True
+        )
+        self._thread.start()
+        logging.info(
+            f"Inference scheduler started (batch_size={self.batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.1f})"
+        )
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the worker and fail any frames still waiting in the queue"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except Empty:
+                break
+            request.future.set_exception(RuntimeError("Inference scheduler stopped"))
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, model, frame, **predict_kwargs) -> Future:
+        """Queue a frame for inference and return a future for its result"""
+        if not self._running:
+            raise RuntimeError("Inference scheduler is not running")
+        request = InferenceRequest(model=model, frame=frame, predict_kwargs=predict_kwargs)
+        self._queue.put(request)
+        return request.future
+
+    def infer(self, model, frame, timeout: Optional[float] = None, **predict_kwargs):
+        """Run a frame through the shared scheduler and wait for its result"""
+        return self.submit(model, frame, **predict_kwargs).result(timeout=timeout)
+
+    def _collect_batch(self) -> List[InferenceRequest]:
+        """Block for the first frame, then gather more until full or the wait expires"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except Empty:
+            return []
+
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Take whatever is already queued without waiting any longer
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except Empty:
+                    break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            groups: Dict[Any, List[InferenceRequest]] = {}
+            for request in batch:
+                groups.setdefault(request.group_key, []).append(request)
+
+            for requests in groups.values():
+                self._run_group(requests)
+
+    def _run_group(self, requests: List[InferenceRequest]):
+        """Run one batched model call and hand each result back to its camera"""
+        model = requests[0].model
+        model_type = getattr(model, "task", "unknown")
+        started_at = time.perf_counter()
+        metrics.record_inference_batch(
+            model_type=model_type,
+            batch_size=len(requests),
+            queue_waits=[started_at - r.enqueued_at for r in requests]
+        )
+
+        try:
+            results = model([r.frame for r in requests], verbose=False,
+                            **requests[0].predict_kwargs)
+        except Exception as e:
+            logging.error(f"Batched inference failed ({len(requests)} frames): {str(e)}")
+            metrics.record_error(
+                camera_id="all",
+                error_type=type(e).__name__,
+                component="inference_scheduler"
+            )
+            for request in requests:
+                request.future.set_exception(e)
+            return
+
+        for request, result in zip(requests, results):
+            request.future.set_result(result)
@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psutil
+
+from .monitoring.metrics import metrics
+
+# Load controller configuration (overridable through the environment)
+LOAD_CPU_BUDGET = float(os.getenv("LOAD_CPU_BUDGET", "85"))  # Percent of all cores
+# Frame rates best first; 0 leaves the camera uncapped (as fast as its source and the pipeline allow)
+LOAD_FPS_STEPS = [float(f) for f in os.getenv("LOAD_FPS_STEPS", "0,15,10,6,3,1").split(",")]
+LOAD_IMGSZ_STEPS = [int(s) for s in os.getenv("LOAD_IMGSZ_STEPS", "640,480,320").split(",")]
+LOAD_CONTROL_INTERVAL = float(os.getenv("LOAD_CONTROL_INTERVAL", "2"))
+
+LOAD_HEADROOM = 15.0  # Percentage points below the budget before anything ramps back up
+LOAD_MAX_QUEUE_PER_CAMERA = 1.0  # Queued frames per camera that count as overload
+DURATION_SMOOTHING = 0.2  # Weight of the newest frame in the per-camera duration average
+
+
+def build_levels(fps_steps: List[float], imgsz_steps: List[int]) -> List[Tuple[float, int]]:
+    """Quality ladder from best to cheapest, lowering frame rate and input size in turn"""
+    f = i = 0
+    levels = [(fps_steps[0], imgsz_steps[0])]
+    while f < len(fps_steps) - 1 or i < len(imgsz_steps) - 1:
+        if (f <= i or i == len(imgsz_steps) - 1) and f < len(fps_steps) - 1:
+            f += 1
+        else:
+            i += 1
+        levels.append((fps_steps[f], imgsz_steps[i]))
+    return levels
+
+LOAD_LEVELS = build_levels(LOAD_FPS_STEPS, LOAD_IMGSZ_STEPS)
+
+
+def describe_fps(fps: float) -> str:
+    return f"{fps:g} fps" if fps > 0 else "uncapped fps"
+
+
+@dataclass
+class CameraLoad:
+    """What the controller knows about one camera"""
+    camera_id: int
+    priority: int = 0
+    level: int = 0
+    frame_duration: float = 0.0  # Smoothed seconds spent per analysed frame
+
+
+class LoadController:
+    """Sets each camera's analysis frame rate and inference size from system load.
+
+    Every ``interval`` seconds it compares CPU use with ``cpu_budget`` and
+    checks how deep the inference queue is. When overloaded, it moves the
+    most expensive of the lowest-priority cameras one step down the
+    ``LOAD_LEVELS`` ladder. With headroom to spare, it moves the most degraded
+    of the highest-priority cameras one step back up. One step per interval
+    keeps the controller from oscillating.
+    """
+
+    def __init__(self, queue_depth: Callable[[], int] = lambda: 0,
+                 cpu_budget: float = LOAD_CPU_BUDGET,
+                 interval: float = LOAD_CONTROL_INTERVAL,
+                 levels: List[Tuple[float, int]] = LOAD_LEVELS):
+        self.queue_depth = queue_depth
+        self.cpu_budget = cpu_budget
+        self.interval = interval
+        self.levels = levels
+        self._cameras: Dict[int, CameraLoad] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the control loop"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        psutil.cpu_percent(interval=None)  # Prime the CPU counter
+        self._thread = threading.Thread(
+            target=self._run,
+            name="⚖️ Load Controller",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def register(self, camera_id: int, priority: Optional[int] = None):
+        """Start tracking a camera at full quality"""
+        with self._lock:
+            self._cameras[camera_id] = CameraLoad(camera_id, priority or 0)
+        self._publish(camera_id, 0)
+
+    def unregister(self, camera_id: int):
+        with self._lock:
+            self._cameras.pop(camera_id, None)
+        metrics.clear_camera_target(str(camera_id))
+
+    def target(self, camera_id: int) -> Tuple[float, int]:
+        """(frames per second, inference imgsz) the camera should run at; 0 fps means uncapped"""
+        with self._lock:
+            camera = self._cameras.get(camera_id)
+            return self.levels[camera.level if camera else 0]
+
+    def record(self, camera_id: int, duration: float):
+        """Feed the time one frame of this camera took to process"""
+        with self._lock:
+            camera = self._cameras.get(camera_id)
+            if camera is not None:
+                if camera.frame_duration == 0.0:
+                    camera.frame_duration = duration
+                else:
+                    camera.frame_duration += DURATION_SMOOTHING * (duration - camera.frame_duration)
+
+    def adjust(self, cpu_percent: float, queue_depth: int) -> Optional[Tuple[int, int]]:
+        """Run one control step; returns (camera_id, new level) if something changed"""
+        with self._lock:
+            cameras = list(self._cameras.values())
+            if not cameras:
+                return None
+
+            overloaded = (
+                cpu_percent > self.cpu_budget
+                or queue_depth > LOAD_MAX_QUEUE_PER_CAMERA * len(cameras)
+            )
+            headroom = cpu_percent < self.cpu_budget - LOAD_HEADROOM and queue_depth == 0
+
+            change = None
+            if overloaded:
+                candidates = [c for c in cameras if c.level < len(self.levels) - 1]
+                if candidates:
+                    lowest = min(c.priority for c in candidates)
+                    camera = max((c for c in candidates if c.priority == lowest), key=self._cost)
+                    camera.level += 1
+                    change = (camera.camera_id, camera.level)
+            elif headroom:
+                candidates = [c for c in cameras if c.level > 0]
+                if candidates:
+                    highest = max(c.priority for c in candidates)
+                    camera = max((c for c in candidates if c.priority == highest), key=lambda c: c.level)
+                    camera.level -= 1
+                    change = (camera.camera_id, camera.level)
+
+        if change is not None:
+            self._publish(*change)
+        return change
+
+    def _cost(self, camera: CameraLoad) -> float:
+        """Seconds of processing per second the camera needs at its current target"""
+        fps = self.levels[camera.level][0]
+        if fps <= 0:
+            # Uncapped: assume it analyses frames back to back, a full thread's worth
+            return 1.0 if camera.frame_duration > 0 else 0.0
+        return camera.frame_duration * fps
+
+    def _publish(self, camera_id: int, level: int):
+        fps, imgsz = self.levels[level]
+        metrics.record_camera_target(str(camera_id), fps, imgsz)
+
+    def _run(self):
+        while self._running:
+            time.sleep(self.interval)
+            try:
+                change = self.adjust(psutil.cpu_percent(interval=None), self.queue_depth())
+                if change is not None:
+                    camera_id, level = change
+                    fps, imgsz = self.levels[level]
+                    logging.info(f"Camera {camera_id} now targets {describe_fps(fps)} at imgsz {imgsz}")
+            except Exception as e:
+                logging.error(f"Error in load controller: {str(e)}")
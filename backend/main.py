@@ -1,9 +1,11 @@
+import asyncio
+import json
 import numpy as np
 import threading
 from queue import Queue, Empty
 import time
 from pydantic import BaseModel
-from dataclasses import Field, dataclass
+from dataclasses import Field, dataclass, replace
 from typing import Dict, List, Optional, Any
 import cv2
 from ultralytics import YOLO
@@ -11,9 +13,10 @@ from datetime import datetime, timedelta
 from collections import defaultdict
 import requests
 import os
-from fastapi import FastAPI, File, HTTPException, UploadFile, Response, Body, status, Depends
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile, Request, Response, Body, status, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
 import io
 import logging
 from sqlalchemy.orm import Session
@@ -24,10 +27,34 @@ from logging.handlers import RotatingFileHandler
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from backend import schemas  # Import logging
-from .db_settings import init_db, SessionLocal  # Import SessionLocal from db_settings
-from .models import DetectionEvent, Camera
+from .db_settings import init_db, get_db, SessionLocal, engine  # Import SessionLocal from db_settings
+from .models import Base, DetectionEvent, Camera
 from backend import models  # Add this import
 from .monitoring.metrics import metrics
+from .inference_engine import InferenceScheduler
+from .model_registry import model_registry, MODEL_WEIGHTS
+from .model_export import MODEL_BACKEND, MODEL_BACKENDS, check_backend
+from .frame_grabber import FrameGrabber, camera_source
+from .replay import (
+    RECORDING_DIR, RECORDING_MAX_SECONDS, is_replay_source, list_recordings, parse_replay_source
+)
+from .frame_hub import FrameHub, JPEG_TIERS, DEFAULT_TIER
+from .renderer import extract_detections, render
+from .process_pool import InferenceProcessPool, INFERENCE_WORKERS
+from .event_sink import EventSink
+from .camera_registry import camera_registry, etag_matches
+from .video_jobs import VideoJobManager, probe_video
+from .motion_gate import MotionGate
+from .load_controller import LoadController
+from .pipeline_stats import pipeline_stats
+from .clip_recorder import ClipRecorder, CLIP_DIR
+from .alerts import ALERT_KEEPALIVE_SECONDS, AlertEngine, parse_alert_rules
+from .tracker import ObjectTracker
+from .roi import class_ids, crop, frame_region, parse_allowed_classes, parse_roi, to_frame
+from . import rollups
+from . import event_queries
+from .event_queries import EVENT_PAGE_MAX, EXPORT_FORMATS, EventFilter
+from .partitions import PartitionMaintainer
 
 # Create custom loggers
 app_logger = logging.getLogger('app')
@@ -64,31 +91,44 @@ app.add_middleware(
 )
 
 # Global variables
-video_captures = {}  # Dictionary to store VideoCapture objects for each camera
-latest_frames = {}   # Dictionary to store latest frames for each camera
+frame_grabbers = {}  # FrameGrabber reading each camera's source, with reconnects
+frame_hub = FrameHub()  # Latest annotated frame per camera, pushed to viewers
 active_streams = {}
 fps_stats = {}
 sources = []
 cameras = []
-recent_alerts = []
-alert_queue = Queue()
-model = None # Load the YOLO model
+camera_models = {}  # Model each camera was started with, keyed by camera id
+camera_model_types = {}  # model_type each camera was started with
+# Optional worker processes that take over inference, annotation and encoding
+inference_pool = InferenceProcessPool(INFERENCE_WORKERS) if INFERENCE_WORKERS > 0 else None
+inference_scheduler = InferenceScheduler()  # Shared batched inference for all cameras
 
 # Global variable for webcam control
 cap = None
 latest_frame = None
 running = False
 
-# Replace the global detection_times with a nested dictionary
-detection_times = defaultdict(lambda: defaultdict(lambda: datetime.min))
+camera_trackers = {}  # ObjectTracker following each running camera's detections
+track_clips = {}  # Future of the clip path of each confirmed event track, by (camera_id, track_id)
 
-# Replace the global variable with a dictionary to track per-camera detections
-detected_objects_this_session = {}  # Changed from set() to dict()
+# Camera names come from the in-memory registry, so events need no database lookup
+event_sink = EventSink(SessionLocal, camera_name=camera_registry.name)
+# Shares inference between cameras by lowering frame rate and input size under load
+load_controller = LoadController(
+    queue_depth=lambda: (inference_pool or inference_scheduler).queue_depth
+)
+clip_recorder = ClipRecorder()  # Buffers recent frames per camera and saves clips around events
+# Evaluates each camera's alert rules on its own thread and pushes alerts to SSE clients
+alert_engine = AlertEngine(
+    rules_for=lambda camera_id: getattr(camera_registry.get(camera_id), "alert_rules", None),
+    camera_name=camera_registry.name
+)
+video_jobs = VideoJobManager(inference_scheduler, event_sink)  # Offline analysis of uploaded videos
+partition_maintainer = PartitionMaintainer(engine)  # No-op unless detection_events is partitioned
 
 # Add these at the top with other global variables
 camera_threads = {}  # Store threads for each camera
 camera_running = {}  # Track running state for each camera
-frame_locks = {}    # Locks for thread-safe frame access
 
 def fetch_cameras():
     """Fetch all cameras from the API"""
@@ -107,217 +147,97 @@ def fetch_cameras():
         return []
 
 
-def process_frame(frame, result, camera_id):
+def process_frame(frame, result, camera_id, model, region=None):
     """Process a single frame and apply detections based on model type."""
     with metrics.measure_latency(str(camera_id), model.task):
         try:
-            annotated_frame = frame.copy()
-            alert = None
-
-            # Initialize camera's detection set if not exists
-            if camera_id not in detected_objects_this_session:
-                detected_objects_this_session[camera_id] = set()
-
-            # Define color constants
-            KEYPOINT_COLOR = (0, 255, 0)  # Green
-            SKELETON_COLOR = (0, 255, 255)  # Yellow
-            DETECTION_COLORS = {
-                "person": (0, 0, 255),    # Red
-                "bottle": (0, 255, 0),    # Green
-                "potted plant": (255, 0, 0)  # Blue
-            }
-
-            try:
-                # Handle pose estimation
-                if hasattr(result, 'keypoints') and result.keypoints is not None:
-                    for person in result.keypoints:
-                        keypoints = person.data[0].cpu().numpy()
-                        
-                        # Draw keypoints
-                        for kp in keypoints:
-                            if kp[2] > 0.5:  # Confidence threshold
-                                x, y = int(kp[0]), int(kp[1])
-                                cv2.circle(annotated_frame, (x, y), 4, KEYPOINT_COLOR, -1)
-                        
-                        # Define skeleton connections (COCO format)
-                        skeleton = [
-                            [16,14], [14,12], [17,15], [15,13], [12,13], [6,12], [7,13],
-                            [6,7], [6,8], [7,9], [8,10], [9,11], [2,3], [1,2], [1,3],
-                            [2,4], [3,5], [4,6], [5,7]
-                        ]
-                        
-                        # Draw skeleton
-                        for connection in skeleton:
-                            start_idx = connection[0] - 1
-                            end_idx = connection[1] - 1
-                            
-                            if (keypoints[start_idx][2] > 0.5 and 
-                                keypoints[end_idx][2] > 0.5):
-                                
-                                start_point = (int(keypoints[start_idx][0]), 
-                                     int(keypoints[start_idx][1]))
-                                end_point = (int(keypoints[end_idx][0]), 
-                                   int(keypoints[end_idx][1]))
-                                
-                                cv2.line(annotated_frame, start_point, end_point, 
-                                        SKELETON_COLOR, 2)
-
-                # Handle segmentation
-                if hasattr(result, 'masks') and result.masks is not None:
-                    for i, mask in enumerate(result.masks):
-                        try:
-                            class_id = int(result.boxes[i].cls[0])
-                            class_name = result.names[class_id]
-                            
-                            if class_name in DETECTION_COLORS:
-                                mask_array = mask.data.cpu().numpy()[0]
-                                
-                                # Resize mask if needed
-                                if mask_array.shape[:2] != frame.shape[:2]:
-                                    mask_array = cv2.resize(
-                                        mask_array,
-                                        (frame.shape[1], frame.shape[0]),
-                                        interpolation=cv2.INTER_NEAREST
-                                    )
-                                
-                                # Create and apply mask overlay
-                                binary_mask = (mask_array > 0.5).astype(np.uint8)
-                                color = DETECTION_COLORS[class_name]
-                                mask_overlay = np.zeros_like(frame)
-                                mask_overlay[binary_mask == 1] = color
-                                
-                                # Blend with original frame
-                                mask_area = (binary_mask > 0)
-                                annotated_frame[mask_area] = cv2.addWeighted(
-                                    annotated_frame[mask_area],
-                                    0.6,  # Original frame weight
-                                    mask_overlay[mask_area],
-                                    0.4,  # Mask weight
-                                    0
-                                )
-                                
-                        except Exception as e:
-                            logging.error(f"Error processing mask {i}: {str(e)}")
-                            continue
-
-                # Handle object detection boxes
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    for box in result.boxes:
-                        try:
-                            # Get box information
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                            class_id = int(box.cls[0])
-                            confidence = float(box.conf[0])
-                            class_name = result.names[class_id]
-
-                            if class_name in DETECTION_COLORS:
-                                color = DETECTION_COLORS[class_name]
-                                
-                                # Draw bounding box
-                                cv2.rectangle(
-                                    annotated_frame,
-                                    (int(x1), int(y1)),
-                                    (int(x2), int(y2)),
-                                    color,
-                                    2
-                                )
-                                
-                                # Add label
-                                label = f"{class_name} {confidence:.2f}"
-                                label_size, baseline = cv2.getTextSize(
-                                    label,
-                                    cv2.FONT_HERSHEY_SIMPLEX,
-                                    0.5,
-                                    2
-                                )
-                                
-                                # Draw label background
-                                label_y = max(y1 - 10, label_size[1])
-                                cv2.rectangle(
-                                    annotated_frame,
-                                    (int(x1), int(label_y - label_size[1])),
-                                    (int(x1 + label_size[0]), int(label_y + baseline)),
-                                    color,
-                                    cv2.FILLED
-                                )
-                                
-                                # Draw label text
-                                cv2.putText(
-                                    annotated_frame,
-                                    label,
-                                    (int(x1), int(label_y)),
-                                    cv2.FONT_HERSHEY_SIMPLEX,
-                                    0.5,
-                                    (255, 255, 255),
-                                    2
-                                )
-                                
-                        except Exception as e:
-                            logging.error(f"Error processing box: {str(e)}")
-                            continue
-
-                # Add frame metadata
-                cv2.putText(
-                    annotated_frame,
-                    f"Frame Size: {frame.shape[1]}x{frame.shape[0]}",
-                    (10, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.6,
-                    (255, 255, 255),
-                    2
-                )
-
-                # Modified detection tracking logic
-                for box in result.boxes:
-                    class_name = result.names[int(box.cls[0])]
-                    valid_detection = (
-                        class_name == "person" or 
-                        (class_name == "bottle" and model.task == "detect")
-                    )
-                    
-                    if valid_detection and class_name not in detected_objects_this_session[camera_id]:
-                        current_time = datetime.now()
-                        if detection_times[camera_id][class_name] == datetime.min:
-                            detection_times[camera_id][class_name] = current_time
-                        elif current_time - detection_times[camera_id][class_name] >= timedelta(seconds=10):
-                            model_type = "objectDetection" if model.task == "detect" else (
-                                "segmentation" if model.task == "segment" else "pose"
-                            )
-                            save_event_to_db(class_name, model_type, camera_id)
-                            detected_objects_this_session[camera_id].add(class_name)
-                            detection_times[camera_id][class_name] = datetime.min
-
-                if valid_detection:
-                    metrics.record_detection(
-                        camera_id=str(camera_id),
-                        class_name=class_name,
-                        model_type=model.task,
-                        confidence=confidence
-                    )
-
-            except Exception as e:
-                logging.error(f"Error in process_frame: {str(e)}")
-                return frame, None  # Return original frame on error
-
-            return annotated_frame, alert
+            # The model may have seen only the camera's ROI; map back to the full frame
+            detections = to_frame(extract_detections(result), region)
+            # Tracking first, so labels show track ids
+            handle_detections(detections, camera_id, model.task, frame.shape)
+            return render(frame, detections), detections
 
         except Exception as e:
+            logging.error(f"Error in process_frame: {str(e)}")
             metrics.record_error(
                 camera_id=str(camera_id),
                 error_type=type(e).__name__,
                 component="frame_processing"
             )
-            return frame, None
+            return frame, None  # Return original frame on error
+
+def is_event_detection(class_name, model_task):
+    """Whether detections of this class are saved as events"""
+    return class_name == "person" or (class_name == "bottle" and model_task == "detect")
+
+def request_track_clips(tracks, camera_id, model_task):
+    """Start recording clips for newly confirmed event tracks while their first frames are still buffered"""
+    for track in tracks:
+        if is_event_detection(track.class_name, model_task):
+            clip = clip_recorder.request_clip(camera_id, track.first_seen, track.track_id)
+            if clip is not None:
+                track_clips[(camera_id, track.track_id)] = clip
+
+def save_track_events(tracks, camera_id, model_task):
+    """Save one event per finished track, timestamped when the object first appeared.
+
+    Events whose clip is still being recorded are saved once it is done, with
+    clip_path set only if the clip was actually written.
+    """
+    model_type = "objectDetection" if model_task == "detect" else (
+        "segmentation" if model_task == "segment" else "pose"
+    )
+    for track in tracks:
+        clip = track_clips.pop((camera_id, track.track_id), None)
+        if not is_event_detection(track.class_name, model_task):
+            continue
+
+        def submit(clip_path=None, track=track):
+            event_sink.submit(
+                track.class_name, model_type, camera_id,
+                timestamp=track.first_seen,
+                track_id=track.track_id,
+                dwell_seconds=round(track.dwell_seconds, 2),
+                clip_path=clip_path
+            )
+
+        if clip is None:
+            submit()
+        else:
+            # Runs straight away if the clip is done, else on the clip writer's thread
+            clip.add_done_callback(lambda future, submit=submit: submit(future.result()))
+
+def handle_detections(detections, camera_id, model_task, frame_shape, reused=False):
+    """Track a frame's detections, record metrics, save events for tracks that ended and queue alert checks.
+
+    ``reused`` detections belong to an earlier frame (the motion gate skipped
+    this one); they only keep their tracks alive and are not counted again,
+    neither as track hits nor in the metrics.
+    """
+    tracker = camera_trackers.get(camera_id)
+    if tracker is None:
+        tracker = camera_trackers[camera_id] = ObjectTracker()
+    finished = tracker.refresh(detections) if reused else tracker.update(detections)
+    request_track_clips(tracker.confirmed, camera_id, model_task)
+    save_track_events(finished, camera_id, model_task)
+    metrics.record_tracks(str(camera_id), len(tracker), finished)
+    if reused:
+        return
+
+    for class_name, confidence in zip(detections.class_names, detections.confidences):
+        if is_event_detection(class_name, model_task):
+            metrics.record_detection(
+                camera_id=str(camera_id),
+                class_name=class_name,
+                model_type=model_task,
+                confidence=float(confidence)
+            )
+
+    alert_engine.submit(camera_id, detections, frame_shape)  # Rules are evaluated on the engine's thread
 
 def capture_frames_for_camera(camera_id):
     """Capture and process frames for a single camera"""
-    # Get camera name from database
-    db = SessionLocal()
-    try:
-        camera = db.query(Camera).filter(Camera.id == camera_id).first()
-        camera_name = camera.source_name if camera else f"Camera {camera_id}"
-    finally:
-        db.close()
+    camera_name = camera_registry.name(camera_id)
 
     current_thread = threading.current_thread()
     current_thread.name = f"🎥 {camera_name}"  # Use actual camera name
@@ -341,21 +261,93 @@ def capture_frames_for_camera(camera_id):
         app.camera_threads_info = {}
     app.camera_threads_info[camera_id] = thread_info
     
+    grabber = None
+    camera = camera_registry.get(camera_id)
+    motion_gate = MotionGate(camera_id, camera.motion_threshold if camera else None)
+    load_controller.register(camera_id, camera.priority if camera else None)
+    allowed_classes = camera.allowed_classes if camera else None
+    roi_polygons = camera.roi if camera else None
+    model_backend = camera.model_backend if camera else None
+    region, region_shape = None, None
+    last_detections, last_task, last_model_type = None, None, None
+    last_annotated_frame = None  # Worker's rendering of the last inferred frame (process pool only)
+    next_frame_at = 0.0
     try:
-        cap = video_captures[camera_id]
+        # Capture runs on its own thread; we only ever analyse the newest frame
+        grabber = frame_grabbers[camera_id].start()
         while camera_running.get(camera_id, False):
-            ret, frame = cap.read()
-            if not ret:
-                logging.error(f"Failed to read frame from camera {camera_id}")
+            # Pace analysis to the rate the load controller allows this camera
+            delay = next_frame_at - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, 0.5))
+                continue
+
+            captured = grabber.read_frame(timeout=1.0)
+            if captured is None:
                 continue
+            frame = captured.image
+            # Stage timings for this frame: capture is how long it waited after decoding
+            trace = pipeline_stats.trace(camera_id, captured.seq, captured.captured_at)
+            trace.mark("capture")
+            target_fps, imgsz = load_controller.target(camera_id)
+            started_at = time.monotonic()
+            next_frame_at = started_at + (1.0 / target_fps if target_fps > 0 else 0.0)
 
             try:
-                results = model(frame)
-                annotated_frame, alert = process_frame(frame, results[0], camera_id)
-                
-                _, buffer = cv2.imencode('.jpg', annotated_frame)
-                with frame_locks[camera_id]:
-                    latest_frames[camera_id] = buffer.tobytes()
+                if frame.shape != region_shape:
+                    region, region_shape = frame_region(roi_polygons, frame.shape), frame.shape
+                if region is not None:
+                    # No point upscaling a small crop to the full input size
+                    imgsz = min(imgsz, region.max_imgsz)
+                view = crop(frame, region)
+
+                # Re-read each frame so restarting with another model_type takes effect
+                model_type = camera_model_types[camera_id]
+                force = last_detections is None or model_type != last_model_type
+                moved = motion_gate.should_infer(view, force=force)
+                trace.mark("preprocess")
+                if not moved:
+                    # Nothing moved: the previous detections still describe the scene
+                    handle_detections(last_detections, camera_id, last_task, frame.shape, reused=True)
+                    if inference_pool is not None and last_task == "segment":
+                        # Masks stay in the worker, so show its last annotated frame instead
+                        annotated_frame = last_annotated_frame
+                    elif inference_pool is not None:
+                        # Keep the workers' confidence labels rather than switching to track ids
+                        annotated_frame = render(frame, replace(last_detections, track_ids=None))
+                    else:
+                        annotated_frame = render(frame, last_detections)
+                    trace.mark("annotate")
+                elif inference_pool is not None:
+                    # Inference and annotation run in a worker process
+                    worker_result = inference_pool.process(
+                        camera_id, model_type, frame,
+                        imgsz=imgsz, region=region, classes=allowed_classes, backend=model_backend
+                    )
+                    trace.mark("infer")  # The worker's round trip, including its rendering
+                    handle_detections(
+                        worker_result.detections, camera_id, worker_result.model_task, frame.shape
+                    )
+                    annotated_frame = last_annotated_frame = worker_result.annotated_frame
+                    last_detections, last_task = worker_result.detections, worker_result.model_task
+                    trace.mark("annotate")
+                else:
+                    model = camera_models[camera_id]
+                    result = inference_scheduler.infer(
+                        model, view, imgsz=imgsz, classes=class_ids(model.names, allowed_classes)
+                    )
+                    trace.mark("infer")  # Includes the wait for a batch slot
+                    annotated_frame, detections = process_frame(frame, result, camera_id, model, region)
+                    last_detections, last_task = detections, model.task
+                    trace.mark("annotate")
+                last_model_type = model_type
+
+                # JPEG encoding happens lazily, only for tiers someone is watching
+                frame_hub.publish(camera_id, annotated_frame)
+                clip_recorder.add_frame(camera_id, annotated_frame)  # Only queues it for the encoder
+                trace.mark("publish")
+                trace.finish()
+                load_controller.record(camera_id, time.monotonic() - started_at)
             except Exception as e:
                 logging.error(f"Error processing frame for camera {camera_id}: {str(e)}")
                 continue
@@ -363,33 +355,36 @@ def capture_frames_for_camera(camera_id):
     except Exception as e:
         logging.error(f"Error in capture_frames for {camera_name}: {str(e)}")
     finally:
+        if grabber is not None:
+            grabber.stop()
+        load_controller.unregister(camera_id)
+        pipeline_stats.remove(camera_id)
+        alert_engine.forget(camera_id)
+        # Objects still in view when the camera stops get their events too
+        tracker = camera_trackers.pop(camera_id, None)
+        if tracker is not None and last_task is not None:
+            save_track_events(tracker.flush(), camera_id, last_task)
+        metrics.record_tracks(str(camera_id), 0)
         if hasattr(app, 'camera_threads_info') and camera_id in app.camera_threads_info:
             del app.camera_threads_info[camera_id]
 
 @app.get("/api/cameras")
-def get_cameras():
-    db = SessionLocal()
+def get_cameras(request: Request):
+    """List cameras from the in-memory registry; 304 if the client's copy is current"""
     try:
-        cameras = db.query(Camera).all()
-        camera_list = []
-        for camera in cameras:
-            camera_list.append({
-                "id": camera.id,
-                "source_name": camera.source_name,
-                "stream_type": camera.stream_type,
-                "stream": camera.stream,
-                "location": camera.location,
-                "created_at": camera.created_at.strftime("%Y-%m-%d %H:%M:%S") if camera.created_at else None
-            })
-        return camera_list
+        etag, payload = camera_registry.snapshot()
     except Exception as e:
         print(f"Error fetching cameras: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching cameras: {str(e)}"
         )
-    finally:
-        db.close()
+
+    # no-cache lets browsers keep the list but revalidate it on every poll
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
 
 @app.post("/api/cameras")
 def add_camera(camera: dict):
@@ -399,36 +394,131 @@ def add_camera(camera: dict):
     return response.json()
 
 @app.get("/api/alerts")
-def get_alerts():
-    """Fetch recent alerts"""
-    return recent_alerts
+def get_alerts(camera_id: Optional[int] = None):
+    """Fetch recent alerts, newest first"""
+    return alert_engine.recent(camera_id)
+
+@app.get("/api/alerts/stream")
+async def stream_alerts(request: Request, camera_id: Optional[int] = None):
+    """Push alerts to the client as Server-Sent Events.
+
+    A reconnecting EventSource sends Last-Event-ID; alerts it missed that
+    are still in the history are sent first.
+    """
+    try:
+        last_id = int(request.headers.get("last-event-id") or 0)
+    except ValueError:
+        last_id = 0
+
+    def event(alert):
+        return f"id: {alert['id']}\nevent: alert\ndata: {json.dumps(alert)}\n\n"
+
+    async def events():
+        with alert_engine.subscribe() as alerts:
+            yield "retry: 3000\n\n"
+            sent_id = last_id
+            # Subscribed first, so nothing falls between the history and the live alerts
+            for alert in reversed(alert_engine.recent(camera_id, after_id=last_id)):
+                sent_id = alert["id"]
+                yield event(alert)
+            while not await request.is_disconnected():
+                try:
+                    alert = await asyncio.wait_for(alerts.get(), timeout=ALERT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"  # Keeps proxies from closing an idle connection
+                    continue
+                if alert["id"] > sent_id and (camera_id is None or alert["camera_id"] == camera_id):
+                    sent_id = alert["id"]
+                    yield event(alert)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 class ModelRequest(BaseModel):
     model_type: str
 
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+@app.post("/upload_video", status_code=status.HTTP_202_ACCEPTED)
+async def upload_video(
+    file: UploadFile = File(...),
+    model_type: str = Form("objectDetection"),
+    frame_stride: int = Form(1),
+    keyframes_only: bool = Form(False)
+):
+    """Save an uploaded video and start analysing it as a background job"""
+    if model_type not in MODEL_WEIGHTS:
+        raise HTTPException(status_code=400, detail="Invalid model selected")
+    if frame_stride < 1:
+        raise HTTPException(status_code=400, detail="frame_stride must be at least 1")
+
+    job = video_jobs.create(file.filename, model_type, frame_stride, keyframes_only)
+    try:
+        # Copy in fixed-size chunks so the video is never held in memory
+        with open(job.input_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                await run_in_threadpool(out.write, chunk)
+    except Exception as e:
+        video_jobs.discard(job)
+        raise HTTPException(status_code=500, detail=f"Error saving video: {str(e)}")
+    finally:
+        await file.close()
+
+    try:
+        await run_in_threadpool(probe_video, job.input_path)
+    except ValueError as e:
+        video_jobs.discard(job)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    video_jobs.start(job)
+    return job.to_dict()
+
+def get_video_job_or_404(job_id: str):
+    job = video_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Video job not found")
+    return job
+
+@app.get("/api/video-jobs")
+def list_video_jobs():
+    """Status of recent video jobs, newest first"""
+    return [job.to_dict() for job in video_jobs.list()]
+
+@app.get("/api/video-jobs/{job_id}")
+def get_video_job(job_id: str):
+    """Progress (frames/s, ETA) and results of a video job"""
+    return get_video_job_or_404(job_id).to_dict()
+
+@app.get("/api/video-jobs/{job_id}/output")
+def get_video_job_output(job_id: str):
+    """Download the annotated video of a completed job"""
+    job = get_video_job_or_404(job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Video job is {job.status}")
+    stem = os.path.splitext(job.filename)[0]
+    return FileResponse(job.output_path, media_type="video/mp4", filename=f"{stem}_annotated.mp4")
+
 @app.post("/start_webcam_stream")
-async def start_webcam_stream(request: ModelRequest):
+def start_webcam_stream(request: ModelRequest):
     """Start webcam streams with separate thread per camera."""
-    global model, detected_objects_this_session
-    
     try:
-        # Set up model based on request
-        if request.model_type == 'objectDetection':
-            model = YOLO('yolov8s.pt')
-        elif request.model_type == 'segmentation':
-            model = YOLO('yolov8n-seg.pt')
-        elif request.model_type == 'pose':
-            model = YOLO('yolov8n-pose.pt')
-        else:
+        if request.model_type not in MODEL_WEIGHTS:
             raise HTTPException(status_code=400, detail="Invalid model selected")
 
-        # Get all live cameras
-        db = SessionLocal()
-        live_cameras = db.query(Camera).filter(Camera.stream_type == 'live').all()
-        db.close()
+        # Get all live cameras; check every stream before starting any of them
+        live_cameras = camera_registry.live()
+        sources = {camera.id: camera_source(parse_stream(camera.stream)) for camera in live_cameras}
 
-        detected_objects_this_session.clear()
+        # Get a warm model per backend the cameras use instead of loading it again;
+        # in process-pool mode the workers hold their own models
+        models = {}
+        if inference_pool is None:
+            for backend in {camera.model_backend for camera in live_cameras}:
+                models[backend] = model_registry.get(request.model_type, backend)
 
         # Start a thread for each camera
         app_logger.info("╔═══════════════════════════════")
@@ -436,12 +526,12 @@ async def start_webcam_stream(request: ModelRequest):
         app_logger.info("╚═══════════════════════════════")
         
         for camera in live_cameras:
+            camera_models[camera.id] = models.get(camera.model_backend)
+            camera_model_types[camera.id] = request.model_type
             if camera.id not in camera_threads or not camera_threads[camera.id].is_alive():
                 # Initialize camera resources
-                video_captures[camera.id] = cv2.VideoCapture(0)  # or camera.stream for RTSP
-                frame_locks[camera.id] = Lock()
+                frame_grabbers[camera.id] = FrameGrabber(camera.id, sources[camera.id])
                 camera_running[camera.id] = True
-                detected_objects_this_session[camera.id] = set()
                 
                 # Create and start thread for this camera
                 thread = threading.Thread(
@@ -456,12 +546,14 @@ async def start_webcam_stream(request: ModelRequest):
                 
         return {"message": "Camera streams started", "model_type": request.model_type}
     
+    except HTTPException:
+        raise
     except Exception as e:
         app_logger.error(f"Error starting streams: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/stop_webcam_stream")
-async def stop_webcam_stream():
+def stop_webcam_stream():
     """Stop all camera streams."""
     try:
         app_logger.info("╔═══════════════════════════════")
@@ -481,13 +573,15 @@ async def stop_webcam_stream():
                     app_logger.info(f"🎥 Camera {camera_id} - Thread stopped")
                     
                     # Clean up resources
-                    if camera_id in video_captures:
-                        video_captures[camera_id].release()
-                        del video_captures[camera_id]
-                        del frame_locks[camera_id]
-                        del latest_frames[camera_id]
+                    if camera_id in frame_grabbers:
+                        frame_grabbers.pop(camera_id).stop()
+                        frame_hub.remove(camera_id)
                         del camera_threads[camera_id]
                         del camera_running[camera_id]
+                        camera_models.pop(camera_id, None)
+                        camera_model_types.pop(camera_id, None)
+                        if inference_pool is not None:
+                            inference_pool.release(camera_id)
 
         return {"message": "Camera streams stopped"}
     
@@ -495,60 +589,96 @@ async def stop_webcam_stream():
         app_logger.error(f"💥 Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def validate_tier(tier: str):
+    if tier not in JPEG_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown tier '{tier}', expected one of {list(JPEG_TIERS)}"
+        )
+
 @app.get("/process_frame/{camera_id}")
-async def process_frame_endpoint(camera_id: int):
+async def process_frame_endpoint(camera_id: int, tier: str = DEFAULT_TIER):
     """Return the latest processed frame for a specific camera."""
-    if camera_id not in latest_frames:
+    validate_tier(tier)
+    frame_data = await run_in_threadpool(frame_hub.latest, camera_id, tier)
+    if frame_data is None:
         raise HTTPException(status_code=404, detail="No frame available for this camera")
     
+    return Response(content=frame_data, media_type="image/jpeg")
+
+async def mjpeg_frames(camera_id: int, tier: str):
+    """Yield multipart JPEG parts whenever the camera publishes a new frame"""
+    seq = 0
+    with frame_hub.subscribe(camera_id):
+        while camera_running.get(camera_id, False) or camera_id in frame_hub:
+            seq, frame_data = await frame_hub.next_frame(camera_id, seq, timeout=1.0, tier=tier)
+            if frame_data is None:
+                continue
+            yield (
+                b"--frame\r\n"
+                b"Content-Type: image/jpeg\r\n"
+                b"Content-Length: " + str(len(frame_data)).encode() + b"\r\n\r\n"
+                + frame_data + b"\r\n"
+            )
+
+@app.get("/stream/{camera_id}")
+async def stream_camera(camera_id: int, tier: str = DEFAULT_TIER):
+    """Push processed frames for a camera as an MJPEG (multipart/x-mixed-replace) stream."""
+    validate_tier(tier)
+    if not camera_running.get(camera_id, False) and camera_id not in frame_hub:
+        raise HTTPException(status_code=404, detail="Camera is not streaming")
+
+    return StreamingResponse(
+        mjpeg_frames(camera_id, tier),
+        media_type="multipart/x-mixed-replace; boundary=frame",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.websocket("/ws/stream/{camera_id}")
+async def stream_camera_websocket(websocket: WebSocket, camera_id: int, tier: str = DEFAULT_TIER):
+    """Push processed frames for a camera as binary WebSocket messages."""
+    if tier not in JPEG_TIERS:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    seq = 0
     try:
-        with frame_locks.get(camera_id, Lock()):
-            frame_data = latest_frames[camera_id]
-        return Response(content=frame_data, media_type="image/jpeg")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        with frame_hub.subscribe(camera_id):
+            while camera_running.get(camera_id, False) or camera_id in frame_hub:
+                seq, frame_data = await frame_hub.next_frame(camera_id, seq, timeout=1.0, tier=tier)
+                if frame_data is not None:
+                    await websocket.send_bytes(frame_data)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
 
 @app.on_event("shutdown")
 def shutdown_event():
     """Release the webcam when the application shuts down."""
     if cap is not None:
         cap.release()
-
-def save_event_to_db(class_name, model_type, camera_id):
-    """Save detection event to database with error handling"""
-    db = SessionLocal()
-    try:
-        # Get camera info
-        camera = db.query(Camera).filter(Camera.id == camera_id).first()
-        camera_name = camera.source_name if camera else f"Camera {camera_id}"
-        
-        event = DetectionEvent(
-            class_name=class_name,
-            model_type=model_type,
-            camera_id=camera_id,
-            camera_name=camera_name,
-            timestamp=datetime.utcnow()
-        )
-        db.add(event)
-        db.commit()
-        logging.info(f"Successfully saved event: {class_name} from {camera_name}")
-    except Exception as e:
-        logging.error(f"Error saving event to database: {str(e)}")
-        db.rollback()
-    finally:
-        db.close()
+    video_jobs.stop()
+    load_controller.stop()
+    inference_scheduler.stop()
+    if inference_pool is not None:
+        inference_pool.stop()
+    clip_recorder.stop()  # Events waiting for abandoned clips are submitted without them
+    event_sink.stop()  # Flush events that are still queued
+    alert_engine.stop()
+    partition_maintainer.stop()
 
 @app.post("/api/create_camera")
-async def create_camera(
+def create_camera(
     camera_data: Dict[str, Any] = Body(..., example={
         "source_name": "Camera 1",
         "stream_type": "RTSP",
         "stream": "rtsp://example.com/stream",
         "location": "Main Entrance"
-    })
+    }),
+    db: Session = Depends(get_db)
 ):
     """Create a new camera entry in the database"""
-    db = SessionLocal()
     try:
         # Debug prints
         print("Received camera data:", camera_data)
@@ -557,8 +687,14 @@ async def create_camera(
         db_camera = Camera(
             source_name=camera_data['source_name'],
             stream_type=camera_data['stream_type'],
-            stream=camera_data['stream'],
-            location=camera_data.get('location')
+            stream=parse_stream(camera_data['stream']),
+            location=camera_data.get('location'),
+            motion_threshold=parse_motion_threshold(camera_data.get('motion_threshold')),
+            priority=parse_priority(camera_data.get('priority')),
+            roi=parse_roi_field(camera_data.get('roi')),
+            allowed_classes=parse_allowed_classes_field(camera_data.get('allowed_classes')),
+            alert_rules=parse_alert_rules_field(camera_data.get('alert_rules')),
+            model_backend=parse_model_backend(camera_data.get('model_backend'))
         )
         
         print("Creating camera object:", db_camera.__dict__)
@@ -566,6 +702,7 @@ async def create_camera(
         db.add(db_camera)
         db.commit()
         db.refresh(db_camera)
+        camera_registry.invalidate()
         
         result = {
             "source_name": db_camera.source_name,
@@ -576,6 +713,8 @@ async def create_camera(
         print("Success! Returning:", result)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         print("Server error:", str(e))
@@ -583,13 +722,111 @@ async def create_camera(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating camera: {str(e)}"
         )
-    finally:
-        db.close()
+
+def parse_stream(value):
+    """Device index, URL or file path; replay:// sources must have a valid speed"""
+    source = camera_source(value)
+    if is_replay_source(source):
+        try:
+            parse_replay_source(source)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return value
+
+def parse_motion_threshold(value) -> Optional[float]:
+    """Blank means the global default; otherwise a fraction of pixels between 0 and 1"""
+    if value is None or value == "":
+        return None
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        threshold = -1.0
+    if not 0.0 <= threshold <= 1.0:
+        raise HTTPException(status_code=400, detail="motion_threshold must be between 0 and 1")
+    return threshold
+
+def parse_roi_field(value):
+    """ROI polygons as [[[x, y], ...], ...] in 0-1 frame fractions; blank means the whole frame"""
+    try:
+        return parse_roi(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_allowed_classes_field(value):
+    """Class names to detect; blank keeps every class the renderer draws"""
+    try:
+        return parse_allowed_classes(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_alert_rules_field(value):
+    """Alert rules as a JSON list (see backend/alerts.py); blank means ALERT_DEFAULT_RULES"""
+    try:
+        return parse_alert_rules(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_model_backend(value) -> Optional[str]:
+    """Blank means MODEL_BACKEND; otherwise one of MODEL_BACKENDS"""
+    if value is None or value == "":
+        return None
+    try:
+        return check_backend(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def parse_priority(value) -> Optional[int]:
+    """Blank means the default priority (0); higher values are degraded last under load"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="priority must be an integer")
+
+CAMERA_FIELDS = (
+    "source_name", "stream_type", "stream", "location", "motion_threshold", "priority",
+    "roi", "allowed_classes", "model_backend", "alert_rules"
+)
+CAMERA_FIELD_PARSERS = {
+    "stream": parse_stream,
+    "motion_threshold": parse_motion_threshold,
+    "priority": parse_priority,
+    "roi": parse_roi_field,
+    "allowed_classes": parse_allowed_classes_field,
+    "model_backend": parse_model_backend,
+    "alert_rules": parse_alert_rules_field,
+}
+
+@app.put("/api/cameras/{camera_id}")
+def update_camera(camera_id: int, camera_data: Dict[str, Any] = Body(...),
+                  db: Session = Depends(get_db)):
+    """Update a camera's settings; running cameras pick them up when restarted"""
+    try:
+        camera = db.query(Camera).filter(Camera.id == camera_id).first()
+        if not camera:
+            raise HTTPException(status_code=404, detail="Camera not found")
+
+        for field in CAMERA_FIELDS:
+            if field in camera_data:
+                parse = CAMERA_FIELD_PARSERS.get(field, lambda value: value)
+                setattr(camera, field, parse(camera_data[field]))
+        db.commit()
+        camera_registry.invalidate()
+        return camera_registry.get(camera_id).to_dict()
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error updating camera: {str(e)}"
+        )
 
 @app.delete("/api/cameras/{camera_id}")
-async def delete_camera(camera_id: int):
+def delete_camera(camera_id: int, db: Session = Depends(get_db)):
     """Delete a camera from the database"""
-    db = SessionLocal()
     try:
         camera = db.query(Camera).filter(Camera.id == camera_id).first()
         if not camera:
@@ -597,29 +834,42 @@ async def delete_camera(camera_id: int):
         
         db.delete(camera)
         db.commit()
+        camera_registry.invalidate()
         return {"message": f"Camera {camera_id} deleted successfully"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting camera: {str(e)}"
         )
-    finally:
-        db.close()
 
 # Add more endpoints as needed for starting/stopping streams, etc.
 
 @app.on_event("startup")
 async def startup():
+    inference_scheduler.start()  # Also runs uploaded videos when the process pool is enabled
+    if inference_pool is not None:
+        inference_pool.start()  # Workers preload their own models
+    else:
+        model_registry.preload()  # Load and warm up models before the first camera starts
+    event_sink.start()
+    clip_recorder.start()
+    alert_engine.start()
+    load_controller.start()
     init_db()  # Initialize database
+    camera_registry.load()
+    partition_maintainer.start()
 
 @app.post("/init-db")
-async def initialize_database():
+def initialize_database():
     """Initialize the database tables"""
     try:
         Base.metadata.drop_all(bind=engine)
         Base.metadata.create_all(bind=engine)
+        camera_registry.invalidate()
         return {"message": "Database initialized successfully"}
     except Exception as e:
         raise HTTPException(
@@ -628,90 +878,92 @@ async def initialize_database():
         )
 
 @app.get("/api/detection-stats/summary")
-async def get_detection_stats_summary():
-    db = SessionLocal()
-    try:
-        stats = {
-            "totalDetections": db.query(func.count(DetectionEvent.id)).scalar(),
-            "objectDetections": db.query(func.count(DetectionEvent.id))
-                                .filter(DetectionEvent.model_type == "objectDetection").scalar(),
-            "segmentations": db.query(func.count(DetectionEvent.id))
-                                .filter(DetectionEvent.model_type == "segmentation").scalar(),  
-            "poseEstimations": db.query(func.count(DetectionEvent.id))
-                                .filter(DetectionEvent.model_type == "pose").scalar()
-        }
-        return stats
-    finally:
-        db.close()
+def get_detection_stats_summary(db: Session = Depends(get_db)):
+    # Closed days come from the daily rollup; only today is counted from raw events
+    counts = rollups.counts_by_model_type(db)
+    stats = {
+        "totalDetections": sum(counts.values()),
+        "objectDetections": counts.get("objectDetection", 0),
+        "segmentations": counts.get("segmentation", 0),
+        "poseEstimations": counts.get("pose", 0)
+    }
+    return stats
 
 @app.get("/api/detection-stats/classes")
-async def get_detection_classes(model: str):
-    db = SessionLocal()
-    try:
-        query = db.query(DetectionEvent.class_name.distinct())
-        if model != 'all':
-            query = query.filter(DetectionEvent.model_type == model)
-        
-        classes = query.all()
-        return [class_name[0] for class_name in classes if class_name[0]]
-    finally:
-        db.close()
+def get_detection_classes(model: str, db: Session = Depends(get_db)):
+    return rollups.class_names(db, model)
 
 @app.get("/api/detection-stats/daily")
-async def get_daily_detection_stats(model: str = 'all', class_name: str = 'all'):
-    db = SessionLocal()
-    try:
-        today = datetime.utcnow().date()
-        tomorrow = today + timedelta(days=1)
-        
-        query = db.query(
-            func.date_trunc('hour', DetectionEvent.timestamp).label('hour'),
-            func.count(DetectionEvent.id).label('count')
-        )
-        
-        if model != 'all':
-            query = query.filter(DetectionEvent.model_type == model)
-        if class_name != 'all':
-            query = query.filter(DetectionEvent.class_name == class_name)
-            
-        hourly_stats = (query
-            .filter(DetectionEvent.timestamp >= today)
-            .filter(DetectionEvent.timestamp < tomorrow)
-            .group_by(func.date_trunc('hour', DetectionEvent.timestamp))
-            .order_by(func.date_trunc('hour', DetectionEvent.timestamp))
-            .all()
-        )
-        
-        return [{"timestamp": stat.hour.isoformat(), "count": stat.count} for stat in hourly_stats]
-    finally:
-        db.close()
+def get_daily_detection_stats(model: str = 'all', class_name: str = 'all',
+                              db: Session = Depends(get_db)):
+    today = rollups.bucket_start(datetime.utcnow(), "day")
+    hourly_stats = rollups.bucket_counts(db, "hour", today, model, class_name)
+
+    return [{"timestamp": hour.isoformat(), "count": count} for hour, count in hourly_stats]
 
 @app.get("/api/detection-stats/weekly")
-async def get_weekly_detection_stats(model: str = 'all', class_name: str = 'all'):
-    db = SessionLocal()
+def get_weekly_detection_stats(model: str = 'all', class_name: str = 'all',
+                               db: Session = Depends(get_db)):
+    week_ago = rollups.bucket_start(datetime.utcnow(), "day") - timedelta(days=7)
+    daily_stats = rollups.bucket_counts(db, "day", week_ago, model, class_name)
+
+    return [{"date": date.isoformat(), "count": count} for date, count in daily_stats]
+
+@app.get("/api/events")
+def get_events(
+    camera_id: Optional[int] = None,
+    model_type: Optional[str] = None,
+    class_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Raw detection events, newest first; pass next_cursor back to get the following page"""
+    if not 1 <= limit <= EVENT_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {EVENT_PAGE_MAX}")
+    filters = EventFilter(camera_id, model_type, class_name, start, end)
     try:
-        week_ago = datetime.utcnow().date() - timedelta(days=7)
-        
-        query = db.query(
-            func.date_trunc('day', DetectionEvent.timestamp).label('date'),
-            func.count(DetectionEvent.id).label('count')
-        )
-        
-        if model != 'all':
-            query = query.filter(DetectionEvent.model_type == model)
-        if class_name != 'all':
-            query = query.filter(DetectionEvent.class_name == class_name)
-            
-        daily_stats = (query
-            .filter(DetectionEvent.timestamp >= week_ago)
-            .group_by(func.date_trunc('day', DetectionEvent.timestamp))
-            .order_by(func.date_trunc('day', DetectionEvent.timestamp))
-            .all()
-        )
-        
-        return [{"date": stat.date.isoformat(), "count": stat.count} for stat in daily_stats]
-    finally:
-        db.close()
+        events, next_cursor = event_queries.page(db, filters, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"events": events, "next_cursor": next_cursor}
+
+@app.get("/api/events/export")
+def export_events(
+    format: str = "csv",
+    camera_id: Optional[int] = None,
+    model_type: Optional[str] = None,
+    class_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """Stream every matching event, oldest first, as CSV or Parquet"""
+    try:
+        event_queries.check_export_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filters = EventFilter(camera_id, model_type, class_name, start, end)
+    chunks = (event_queries.parquet_chunks if format == "parquet" else event_queries.csv_chunks)(engine, filters)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="detection_events.{format}"'}
+    )
+
+@app.get("/api/events/{event_id}/clip")
+def get_event_clip(event_id: int, db: Session = Depends(get_db)):
+    """Download the video recorded around a detection event"""
+    event = db.get(DetectionEvent, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if not event.clip_path:
+        raise HTTPException(status_code=404, detail="Event has no clip")
+    path = os.path.join(CLIP_DIR, event.clip_path)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Clip file is missing")
+    return FileResponse(path, media_type="video/mp4", filename=os.path.basename(path))
 
 @app.get("/api/camera-threads")
 async def get_camera_threads():
@@ -723,38 +975,87 @@ async def get_camera_threads():
         "camera_threads": list(app.camera_threads_info.values())
     })
 
+@app.get("/api/model-backends")
+async def get_model_backends():
+    """Inference backends cameras can choose, the default one and which models are loaded"""
+    return {
+        "backends": list(MODEL_BACKENDS),
+        "default": MODEL_BACKEND,
+        "loaded": [
+            {"model_type": model_type, "backend": backend}
+            for model_type, backend in model_registry.loaded()
+        ],
+    }
+
+@app.get("/api/capture-status")
+async def get_capture_status():
+    """Connection state, decode FPS, reconnect count and open streams of every started camera"""
+    return {"cameras": [
+        {**grabber.status(), "viewers": frame_hub.viewers(grabber.camera_id)}
+        for grabber in list(frame_grabbers.values())
+    ]}
+
+@app.post("/api/cameras/{camera_id}/recording")
+def start_recording(camera_id: int, seconds: float = RECORDING_MAX_SECONDS):
+    """Record a running camera's raw frames so they can be replayed with replay://"""
+    grabber = frame_grabbers.get(camera_id)
+    if grabber is None:
+        raise HTTPException(status_code=404, detail="Camera is not running")
+    if grabber.recorder is not None and not grabber.recorder.done:
+        raise HTTPException(status_code=409, detail="Camera is already being recorded")
+    if seconds <= 0:
+        raise HTTPException(status_code=400, detail="seconds must be positive")
+    grabber.stop_recording()  # Finalise a recording that ran out of time
+    path = os.path.join(RECORDING_DIR, f"camera{camera_id}-{datetime.utcnow():%Y%m%d-%H%M%S}")
+    return grabber.start_recording(path, seconds).info()
+
+@app.delete("/api/cameras/{camera_id}/recording")
+def stop_recording(camera_id: int):
+    """Finish a camera's recording and return where to replay it from"""
+    grabber = frame_grabbers.get(camera_id)
+    info = grabber.stop_recording() if grabber is not None else None
+    if info is None:
+        raise HTTPException(status_code=404, detail="Camera is not being recorded")
+    return info
+
+@app.get("/api/recordings")
+def get_recordings():
+    """Finished recordings, newest first"""
+    return list_recordings()
+
+@app.get("/api/pipeline-stats")
+async def get_pipeline_stats(camera_id: Optional[int] = None):
+    """Rolling p50/p95/p99 latency of each pipeline stage, per running camera"""
+    return pipeline_stats.snapshot(camera_id)
+
 # Add these new endpoints for individual camera control
 
 @app.post("/start_camera_stream/{camera_id}")
-async def start_camera_stream(camera_id: int, request: ModelRequest):
+def start_camera_stream(camera_id: int, request: ModelRequest):
     """Start stream for a specific camera."""
-    global model
-    
     try:
-        # Set up model based on request
-        if request.model_type == 'objectDetection':
-            model = YOLO('yolov8s.pt')
-        elif request.model_type == 'segmentation':
-            model = YOLO('yolov8n-seg.pt')
-        elif request.model_type == 'pose':
-            model = YOLO('yolov8n-pose.pt')
-        else:
+        if request.model_type not in MODEL_WEIGHTS:
             raise HTTPException(status_code=400, detail="Invalid model selected")
 
         # Get the specific camera
-        db = SessionLocal()
-        camera = db.query(Camera).filter(Camera.id == camera_id).first()
-        db.close()
+        camera = camera_registry.get(camera_id)
 
         if not camera:
             raise HTTPException(status_code=404, detail="Camera not found")
+        source = camera_source(parse_stream(camera.stream))
+
+        # Get a warm model from the registry instead of loading it again;
+        # in process-pool mode the workers hold their own models
+        model = None
+        if inference_pool is None:
+            model = model_registry.get(request.model_type, camera.model_backend)
 
+        camera_models[camera_id] = model
+        camera_model_types[camera_id] = request.model_type
         if camera_id not in camera_threads or not camera_threads[camera_id].is_alive():
             # Initialize camera resources
-            video_captures[camera_id] = cv2.VideoCapture(0)  # or camera.stream for RTSP
-            frame_locks[camera_id] = Lock()
+            frame_grabbers[camera_id] = FrameGrabber(camera_id, source)
             camera_running[camera_id] = True
-            detected_objects_this_session[camera_id] = set()
             
             # Create and start thread for this camera
             thread = threading.Thread(
@@ -771,6 +1072,8 @@ async def start_camera_stream(camera_id: int, request: ModelRequest):
         metrics.active_cameras.inc()
         return {"message": f"Camera {camera_id} stream started", "model_type": request.model_type}
     
+    except HTTPException:
+        raise
     except Exception as e:
         metrics.record_error(
             camera_id=str(camera_id),
@@ -780,15 +1083,10 @@ async def start_camera_stream(camera_id: int, request: ModelRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/stop_camera_stream/{camera_id}")
-async def stop_camera_stream(camera_id: int):
+def stop_camera_stream(camera_id: int):
     """Stop stream for a specific camera."""
     try:
-        db = SessionLocal()
-        try:
-            camera = db.query(Camera).filter(Camera.id == camera_id).first()
-            camera_name = camera.source_name if camera else f"Camera {camera_id}"
-        finally:
-            db.close()
+        camera_name = camera_registry.name(camera_id)
 
         if camera_id in camera_running:
             app_logger.info(f"Stopping {camera_name} (Thread ID: {camera_threads[camera_id].ident})")
@@ -805,13 +1103,15 @@ async def stop_camera_stream(camera_id: int):
                     app_logger.info("╚════════════════════════════════════")
                     
                     # Clean up resources
-                    if camera_id in video_captures:
-                        video_captures[camera_id].release()
-                        del video_captures[camera_id]
-                        del frame_locks[camera_id]
-                        del latest_frames[camera_id]
+                    if camera_id in frame_grabbers:
+                        frame_grabbers.pop(camera_id).stop()
+                        frame_hub.remove(camera_id)
                         del camera_threads[camera_id]
                         del camera_running[camera_id]
+                        camera_models.pop(camera_id, None)
+                        camera_model_types.pop(camera_id, None)
+                        if inference_pool is not None:
+                            inference_pool.release(camera_id)
                 else:
                     app_logger.warning(f"Thread for {camera_name} did not stop properly!")
 
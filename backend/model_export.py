@@ -0,0 +1,160 @@
+"""Export the YOLO models to CPU-optimised runtimes and cache the artifacts.
+
+Each model_type can be loaded through one of ``MODEL_BACKENDS``. Every
+backend other than ``pytorch`` is exported on first use into
+``MODEL_EXPORT_DIR`` and reused afterwards; it is exported again only when
+the source weights change. Exports have dynamic input shapes, so the
+batching scheduler, ROI crops and the load controller's smaller input sizes
+all keep working.
+
+Artifacts can be built ahead of time (e.g. in a Docker image):
+
+    python -m backend.model_export --backend onnx onnx-int8
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from ultralytics import YOLO
+from ultralytics.utils.downloads import attempt_download_asset
+
+# Export configuration (overridable through the environment)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "pytorch")  # Backend for cameras that do not choose one
+MODEL_EXPORT_DIR = os.getenv("MODEL_EXPORT_DIR", "model_cache")
+# Dataset for OpenVINO INT8; ultralytics downloads coco8 (a few MB) on the first openvino-int8 export
+MODEL_INT8_CALIBRATION = os.getenv("MODEL_INT8_CALIBRATION", "coco8.yaml")
+
+MODEL_EXPORT_IMGSZ = 640  # Trace size; exports accept any size up to this thanks to dynamic axes
+
+# Weights used for each model_type accepted by the API
+MODEL_WEIGHTS = {
+    "objectDetection": "yolov8s.pt",
+    "segmentation": "yolov8n-seg.pt",
+    "pose": "yolov8n-pose.pt",
+}
+
+MODEL_TASKS = {
+    "objectDetection": "detect",
+    "segmentation": "segment",
+    "pose": "pose",
+}
+
+# Backend name -> (artifact suffix, export options)
+MODEL_BACKENDS = {
+    "pytorch": (None, None),
+    "onnx": (".onnx", {"format": "onnx", "dynamic": True}),
+    # Dynamic INT8 quantisation of the ONNX export with ONNX Runtime; needs no calibration data
+    "onnx-int8": ("-int8.onnx", {"format": "onnx", "dynamic": True}),
+    "openvino": ("_openvino_model", {"format": "openvino", "dynamic": True}),
+    "openvino-fp16": ("-fp16_openvino_model", {"format": "openvino", "dynamic": True, "half": True}),
+    "openvino-int8": ("-int8_openvino_model", {"format": "openvino", "dynamic": True, "int8": True}),
+}
+
+
+# Packages a backend needs beyond requirements.txt's core; checked up front so that
+# ultralytics never falls back to pip-installing them on a camera node
+BACKEND_PACKAGES = {
+    "openvino": ("openvino",),
+    "openvino-fp16": ("openvino",),
+    "openvino-int8": ("openvino", "nncf"),
+}
+
+
+def check_backend(backend: str) -> str:
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown model backend {backend!r}; choose from {sorted(MODEL_BACKENDS)}")
+    missing = [p for p in BACKEND_PACKAGES.get(backend, ()) if importlib.util.find_spec(p) is None]
+    if missing:
+        raise ValueError(f"Model backend {backend!r} needs {', '.join(missing)} (pip install {' '.join(missing)})")
+    return backend
+
+
+def artifact_path(model_type: str, backend: str, export_dir: str = MODEL_EXPORT_DIR) -> Path:
+    """Where the exported model for model_type and backend is cached"""
+    suffix, _ = MODEL_BACKENDS[check_backend(backend)]
+    if suffix is None:
+        return Path(MODEL_WEIGHTS[model_type])
+    return Path(export_dir) / f"{Path(MODEL_WEIGHTS[model_type]).stem}{suffix}"
+
+
+def _quantize_onnx(source: str, target: str):
+    """Dynamic INT8 quantisation that keeps the metadata YOLO needs to load the model"""
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(source, target, weight_type=QuantType.QUInt8)
+    metadata = {p.key: p.value for p in onnx.load(source, load_external_data=False).metadata_props}
+    quantized = onnx.load(target)
+    present = {p.key for p in quantized.metadata_props}
+    for key, value in metadata.items():
+        if key not in present:
+            quantized.metadata_props.add(key=key, value=value)
+    onnx.save(quantized, target)
+
+
+def export_model(model_type: str, backend: str, force: bool = False,
+                 export_dir: str = MODEL_EXPORT_DIR) -> Path:
+    """Export model_type for a backend unless an up-to-date artifact is cached"""
+    target = artifact_path(model_type, backend, export_dir)
+    suffix, options = MODEL_BACKENDS[backend]
+    if suffix is None:
+        return target
+
+    weights = Path(attempt_download_asset(MODEL_WEIGHTS[model_type]))  # Downloads missing weights
+    if target.exists() and not force and target.stat().st_mtime >= weights.stat().st_mtime:
+        return target
+
+    start_time = time.perf_counter()
+    os.makedirs(export_dir, exist_ok=True)
+    # Export from a private copy of the weights so concurrent exports never share files
+    work_dir = tempfile.mkdtemp(prefix=f".{weights.stem}-", dir=export_dir)
+    try:
+        source = shutil.copy(weights, work_dir)
+        export_options = dict(options, imgsz=MODEL_EXPORT_IMGSZ)
+        if export_options.get("int8"):
+            export_options["data"] = MODEL_INT8_CALIBRATION
+        exported = YOLO(source, task=MODEL_TASKS[model_type]).export(**export_options)
+
+        if backend == "onnx-int8":
+            quantized = os.path.join(work_dir, target.name)
+            _quantize_onnx(exported, quantized)
+            exported = quantized
+
+        if target.is_dir():
+            shutil.rmtree(target)
+        os.replace(exported, target)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    logging.info(
+        f"Exported {model_type} model to {backend} ({target}) in {time.perf_counter() - start_time:.1f}s"
+    )
+    return target
+
+
+def load_model(model_type: str, backend: str = MODEL_BACKEND) -> YOLO:
+    """Load model_type with the given backend, exporting it first if needed"""
+    path = export_model(model_type, backend)
+    return YOLO(str(path), task=MODEL_TASKS[model_type])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export YOLO models to optimised CPU backends")
+    parser.add_argument("--model-type", nargs="+", default=list(MODEL_WEIGHTS), choices=list(MODEL_WEIGHTS))
+    parser.add_argument("--backend", nargs="+", default=["onnx"], choices=list(MODEL_BACKENDS))
+    parser.add_argument("--force", action="store_true", help="Export even if a cached artifact is current")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for model_type in args.model_type:
+        for backend in args.backend:
+            print(f"{model_type} {backend}: {export_model(model_type, backend, force=args.force)}")
+
+
+if __name__ == "__main__":
+    main()
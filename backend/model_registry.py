@@ -0,0 +1,90 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Tuple
+
+import numpy as np
+from ultralytics import YOLO
+
+from .model_export import MODEL_BACKEND, MODEL_WEIGHTS, check_backend, load_model
+
+# How many models may stay loaded at once, and which ones to load at startup
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "3"))
+PRELOAD_MODELS = [m.strip() for m in os.getenv("PRELOAD_MODELS", "objectDetection").split(",") if m.strip()]
+WARMUP_FRAME_SIZE = (640, 640)
+
+
+class ModelRegistry:
+    """Keeps loaded YOLO models keyed by (model_type, backend) with an LRU limit.
+
+    Cameras hold their own reference to the model they were started with, so
+    evicting a model from the registry never affects a running camera; it only
+    means the next camera asking for that model triggers a reload.
+    """
+
+    def __init__(self, max_models: int = MODEL_CACHE_SIZE):
+        self.max_models = max(1, max_models)
+        self._models: "OrderedDict[Tuple[str, str], YOLO]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = defaultdict(threading.Lock)
+
+    def get(self, model_type: str, backend: Optional[str] = None) -> YOLO:
+        """Return a warm model for model_type on a backend, loading it if it is not cached"""
+        if model_type not in MODEL_WEIGHTS:
+            raise ValueError(f"Invalid model selected: {model_type}")
+        key = (model_type, check_backend(backend or MODEL_BACKEND))
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            load_lock = self._load_locks[key]
+
+        # Only one thread loads a given model; others wait and reuse it
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            model = self._load(*key)
+
+            with self._lock:
+                self._models[key] = model
+                while len(self._models) > self.max_models:
+                    (evicted, evicted_backend), _ = self._models.popitem(last=False)
+                    logging.info(f"Evicted {evicted} ({evicted_backend}) model from registry")
+            return model
+
+    def preload(self, model_types: List[str] = PRELOAD_MODELS):
+        """Load and warm up models ahead of the first camera start"""
+        for model_type in model_types:
+            try:
+                self.get(model_type)
+            except Exception as e:
+                logging.error(f"Failed to preload {model_type} model: {str(e)}")
+
+    def loaded(self):
+        """(model_type, backend) pairs currently held in the cache, least recently used first"""
+        with self._lock:
+            return list(self._models.keys())
+
+    def _load(self, model_type: str, backend: str) -> YOLO:
+        start_time = time.perf_counter()
+        model = load_model(model_type, backend)
+
+        # Run one dummy frame so the first real frame does not pay for lazy setup
+        dummy_frame = np.zeros((WARMUP_FRAME_SIZE[1], WARMUP_FRAME_SIZE[0], 3), dtype=np.uint8)
+        model(dummy_frame, verbose=False)
+
+        logging.info(
+            f"Loaded {model_type} model ({MODEL_WEIGHTS[model_type]}, {backend}) "
+            f"in {time.perf_counter() - start_time:.2f}s"
+        )
+        return model
+
+
+# Create a global registry instance
+model_registry = ModelRegistry()
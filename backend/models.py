@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -13,6 +13,37 @@ class DetectionEvent(Base):
     class_name = Column(String)
     camera_id = Column(Integer, index=True)
     camera_name = Column(String)
+    track_id = Column(Integer, nullable=True)  # Tracker id, unique per camera session
+    dwell_seconds = Column(Float, nullable=True)  # How long the tracked object stayed in view
+    clip_path = Column(String, nullable=True)  # Video around the event, relative to CLIP_DIR
+
+    __table_args__ = (
+        # Stats filter on a time range plus model type and/or class
+        Index('ix_detection_events_timestamp_model_class', 'timestamp', 'model_type', 'class_name'),
+        Index('ix_detection_events_camera_timestamp', 'camera_id', 'timestamp'),
+        # Keyset pagination of /api/events
+        Index('ix_detection_events_timestamp_id', 'timestamp', 'id'),
+    )
+
+class DetectionRollupHourly(Base):
+    """Detection counts per camera, model type and class for each hour"""
+    __tablename__ = 'detection_rollups_hourly'
+
+    camera_id = Column(Integer, primary_key=True)
+    model_type = Column(String, primary_key=True)
+    class_name = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class DetectionRollupDaily(Base):
+    """Detection counts per camera, model type and class for each day"""
+    __tablename__ = 'detection_rollups_daily'
+
+    camera_id = Column(Integer, primary_key=True)
+    model_type = Column(String, primary_key=True)
+    class_name = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True, index=True)
+    count = Column(Integer, nullable=False, default=0)
 
 class Camera(Base):
     __tablename__ = 'cameras'
@@ -23,10 +54,24 @@ class Camera(Base):
     stream = Column(String)
     location = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    motion_threshold = Column(Float, nullable=True)  # Changed-pixel fraction; NULL uses MOTION_THRESHOLD
+    priority = Column(Integer, nullable=True)  # Higher keeps full quality longer under load
+    roi = Column(JSON, nullable=True)  # Polygons [[[x, y], ...], ...] in 0-1 frame fractions
+    allowed_classes = Column(JSON, nullable=True)  # Class names to detect; NULL keeps all drawn classes
+    model_backend = Column(String, nullable=True)  # Inference runtime; NULL uses MODEL_BACKEND
+    alert_rules = Column(JSON, nullable=True)  # Rules checked by the alert engine; NULL uses ALERT_DEFAULT_RULES
 
-    def __init__(self, source_name, stream_type, stream, location=None):
+    def __init__(self, source_name, stream_type, stream, location=None, motion_threshold=None,
+                 priority=None, roi=None, allowed_classes=None, model_backend=None,
+                 alert_rules=None):
         self.source_name = source_name
         self.stream_type = stream_type
         self.stream = stream
         self.location = location
+        self.motion_threshold = motion_threshold
+        self.priority = priority
+        self.roi = roi
+        self.allowed_classes = allowed_classes
+        self.model_backend = model_backend
+        self.alert_rules = alert_rules
         self.created_at = datetime.utcnow()
\ No newline at end of file
@@ -37,6 +37,198 @@ class MetricsManager:
             ['camera_id', 'error_type', 'component']
         )
 
+        self.frames_dropped = Counter(
+            'camera_frames_dropped_total',
+            'Captured frames replaced by a newer frame before being analysed',
+            ['camera_id']
+        )
+
+        # Capture Metrics
+        self.camera_capture_state = Gauge(
+            'camera_capture_state',
+            'Connection state of each camera source (1 for the current state)',
+            ['camera_id', 'state']
+        )
+
+        self.camera_decode_fps = Gauge(
+            'camera_decode_fps',
+            'Frames per second decoded from each camera source',
+            ['camera_id']
+        )
+
+        self.camera_reconnects = Counter(
+            'camera_reconnects_total',
+            'Times a camera source was reopened after failing or stalling',
+            ['camera_id']
+        )
+
+        # Streaming Metrics
+        self.jpeg_encode_time = Histogram(
+            'jpeg_encode_duration_seconds',
+            'Time spent encoding a frame for one JPEG tier',
+            ['tier'],
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+        )
+
+        self.stream_viewers = Gauge(
+            'camera_stream_viewers',
+            'Number of open MJPEG/WebSocket streams per camera',
+            ['camera_id']
+        )
+
+        # Event Writer Metrics
+        self.event_queue_depth = Gauge(
+            'detection_event_queue_depth',
+            'Detection events waiting to be written to the database'
+        )
+
+        self.event_flush_time = Histogram(
+            'detection_event_flush_duration_seconds',
+            'Time spent writing one batch of detection events',
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+        )
+
+        self.events_written = Counter(
+            'detection_events_written_total',
+            'Detection events written to the database'
+        )
+
+        self.events_dropped = Counter(
+            'detection_events_dropped_total',
+            'Detection events that could not be written',
+            ['reason']
+        )
+
+        # Inference Scheduler Metrics
+        self.inference_batch_size = Histogram(
+            'inference_batch_size',
+            'Number of frames run together in one batched inference call',
+            ['model_type'],
+            buckets=(1, 2, 4, 8, 16, 32)
+        )
+
+        self.inference_queue_wait = Histogram(
+            'inference_queue_wait_seconds',
+            'Time a frame waits in the inference queue before its batch runs',
+            ['model_type'],
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+        )
+
+        self.worker_frames = Counter(
+            'inference_worker_frames_total',
+            'Frames processed by each inference worker process',
+            ['worker_id']
+        )
+
+        # Load Controller Metrics
+        self.camera_target_fps = Gauge(
+            'camera_target_fps',
+            'Analysis frame rate the load controller currently allows each camera (0 = uncapped)',
+            ['camera_id']
+        )
+
+        self.camera_target_imgsz = Gauge(
+            'camera_target_imgsz',
+            'Inference input size the load controller currently assigns each camera',
+            ['camera_id']
+        )
+
+        # Motion Gate Metrics
+        self.motion_gate_frames = Counter(
+            'motion_gate_frames_total',
+            'Frames checked by the motion gate, by whether inference ran or was skipped',
+            ['camera_id', 'decision']
+        )
+
+        self.motion_gate_skip_ratio = Gauge(
+            'motion_gate_skip_ratio',
+            'Share of recent frames that skipped inference because nothing moved',
+            ['camera_id']
+        )
+
+        # Tracker Metrics
+        self.active_tracks = Gauge(
+            'active_tracks',
+            'Confirmed object tracks currently followed on each camera',
+            ['camera_id']
+        )
+
+        self.track_dwell_seconds = Histogram(
+            'track_dwell_seconds',
+            'How long finished tracks stayed in view',
+            ['class_name'],
+            buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+        )
+
+        # Pipeline Metrics
+        self.pipeline_stage_time = Histogram(
+            'pipeline_stage_duration_seconds',
+            'Time each frame spends in each stage of the camera pipeline',
+            ['camera_id', 'stage'],
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+        )
+
+        self.pipeline_frame_latency = Histogram(
+            'pipeline_frame_latency_seconds',
+            'Time from a frame being decoded to its annotated version being published',
+            ['camera_id'],
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+        )
+
+        # Clip Recorder Metrics
+        self.clip_frames_dropped = Counter(
+            'clip_frames_dropped_total',
+            'Frames left out of a camera\'s clip buffer because the encoder was behind',
+            ['camera_id']
+        )
+
+        self.clips_total = Counter(
+            'event_clips_total',
+            'Event clips the clip writer finished, by result (written, empty, error)',
+            ['result']
+        )
+
+        self.clip_write_time = Histogram(
+            'event_clip_write_duration_seconds',
+            'Time spent turning buffered frames into one clip file',
+            buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+        )
+
+        # Alert Metrics
+        self.alerts_total = Counter(
+            'alerts_total',
+            'Alerts raised by the alert engine, by rule type',
+            ['camera_id', 'rule_type']
+        )
+
+        self.alert_observations_dropped = Counter(
+            'alert_observations_dropped_total',
+            'Analysed frames skipped by the alert engine because its queue was full'
+        )
+
+        self.alert_queue_depth = Gauge(
+            'alert_queue_depth',
+            'Analysed frames waiting for alert rule evaluation'
+        )
+
+        # Database Pool Metrics
+        self.db_pool_checkout_wait = Histogram(
+            'db_pool_checkout_wait_seconds',
+            'Time spent waiting for a database connection from the pool',
+            buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+        )
+
+        self.db_pool_checkout_timeouts = Counter(
+            'db_pool_checkout_timeouts_total',
+            'Connection checkouts that gave up after the pool timeout'
+        )
+
+        self.db_pool_connections = Gauge(
+            'db_pool_connections',
+            'Database connections by state (in_use, idle, overflow)',
+            ['state']
+        )
+
     @contextlib.contextmanager
     def measure_latency(self, camera_id: str, model_type: str):
         """Context manager to measure processing time"""
@@ -73,5 +265,108 @@ class MetricsManager:
             component=component
         ).inc()
 
+    def record_event_flush(self, rows: int, duration: float):
+        """Record a batch of detection events written to the database"""
+        self.events_written.inc(rows)
+        self.event_flush_time.observe(duration)
+
+    def record_dropped_events(self, reason: str, count: int = 1):
+        """Record detection events lost because the queue was full or a write failed"""
+        self.events_dropped.labels(reason=reason).inc(count)
+
+    def record_jpeg_encode(self, tier: str, duration: float):
+        """Record how long encoding one JPEG tier took"""
+        self.jpeg_encode_time.labels(tier=tier).observe(duration)
+
+    def record_worker_frame(self, worker_id: str):
+        """Record a frame completed by an inference worker process"""
+        self.worker_frames.labels(worker_id=worker_id).inc()
+
+    def record_dropped_frame(self, camera_id: str):
+        """Record a captured frame that was skipped in favour of a newer one"""
+        self.frames_dropped.labels(camera_id=camera_id).inc()
+
+    def record_capture_state(self, camera_id: str, state: str):
+        """Mark a camera source's current connection state"""
+        for known in ("connecting", "live", "stalled", "stopped"):
+            self.camera_capture_state.labels(camera_id=camera_id, state=known).set(int(known == state))
+
+    def record_decode_fps(self, camera_id: str, fps: float):
+        self.camera_decode_fps.labels(camera_id=camera_id).set(fps)
+
+    def record_capture_reconnect(self, camera_id: str):
+        self.camera_reconnects.labels(camera_id=camera_id).inc()
+
+    def record_camera_target(self, camera_id: str, fps: float, imgsz: int):
+        """Record the frame rate and input size a camera should run at"""
+        self.camera_target_fps.labels(camera_id=camera_id).set(fps)
+        self.camera_target_imgsz.labels(camera_id=camera_id).set(imgsz)
+
+    def clear_camera_target(self, camera_id: str):
+        """Drop the target gauges of a stopped camera"""
+        for gauge in (self.camera_target_fps, self.camera_target_imgsz):
+            try:
+                gauge.remove(camera_id)
+            except KeyError:
+                pass
+
+    def record_tracks(self, camera_id: str, active: int, finished=()):
+        """Record a camera's live track count and the dwell of tracks that ended"""
+        self.active_tracks.labels(camera_id=camera_id).set(active)
+        for track in finished:
+            self.track_dwell_seconds.labels(class_name=track.class_name).observe(track.dwell_seconds)
+
+    def pipeline_stage_observer(self, camera_id: str, stage: str):
+        """Bound observe() of one camera's stage histogram, for recorders on the hot path"""
+        if stage == "end_to_end":
+            return self.pipeline_frame_latency.labels(camera_id=camera_id).observe
+        return self.pipeline_stage_time.labels(camera_id=camera_id, stage=stage).observe
+
+    def record_clip_frame_dropped(self, camera_id: str):
+        """Record a frame the clip encoder had no room for"""
+        self.clip_frames_dropped.labels(camera_id=camera_id).inc()
+
+    def record_clip(self, result: str, duration: float = None):
+        """Record the outcome of one clip and how long writing it took"""
+        self.clips_total.labels(result=result).inc()
+        if duration is not None:
+            self.clip_write_time.observe(duration)
+
+    def record_alert(self, camera_id: str, rule_type: str):
+        """Record one alert raised by the alert engine"""
+        self.alerts_total.labels(camera_id=camera_id, rule_type=rule_type).inc()
+
+    def record_alert_observation_dropped(self):
+        """Record a frame the alert engine had no room for"""
+        self.alert_observations_dropped.inc()
+
+    def record_motion_gate(self, camera_id: str, skipped: bool, skip_ratio: float):
+        """Record one motion gate decision and the camera's recent skip ratio"""
+        self.motion_gate_frames.labels(
+            camera_id=camera_id,
+            decision="skipped" if skipped else "inferred"
+        ).inc()
+        self.motion_gate_skip_ratio.labels(camera_id=camera_id).set(skip_ratio)
+
+    def record_db_checkout(self, wait: float, timed_out: bool = False):
+        """Record how long a request waited for a pooled database connection"""
+        self.db_pool_checkout_wait.observe(wait)
+        if timed_out:
+            self.db_pool_checkout_timeouts.inc()
+
+    def watch_db_pool(self, pool):
+        """Report the pool's connection usage whenever metrics are scraped"""
+        self.db_pool_connections.labels(state="in_use").set_function(pool.checkedout)
+        self.db_pool_connections.labels(state="idle").set_function(pool.checkedin)
+        self.db_pool_connections.labels(state="overflow").set_function(lambda: max(0, pool.overflow()))
+
+    def record_inference_batch(self, model_type: str, batch_size: int,
+                               queue_waits: list):
+        """Record the size of a batched inference call and how long its frames queued"""
+        self.inference_batch_size.labels(model_type=model_type).observe(batch_size)
+        wait_histogram = self.inference_queue_wait.labels(model_type=model_type)
+        for wait in queue_waits:
+            wait_histogram.observe(wait)
+
 # Create a global metrics instance
 metrics = MetricsManager()
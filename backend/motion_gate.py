@@ -0,0 +1,71 @@
+import os
+import time
+from collections import deque
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from .monitoring.metrics import metrics
+
+# Motion gate configuration (overridable through the environment)
+MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "0.005"))  # Default fraction of changed pixels
+MOTION_REFRESH_SECONDS = float(os.getenv("MOTION_REFRESH_SECONDS", "5"))
+
+MOTION_FRAME_WIDTH = 160  # Frames are compared at this width
+MOTION_PIXEL_DELTA = 25  # Grey-level change that counts a pixel as changed
+SKIP_RATIO_WINDOW = 200  # Decisions the reported skip ratio is averaged over
+
+
+class MotionGate:
+    """Decides whether a camera frame changed enough to be worth running YOLO on.
+
+    Frames are shrunk to a small, blurred greyscale image and compared with
+    the one the model last saw. Below ``threshold`` (the fraction of pixels
+    that changed) the caller reuses its previous detections. Comparing with
+    the last inferred frame rather than the previous one means slow changes
+    still add up to a refresh, and ``refresh_seconds`` forces one regardless.
+    A threshold of 0 disables gating.
+    """
+
+    def __init__(self, camera_id: int, threshold: Optional[float] = None,
+                 refresh_seconds: float = MOTION_REFRESH_SECONDS,
+                 frame_width: int = MOTION_FRAME_WIDTH):
+        self.camera_id = str(camera_id)
+        self.threshold = MOTION_THRESHOLD if threshold is None else threshold
+        self.refresh_seconds = refresh_seconds
+        self.frame_width = frame_width
+        self._reference: Optional[np.ndarray] = None
+        self._last_inference = 0.0
+        self._decisions = deque(maxlen=SKIP_RATIO_WINDOW)
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        height = max(1, round(frame.shape[0] * self.frame_width / frame.shape[1]))
+        small = cv2.resize(frame, (self.frame_width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (5, 5), 0)  # Suppress sensor noise
+
+    def should_infer(self, frame: np.ndarray, force: bool = False) -> bool:
+        """True if the frame needs inference; it then becomes the new reference"""
+        now = time.monotonic()
+        infer = (
+            force
+            or self.threshold <= 0
+            or self._reference is None
+            or now - self._last_inference >= self.refresh_seconds
+        )
+        prepared = None
+        if not infer:
+            prepared = self._prepare(frame)
+            diff = cv2.absdiff(prepared, self._reference)
+            changed = cv2.countNonZero((diff > MOTION_PIXEL_DELTA).view(np.uint8)) / diff.size
+            infer = changed >= self.threshold
+
+        if infer:
+            self._reference = prepared if prepared is not None else self._prepare(frame)
+            self._last_inference = now
+
+        self._decisions.append(not infer)
+        metrics.record_motion_gate(self.camera_id, skipped=not infer,
+                                   skip_ratio=sum(self._decisions) / len(self._decisions))
+        return infer
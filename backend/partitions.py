@@ -0,0 +1,209 @@
+"""Optional monthly range partitioning of detection_events.
+
+A plain table keeps working; partitioning is switched on once with:
+    python -m backend.partitions convert
+
+Stop the backend while converting: the table is rebuilt under an exclusive
+lock. Afterwards the backend keeps partitions created ahead of time and,
+when EVENT_RETENTION_MONTHS is set, drops whole months of old raw events.
+The stats endpoints are unaffected because the rollup tables keep their
+counts.
+"""
+import argparse
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from .schema_upgrade import create_missing_indexes
+
+# Partition configuration (overridable through the environment)
+EVENT_PARTITIONS_AHEAD = int(os.getenv("EVENT_PARTITIONS_AHEAD", "2"))
+EVENT_RETENTION_MONTHS = int(os.getenv("EVENT_RETENTION_MONTHS", "0"))  # 0 keeps everything
+PARTITION_MAINTENANCE_INTERVAL = 6 * 3600  # Seconds between maintenance runs
+
+TABLE = "detection_events"
+_PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{TABLE}_p{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(conn) -> bool:
+    """Whether detection_events is a partitioned table"""
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table)"
+    ), {"table": TABLE}).scalar()
+
+
+def list_partitions(conn, parent: str = TABLE) -> List[str]:
+    return sorted(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :parent"
+    ), {"parent": parent}).scalars())
+
+
+def ensure_partitions(conn, first_month: datetime, months_ahead: int = EVENT_PARTITIONS_AHEAD,
+                      parent: str = TABLE) -> int:
+    """Create monthly partitions from first_month up to months_ahead past the current month"""
+    month = month_start(first_month)
+    last = add_months(month_start(datetime.utcnow()), months_ahead)
+    existing = set(list_partitions(conn, parent))
+    created = 0
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            conn.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{parent}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created += 1
+        month = add_months(month, 1)
+    return created
+
+
+def drop_expired_partitions(conn, retention_months: int = EVENT_RETENTION_MONTHS) -> List[str]:
+    """Drop partitions whose whole month is older than the retention window"""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(datetime.utcnow()), -retention_months)
+    dropped = []
+    for name in list_partitions(conn):
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            continue
+        month = datetime(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= cutoff:
+            conn.execute(text(f'DROP TABLE "{name}"'))
+            dropped.append(name)
+    return dropped
+
+
+def convert_to_partitioned(engine, months_ahead: int = EVENT_PARTITIONS_AHEAD) -> bool:
+    """Rebuild detection_events as a table partitioned by month; False if it already is"""
+    staging = f"{TABLE}_partitioned"
+    with engine.begin() as conn:
+        if is_partitioned(conn):
+            return False
+
+        conn.execute(text(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE"))
+        sequence = conn.execute(text(f"SELECT pg_get_serial_sequence('{TABLE}', 'id')")).scalar()
+
+        # The partition key has to be NOT NULL and part of the primary key
+        conn.execute(text(
+            f"UPDATE {TABLE} SET timestamp = (now() AT TIME ZONE 'utc') WHERE timestamp IS NULL"
+        ))
+        conn.execute(text(
+            f"CREATE TABLE {staging} (LIKE {TABLE} INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp)"
+        ))
+        conn.execute(text(f"ALTER TABLE {staging} ALTER COLUMN timestamp SET NOT NULL"))
+        conn.execute(text(
+            f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id, timestamp)"
+        ))
+
+        first = conn.execute(text(f"SELECT min(timestamp) FROM {TABLE}")).scalar() or datetime.utcnow()
+        ensure_partitions(conn, first, months_ahead, parent=staging)
+        conn.execute(text(f"INSERT INTO {staging} SELECT * FROM {TABLE}"))
+
+        # Swap the tables, keeping the id sequence alive across the drop
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+        conn.execute(text(f"DROP TABLE {TABLE}"))
+        conn.execute(text(f"ALTER TABLE {staging} RENAME TO {TABLE}"))
+        conn.execute(text(f"ALTER TABLE {TABLE} RENAME CONSTRAINT {staging}_pkey TO {TABLE}_pkey"))
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id"))
+        create_missing_indexes(conn)  # Indexes on the parent cascade to every partition
+    return True
+
+
+class PartitionMaintainer:
+    """Creates upcoming monthly partitions and applies the retention window.
+
+    Does nothing while detection_events is a plain table.
+    """
+
+    def __init__(self, engine, months_ahead: int = EVENT_PARTITIONS_AHEAD,
+                 retention_months: int = EVENT_RETENTION_MONTHS,
+                 interval: float = PARTITION_MAINTENANCE_INTERVAL):
+        self.engine = engine
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self):
+        """Run one maintenance pass"""
+        with self.engine.begin() as conn:
+            if not is_partitioned(conn):
+                return
+            created = ensure_partitions(conn, datetime.utcnow(), self.months_ahead)
+            dropped = drop_expired_partitions(conn, self.retention_months)
+        if created or dropped:
+            logging.info(f"Event partitions: created {created}, dropped {', '.join(dropped) or 'none'}")
+
+    def start(self):
+        """Run maintenance now and then every interval in the background"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="🗂️ Partition Maintenance",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logging.error(f"Error maintaining event partitions: {str(e)}")
+            self._stop.wait(self.interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly partitions of detection_events")
+    parser.add_argument("command", choices=["convert", "maintain"],
+                        help="convert: partition the existing table; maintain: create and expire partitions once")
+    args = parser.parse_args()
+
+    from .db_settings import engine, init_db
+
+    init_db()
+    if args.command == "convert":
+        converted = convert_to_partitioned(engine)
+        print("Converted detection_events to monthly partitions" if converted
+              else "detection_events is already partitioned")
+    PartitionMaintainer(engine).run_once()
+    with engine.connect() as conn:
+        for name in list_partitions(conn):
+            print(name)
+
+
+if __name__ == "__main__":
+    main()
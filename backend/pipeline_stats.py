@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .monitoring.metrics import metrics
+
+# Pipeline stats configuration (overridable through the environment)
+PIPELINE_STATS_WINDOW = int(os.getenv("PIPELINE_STATS_WINDOW", "1024"))  # Samples kept per camera and stage
+
+# Stages in the order a frame passes through them; encode runs on viewer threads, after publish
+PIPELINE_STAGES = ("capture", "preprocess", "infer", "annotate", "publish", "encode", "end_to_end")
+PERCENTILES = (50, 95, 99)
+
+
+class StageWindow:
+    """The most recent durations of one stage on one camera, in a fixed ring buffer"""
+
+    def __init__(self, observe, size: int = PIPELINE_STATS_WINDOW):
+        self._observe = observe  # Prometheus histogram child, resolved once
+        self._samples = np.zeros(max(1, size), np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples[self._count % len(self._samples)] = seconds
+            self._count += 1
+        self._observe(seconds)
+
+    def samples(self) -> Tuple[int, np.ndarray]:
+        """Total samples recorded and a copy of those still in the window"""
+        with self._lock:
+            return self._count, self._samples[:min(self._count, len(self._samples))].copy()
+
+    def summary(self) -> Dict:
+        """Rolling percentiles in milliseconds over the samples in the window"""
+        return summarize(*self.samples())
+
+
+def summarize(count: int, samples: np.ndarray) -> Dict:
+    """Count, mean and percentiles of durations in seconds, reported in milliseconds"""
+    if not len(samples):
+        return {"count": count}
+    values = np.percentile(samples, PERCENTILES) * 1000
+    summary = {"count": count, "mean_ms": round(float(samples.mean()) * 1000, 3)}
+    for percentile, value in zip(PERCENTILES, values):
+        summary[f"p{percentile}_ms"] = round(float(value), 3)
+    return summary
+
+
+class FrameTrace:
+    """Timestamps of one frame on its way through a camera's pipeline.
+
+    Each ``mark`` records the time since the previous mark as that stage's
+    duration, so the capture loop only calls ``mark`` between its stages.
+    """
+    __slots__ = ("stats", "camera_id", "seq", "captured_at", "_last")
+
+    def __init__(self, stats: "PipelineStats", camera_id: int, seq: int, captured_at: float):
+        self.stats = stats
+        self.camera_id = camera_id
+        self.seq = seq
+        self.captured_at = captured_at
+        self._last = captured_at
+
+    def mark(self, stage: str):
+        now = time.perf_counter()
+        self.stats.record(self.camera_id, stage, now - self._last)
+        self._last = now
+
+    def finish(self):
+        """Record the frame's end-to-end latency, from decode to publish"""
+        self.stats.record(self.camera_id, "end_to_end", time.perf_counter() - self.captured_at)
+        self.stats.last_seq[self.camera_id] = self.seq
+
+
+class PipelineStats:
+    """Per-stage latency of every camera's pipeline.
+
+    Durations go to the ``pipeline_stage_duration_seconds`` and
+    ``pipeline_frame_latency_seconds`` histograms and into rolling windows
+    that back the /api/pipeline-stats percentiles. Recording is a lock, an
+    array store and an observe on a cached histogram child, so it is cheap
+    enough to run for every frame.
+    """
+
+    def __init__(self, window: int = PIPELINE_STATS_WINDOW):
+        self.window = window
+        self._stages: Dict[Tuple[int, str], StageWindow] = {}
+        self._lock = threading.Lock()
+        self.last_seq: Dict[int, int] = {}  # Sequence number of each camera's last finished frame
+
+    def trace(self, camera_id: int, seq: int, captured_at: float) -> FrameTrace:
+        """Start tracing a frame; ``captured_at`` is its decode time on the perf_counter clock"""
+        return FrameTrace(self, camera_id, seq, captured_at)
+
+    def record(self, camera_id: int, stage: str, seconds: float):
+        key = (camera_id, stage)
+        stage_window = self._stages.get(key)
+        if stage_window is None:
+            with self._lock:
+                stage_window = self._stages.get(key)
+                if stage_window is None:
+                    stage_window = self._stages[key] = StageWindow(
+                        metrics.pipeline_stage_observer(str(camera_id), stage), self.window
+                    )
+        stage_window.record(seconds)
+
+    def remove(self, camera_id: int):
+        """Forget a stopped camera's windows so the next run starts fresh"""
+        with self._lock:
+            for key in [key for key in self._stages if key[0] == camera_id]:
+                del self._stages[key]
+            self.last_seq.pop(camera_id, None)
+
+    def stage_summary(self, stage: str) -> Dict:
+        """Percentiles of one stage over the windows of every camera together"""
+        with self._lock:
+            windows = [w for (_, name), w in self._stages.items() if name == stage]
+        counts, samples = zip(*(w.samples() for w in windows)) if windows else ((), ())
+        return summarize(sum(counts), np.concatenate(samples) if samples else np.zeros(0))
+
+    def snapshot(self, camera_id: Optional[int] = None) -> Dict:
+        """Rolling percentiles per camera and stage, as reported by the API"""
+        with self._lock:
+            stages = list(self._stages.items())
+        cameras: Dict[str, Dict] = {}
+        order = {stage: index for index, stage in enumerate(PIPELINE_STAGES)}
+        for (cid, stage), stage_window in sorted(
+            stages, key=lambda item: (item[0][0], order.get(item[0][1], len(order)))
+        ):
+            if camera_id is not None and cid != camera_id:
+                continue
+            camera = cameras.setdefault(str(cid), {"last_seq": self.last_seq.get(cid), "stages": {}})
+            camera["stages"][stage] = stage_window.summary()
+        return {"window": self.window, "cameras": cameras}
+
+
+pipeline_stats = PipelineStats()
@@ -0,0 +1,314 @@
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .renderer import FrameDetections, extract_detections, render
+from .roi import FrameRegion, class_ids, crop, to_frame
+from .monitoring.metrics import metrics
+
+# Number of inference worker processes; 0 keeps inference in the API process
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+# Intra-op threads per worker; 0 splits the CPU cores evenly between the workers
+INFERENCE_WORKER_THREADS = int(os.getenv("INFERENCE_WORKER_THREADS", "0"))
+
+
+@dataclass
+class FrameTask:
+    """A frame waiting in shared memory for a worker process"""
+    task_id: int
+    camera_id: int
+    model_type: str
+    shm_name: str
+    shape: tuple
+    imgsz: Optional[int] = None  # Inference input size; None uses the model default
+    region: Optional[FrameRegion] = None  # Part of the frame to run the model on
+    classes: Optional[List[str]] = None  # Class allow-list; None keeps all drawn classes
+    backend: Optional[str] = None  # Model runtime; None uses MODEL_BACKEND
+
+
+@dataclass
+class WorkerResult:
+    """What a worker sends back: timings and what it detected.
+
+    The annotated frame itself is written back into the camera's shared
+    memory block; ``process`` copies it out into ``annotated_frame``.
+    """
+    task_id: int
+    camera_id: int
+    worker_id: int
+    detections: Optional[FrameDetections] = None
+    model_task: str = "unknown"
+    duration: float = 0.0
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    annotated_frame: Optional[np.ndarray] = None
+
+
+def worker_threads(num_workers: int, threads: int = INFERENCE_WORKER_THREADS) -> int:
+    """Intra-op threads for each of num_workers workers, so together they fill the cores once"""
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // max(1, num_workers))
+
+
+def _worker_main(worker_id: int, task_queue, result_queue, threads: int):
+    """Entry point of a worker process: infer and annotate frames in place"""
+    # Before torch is imported, so its OpenMP/MKL pools start at this size
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    import cv2
+    import torch
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(threads)
+
+    from .model_registry import model_registry
+
+    model_registry.preload()
+    attached: Dict[int, SharedMemory] = {}  # Latest block seen for each camera
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        start_time = time.perf_counter()
+        try:
+            shm = attached.get(task.camera_id)
+            if shm is None or shm.name != task.shm_name:
+                if shm is not None:
+                    shm.close()
+                # Spawned workers share the API process's resource tracker, which
+                # already owns the block, so attaching needs no extra bookkeeping
+                shm = attached[task.camera_id] = SharedMemory(name=task.shm_name)
+            frame = np.ndarray(task.shape, dtype=np.uint8, buffer=shm.buf)
+
+            model = model_registry.get(task.model_type, task.backend)
+            predict_kwargs = {"imgsz": task.imgsz} if task.imgsz else {}
+            predict_kwargs["classes"] = class_ids(model.names, task.classes)
+            result = model(crop(frame, task.region), verbose=False, **predict_kwargs)[0]
+            detections = to_frame(extract_detections(result), task.region)
+            frame[...] = render(frame, detections)
+
+            result_queue.put(WorkerResult(
+                task_id=task.task_id,
+                camera_id=task.camera_id,
+                worker_id=worker_id,
+                detections=detections.summary(),  # Masks stay in the worker
+                model_task=model.task,
+                duration=time.perf_counter() - start_time
+            ))
+        except Exception as e:
+            result_queue.put(WorkerResult(
+                task_id=task.task_id,
+                camera_id=task.camera_id,
+                worker_id=worker_id,
+                duration=time.perf_counter() - start_time,
+                error=str(e),
+                error_type=type(e).__name__
+            ))
+
+    for shm in attached.values():
+        shm.close()
+
+
+class InferenceProcessPool:
+    """Runs inference and annotation in N worker processes.
+
+    Each camera owns one shared memory block that its frames are copied into
+    and that the worker writes the annotated frame back to, so only a small
+    task description is pickled in either direction. A camera thread waits
+    for its result before sending the next frame, which is what makes a
+    single block per camera safe to reuse. Each worker's intra-op thread
+    pools are limited to ``threads``, so N workers do not oversubscribe the
+    CPU.
+    """
+
+    def __init__(self, num_workers: int = INFERENCE_WORKERS, threads: int = INFERENCE_WORKER_THREADS):
+        self.num_workers = max(1, num_workers)
+        self.threads = worker_threads(self.num_workers, threads)
+        self._ctx = mp.get_context("spawn")
+        self._task_queue = None
+        self._result_queue = None
+        self._workers = []
+        self._slots: Dict[int, SharedMemory] = {}
+        self._slots_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._running = False
+        self._listener: Optional[threading.Thread] = None
+
+    def start(self):
+        """Spawn the worker processes and the result listener"""
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        for worker_id in range(self.num_workers):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, self._task_queue, self._result_queue, self.threads),
+                name=f"inference-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self._workers.append(process)
+
+        self._running = True
+        self._listener = threading.Thread(
+            target=self._collect_results,
+            name="🧠 Inference Pool Results",
+            daemon=True
+        )
+        self._listener.start()
+        logging.info(
+            f"Inference process pool started with {self.num_workers} workers of {self.threads} threads"
+        )
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers and release all shared memory"""
+        if not self._running:
+            return
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for process in self._workers:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+
+        self._running = False
+        if self._listener is not None:
+            self._listener.join(timeout=timeout)
+            self._listener = None
+
+        with self._pending_lock:
+            for future in self._pending.values():
+                future.set_exception(RuntimeError("Inference pool stopped"))
+            self._pending.clear()
+
+        with self._slots_lock:
+            for shm in self._slots.values():
+                shm.close()
+                shm.unlink()
+            self._slots.clear()
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames sent to the workers that have no result yet"""
+        with self._pending_lock:
+            return len(self._pending)
+
+    def submit(self, camera_id: int, model_type: str, frame: np.ndarray,
+               imgsz: Optional[int] = None, region: Optional[FrameRegion] = None,
+               classes: Optional[List[str]] = None, backend: Optional[str] = None) -> Future:
+        """Copy a frame into the camera's shared memory block and queue it"""
+        if not self._running:
+            raise RuntimeError("Inference pool is not running")
+
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        shm = self._slot_for(camera_id, frame.nbytes)
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=shm.buf)[...] = frame
+
+        task = FrameTask(
+            task_id=next(self._task_ids),
+            camera_id=camera_id,
+            model_type=model_type,
+            shm_name=shm.name,
+            shape=frame.shape,
+            imgsz=imgsz,
+            region=region,
+            classes=classes,
+            backend=backend
+        )
+        future = Future()
+        with self._pending_lock:
+            self._pending[task.task_id] = future
+        self._task_queue.put(task)
+        return future
+
+    def process(self, camera_id: int, model_type: str, frame: np.ndarray,
+                timeout: Optional[float] = 10.0, imgsz: Optional[int] = None,
+                region: Optional[FrameRegion] = None,
+                classes: Optional[List[str]] = None,
+                backend: Optional[str] = None) -> WorkerResult:
+        """Run a frame through a worker and wait for the annotated result"""
+        future = self.submit(camera_id, model_type, frame, imgsz, region, classes, backend)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            self._abandon(camera_id, future)
+            raise
+        with self._slots_lock:
+            shm = self._slots[camera_id]
+        # Copy out before the camera's next frame overwrites the block
+        result.annotated_frame = np.ndarray(frame.shape, dtype=np.uint8, buffer=shm.buf).copy()
+        metrics.frame_processing_time.labels(
+            camera_id=str(camera_id),
+            model_type=result.model_task
+        ).observe(result.duration)
+        return result
+
+    def release(self, camera_id: int):
+        """Free the shared memory block of a stopped camera"""
+        with self._slots_lock:
+            shm = self._slots.pop(camera_id, None)
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    def _abandon(self, camera_id: int, future: Future):
+        """Give up on a frame a worker may still be using.
+
+        Its late result is ignored and the camera moves to a new block, so
+        the worker can never touch the block the next frame is copied into.
+        """
+        with self._pending_lock:
+            for task_id, pending in list(self._pending.items()):
+                if pending is future:
+                    del self._pending[task_id]
+        # Unlinking only removes the name; a worker that has the block mapped keeps it
+        self.release(camera_id)
+
+    def _slot_for(self, camera_id: int, nbytes: int) -> SharedMemory:
+        with self._slots_lock:
+            shm = self._slots.get(camera_id)
+            if shm is None or shm.size < nbytes:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                shm = self._slots[camera_id] = SharedMemory(create=True, size=nbytes)
+            return shm
+
+    def _collect_results(self):
+        """Hand worker results back to the camera threads waiting on them"""
+        while self._running:
+            try:
+                result = self._result_queue.get(timeout=0.1)
+            except Empty:
+                continue
+
+            with self._pending_lock:
+                future = self._pending.pop(result.task_id, None)
+            if future is None:
+                continue
+
+            metrics.record_worker_frame(str(result.worker_id))
+            if result.error is not None:
+                metrics.record_error(
+                    camera_id=str(result.camera_id),
+                    error_type=result.error_type,
+                    component="inference_worker"
+                )
+                future.set_exception(RuntimeError(result.error))
+            else:
+                future.set_result(result)
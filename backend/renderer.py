@@ -0,0 +1,235 @@
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Define color constants
+KEYPOINT_COLOR = (0, 255, 0)  # Green
+SKELETON_COLOR = (0, 255, 255)  # Yellow
+DETECTION_COLORS = {
+    "person": (0, 0, 255),    # Red
+    "bottle": (0, 255, 0),    # Green
+    "potted plant": (255, 0, 0)  # Blue
+}
+
+KEYPOINT_THRESHOLD = 0.5
+MASK_THRESHOLD = 0.5
+MASK_ALPHA = 0.4  # Mask weight when blending with the frame
+KEYPOINT_RADIUS = 4
+
+# Skeleton connections (COCO format, zero-based keypoint indices)
+SKELETON = np.array([
+    [16,14], [14,12], [17,15], [15,13], [12,13], [6,12], [7,13],
+    [6,7], [6,8], [7,9], [8,10], [9,11], [2,3], [1,2], [1,3],
+    [2,4], [3,5], [4,6], [5,7]
+]) - 1
+
+# Pixel offsets of a filled keypoint dot, stamped with one array assignment
+_yy, _xx = np.mgrid[-KEYPOINT_RADIUS:KEYPOINT_RADIUS + 1, -KEYPOINT_RADIUS:KEYPOINT_RADIUS + 1]
+_DOT = np.stack([_xx.ravel(), _yy.ravel()], axis=1)[(_xx ** 2 + _yy ** 2).ravel() <= KEYPOINT_RADIUS ** 2]
+
+
+@dataclass
+class FrameDetections:
+    """Detections of one frame as plain NumPy arrays, one row per instance.
+
+    Only classes in DETECTION_COLORS are kept. ``masks`` are at the model's
+    input resolution and ``keypoints`` are (x, y, confidence) per joint.
+    ``track_ids`` is filled in by the camera's ObjectTracker. When the
+    model only saw part of the frame, ``mask_region`` is the (x0, y0, x1, y1)
+    rectangle the masks cover.
+    """
+    boxes: np.ndarray           # (N, 4) x1, y1, x2, y2
+    confidences: np.ndarray     # (N,)
+    class_names: List[str]
+    masks: Optional[np.ndarray] = None      # (N, h, w)
+    keypoints: Optional[np.ndarray] = None  # (N, K, 3)
+    track_ids: Optional[np.ndarray] = None  # (N,)
+    mask_region: Optional[Tuple[int, int, int, int]] = None
+
+    def __len__(self):
+        return len(self.class_names)
+
+    def summary(self) -> "FrameDetections":
+        """Copy without masks, small enough to send between processes"""
+        return replace(self, masks=None)
+
+
+def extract_detections(result) -> FrameDetections:
+    """Pull everything the renderer needs out of a YOLO result.
+
+    Boxes come over as one (N, 6) array; instances of other classes are
+    dropped before masks or keypoints are moved off the device, which then
+    happens in a single transfer each.
+    """
+    if getattr(result, 'boxes', None) is None or len(result.boxes) == 0:
+        return FrameDetections(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), [])
+
+    data = result.boxes.data.cpu().numpy()  # x1, y1, x2, y2, conf, cls
+    names = result.names
+    class_names = [names[int(c)] for c in data[:, 5]]
+    keep = np.array([name in DETECTION_COLORS for name in class_names], dtype=bool)
+    keep_idx = np.flatnonzero(keep)
+
+    masks = None
+    if getattr(result, 'masks', None) is not None and len(keep_idx):
+        masks = result.masks.data[keep_idx].cpu().numpy()
+
+    keypoints = None
+    if getattr(result, 'keypoints', None) is not None and len(keep_idx):
+        keypoints = result.keypoints.data[keep_idx].cpu().numpy()
+
+    return FrameDetections(
+        boxes=data[keep, :4],
+        confidences=data[keep, 4],
+        class_names=[class_names[i] for i in keep_idx],
+        masks=masks,
+        keypoints=keypoints
+    )
+
+
+def _scale_mask_to_frame(mask: np.ndarray, frame_shape) -> np.ndarray:
+    """Undo the model's letterbox padding and resize a mask to the frame size"""
+    mask_h, mask_w = mask.shape[:2]
+    frame_h, frame_w = frame_shape[:2]
+    if (mask_h, mask_w) != (frame_h, frame_w):
+        gain = min(mask_h / frame_h, mask_w / frame_w)
+        pad_x = int(round((mask_w - frame_w * gain) / 2 - 0.1))
+        pad_y = int(round((mask_h - frame_h * gain) / 2 - 0.1))
+        mask = mask[pad_y:mask_h - pad_y, pad_x:mask_w - pad_x]
+        mask = cv2.resize(mask, (frame_w, frame_h), interpolation=cv2.INTER_NEAREST)
+    return mask
+
+
+def _draw_masks(annotated_frame: np.ndarray, detections: FrameDetections):
+    """Blend every instance mask into the frame with a single addWeighted"""
+    # Label map at mask resolution: 0 is background, i + 1 is instance i.
+    # Later instances win where masks overlap, matching sequential drawing.
+    # uint16 so that frames with more than 255 instances keep their labels.
+    owner = np.zeros(detections.masks.shape[1:], dtype=np.uint16)
+    for i, instance in enumerate(detections.masks > MASK_THRESHOLD):
+        owner[instance] = i + 1
+    covered = owner > 0
+    if not covered.any():
+        return
+
+    palette = np.array(
+        [(0, 0, 0)] + [DETECTION_COLORS[n] for n in detections.class_names], dtype=np.uint8
+    )
+    color_layer = palette[owner]
+
+    color_layer = _scale_mask_to_frame(color_layer, annotated_frame.shape)
+    area = _scale_mask_to_frame(covered.view(np.uint8), annotated_frame.shape)
+
+    blended = cv2.addWeighted(annotated_frame, 1 - MASK_ALPHA, color_layer, MASK_ALPHA, 0)
+    cv2.copyTo(blended, area, annotated_frame)
+
+
+def _draw_keypoints(annotated_frame: np.ndarray, keypoints: np.ndarray):
+    """Draw all visible joints and skeleton edges from array operations"""
+    height, width = annotated_frame.shape[:2]
+    visible = keypoints[..., 2] > KEYPOINT_THRESHOLD  # (N, K)
+    points = keypoints[..., :2].astype(np.int32)
+
+    # Skeleton: every edge with both ends visible, drawn in one polylines call
+    edge_visible = visible[:, SKELETON[:, 0]] & visible[:, SKELETON[:, 1]]
+    segments = np.stack([points[:, SKELETON[:, 0]], points[:, SKELETON[:, 1]]], axis=2)[edge_visible]
+    if len(segments):
+        cv2.polylines(annotated_frame, list(segments), False, SKELETON_COLOR, 2)
+
+    # Joints: stamp a filled dot around every visible keypoint
+    centers = points[visible]
+    if len(centers):
+        pixels = (centers[:, None, :] + _DOT[None, :, :]).reshape(-1, 2)
+        inside = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+        pixels = pixels[inside]
+        annotated_frame[pixels[:, 1], pixels[:, 0]] = KEYPOINT_COLOR
+
+
+@lru_cache(maxsize=1024)
+def _label_sprite(label: str, color: Tuple[int, int, int]) -> Tuple[np.ndarray, int]:
+    """Label text on its coloured background, and the text height.
+
+    Tracked objects keep the same label from frame to frame, so after the
+    first frame drawing their label is a single array copy.
+    """
+    (width, height), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+    sprite = np.empty((height + baseline + 1, width + 1, 3), np.uint8)
+    sprite[...] = color
+    cv2.putText(sprite, label, (0, height), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+    return sprite, height
+
+
+def _paste(annotated_frame: np.ndarray, sprite: np.ndarray, x: int, y: int):
+    """Copy a sprite onto the frame with its top-left corner at (x, y), clipped to the frame"""
+    frame_h, frame_w = annotated_frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite.shape[1], frame_w), min(y + sprite.shape[0], frame_h)
+    if x0 < x1 and y0 < y1:
+        annotated_frame[y0:y1, x0:x1] = sprite[y0 - y:y1 - y, x0 - x:x1 - x]
+
+
+def _draw_boxes(annotated_frame: np.ndarray, detections: FrameDetections):
+    """Draw boxes grouped by colour, then one label per box"""
+    corners = detections.boxes.astype(np.int32)
+    names = np.array(detections.class_names)
+    for class_name, color in DETECTION_COLORS.items():
+        selected = corners[names == class_name]
+        if len(selected):
+            x1, y1, x2, y2 = selected.T
+            outlines = np.stack([
+                np.stack([x1, y1], axis=1), np.stack([x2, y1], axis=1),
+                np.stack([x2, y2], axis=1), np.stack([x1, y2], axis=1)
+            ], axis=1)
+            cv2.polylines(annotated_frame, list(outlines), True, color, 2)
+
+    track_ids = detections.track_ids
+    for i, ((x1, y1, _, _), class_name) in enumerate(zip(corners, detections.class_names)):
+        # Tracked objects are labelled by track, which keeps their label stable
+        if track_ids is not None:
+            label = f"{class_name} #{track_ids[i]}"
+        else:
+            label = f"{class_name} {detections.confidences[i]:.2f}"
+        sprite, text_height = _label_sprite(label, DETECTION_COLORS[class_name])
+
+        label_y = max(y1 - 10, text_height)
+        _paste(annotated_frame, sprite, int(x1), int(label_y - text_height))
+
+
+def render(frame: np.ndarray, detections: FrameDetections) -> np.ndarray:
+    """Draw detections onto a copy of the frame"""
+    annotated_frame = frame.copy()
+
+    if len(detections):
+        if detections.keypoints is not None:
+            _draw_keypoints(annotated_frame, detections.keypoints)
+        if detections.masks is not None:
+            if detections.mask_region is not None:
+                x0, y0, x1, y1 = detections.mask_region
+                _draw_masks(annotated_frame[y0:y1, x0:x1], detections)
+            else:
+                _draw_masks(annotated_frame, detections)
+        _draw_boxes(annotated_frame, detections)
+
+    # Add frame metadata
+    cv2.putText(
+        annotated_frame,
+        f"Frame Size: {frame.shape[1]}x{frame.shape[0]}",
+        (10, 30),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (255, 255, 255),
+        2
+    )
+    return annotated_frame
+
+
+def annotate_result(frame: np.ndarray, result) -> Tuple[np.ndarray, FrameDetections]:
+    """Extract and draw a YOLO result; returns the annotated frame and its detections.
+
+    This has no dependency on application state, so it can run in a worker process.
+    """
+    detections = extract_detections(result)
+    return render(frame, detections), detections
@@ -0,0 +1,246 @@
+"""Record a camera's raw input and play it back as a camera source.
+
+A recording is a directory holding ``frames.mkv`` (every decoded frame,
+losslessly encoded with FFV1 by default), ``timestamps.bin`` (capture time
+of each frame as little-endian float64 seconds from the first frame) and
+``meta.json``. Any camera whose stream is ``replay://<recording dir>``
+plays it back, paced by the recorded timestamps; add ``?speed=2`` to play
+faster. ``?speed=0`` drops the pacing and runs in lockstep with the
+pipeline instead: the grabber hands over every recorded frame and waits for
+it to be taken before reading the next, so nothing is dropped and a replay
+sees exactly the recorded footage. Like video files, replays loop.
+"""
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from queue import Queue, Empty, Full
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+# Recording configuration (overridable through the environment)
+RECORDING_DIR = os.getenv("RECORDING_DIR", "recordings")
+RECORDING_CODEC = os.getenv("RECORDING_CODEC", "FFV1")  # Lossless; MJPG is far cheaper but lossy
+RECORDING_MAX_SECONDS = float(os.getenv("RECORDING_MAX_SECONDS", "600"))
+
+RECORDING_QUEUE_FRAMES = 64  # Frames waiting for the recorder before new ones are dropped
+REPLAY_SCHEME = "replay://"
+FRAMES_FILE = "frames.mkv"
+TIMESTAMPS_FILE = "timestamps.bin"
+META_FILE = "meta.json"
+
+
+def is_replay_source(source) -> bool:
+    return isinstance(source, str) and source.startswith(REPLAY_SCHEME)
+
+
+def is_lockstep_source(source) -> bool:
+    """A replay at speed 0, whose every frame must reach the pipeline"""
+    return is_replay_source(source) and parse_replay_source(source)[1] == 0
+
+
+def parse_replay_source(source: str) -> Tuple[str, float]:
+    """Recording directory and playback speed of a replay:// source.
+
+    Raises ValueError unless the speed is a finite number of at least 0.
+    """
+    parts = urlsplit(source)
+    path = source[len(REPLAY_SCHEME):].split("?", 1)[0]
+    value = parse_qs(parts.query).get("speed", ["1"])[0]
+    try:
+        speed = float(value)
+    except ValueError:
+        speed = -1.0
+    if not (math.isfinite(speed) and speed >= 0):
+        raise ValueError(f"Replay speed must be a number of at least 0, got {value!r}")
+    return path, speed
+
+
+class FrameRecorder:
+    """Writes one camera's decoded frames and their capture times to a recording.
+
+    ``add`` only queues the frame, so the capture thread never waits for the
+    encoder; frames that do not fit are dropped and show up as gaps in the
+    timestamps. Recording ends after ``max_seconds`` or on ``stop``.
+    """
+
+    def __init__(self, camera_id, path: str, max_seconds: float = RECORDING_MAX_SECONDS,
+                 codec: str = RECORDING_CODEC, source: Optional[str] = None):
+        self.camera_id = camera_id
+        self.path = path
+        self.max_seconds = max_seconds
+        self.codec = codec
+        self.source = source
+        self.frames = 0
+        self.dropped = 0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None  # UTC wall-clock time of the first frame
+        self._first_timestamp: Optional[float] = None
+        self._queue: "Queue[Tuple[float, np.ndarray]]" = Queue(maxsize=RECORDING_QUEUE_FRAMES)
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def start(self):
+        """Create the recording directory and start the writer thread"""
+        os.makedirs(self.path, exist_ok=False)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"⏺️ Recorder {self.camera_id}",
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def add(self, timestamp: float, frame: np.ndarray) -> bool:
+        """Queue a frame captured at timestamp (monotonic clock); False once recording has ended"""
+        if self.done:
+            return False
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+            self.started_at = datetime.utcnow()
+        elif timestamp - self._first_timestamp > self.max_seconds:
+            self._done.set()
+            return False
+        try:
+            self._queue.put_nowait((timestamp - self._first_timestamp, frame))
+        except Full:
+            self.dropped += 1
+        return True
+
+    def stop(self, timeout: float = 10.0) -> Dict:
+        """Finish writing the queued frames and return the recording's metadata"""
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        return self.info()
+
+    def info(self) -> Dict:
+        return {
+            "name": os.path.basename(self.path),
+            "camera_id": self.camera_id,
+            "source": self.source,
+            "replay_source": f"{REPLAY_SCHEME}{self.path}",
+            "codec": self.codec,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "duration": round(self.duration, 3),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "recording": not self.done,
+            "error": self.error,
+        }
+
+    def _run(self):
+        writer = None
+        size = None
+        try:
+            with open(os.path.join(self.path, TIMESTAMPS_FILE), "wb") as timestamps:
+                while not (self.done and self._queue.empty()):
+                    try:
+                        timestamp, frame = self._queue.get(timeout=0.2)
+                    except Empty:
+                        continue
+                    if writer is None:
+                        size = (frame.shape[1], frame.shape[0])
+                        writer = cv2.VideoWriter(
+                            os.path.join(self.path, FRAMES_FILE),
+                            cv2.VideoWriter_fourcc(*self.codec), 30, size
+                        )
+                        if not writer.isOpened():
+                            raise RuntimeError(f"Cannot write {self.codec} video")
+                    elif (frame.shape[1], frame.shape[0]) != size:
+                        # A replay has one frame size; stop rather than rescale the input
+                        raise RuntimeError(f"Frame size changed from {size} during recording")
+                    writer.write(frame)
+                    timestamps.write(struct.pack("<d", timestamp))
+                    self.frames += 1
+                    self.duration = timestamp
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Recording for camera {self.camera_id} stopped: {str(e)}")
+        finally:
+            self._done.set()
+            if writer is not None:
+                writer.release()
+            meta = dict(self.info(), width=size[0] if size else None, height=size[1] if size else None)
+            with open(os.path.join(self.path, META_FILE), "w") as f:
+                json.dump(meta, f, indent=2)
+            logging.info(f"Recorded {self.frames} frames of camera {self.camera_id} to {self.path}")
+
+
+class ReplayCapture:
+    """Stand-in for cv2.VideoCapture that plays a recording at its recorded pace.
+
+    Only the calls FrameGrabber makes are supported. ``read`` blocks until
+    the next frame is due, as a live camera would, and rewinds at the end.
+    Setting ``stop`` ends the wait at once and makes ``read`` fail, so a
+    long gap in the recording never holds up stopping the grabber.
+    """
+
+    def __init__(self, source: str, stop: Optional[threading.Event] = None):
+        self.path, self.speed = parse_replay_source(source)
+        self._stop = stop or threading.Event()
+        self._cap = cv2.VideoCapture(os.path.join(self.path, FRAMES_FILE))
+        timestamps_path = os.path.join(self.path, TIMESTAMPS_FILE)
+        self._timestamps = (
+            np.fromfile(timestamps_path, dtype="<f8") if os.path.exists(timestamps_path) else np.zeros(0)
+        )
+        self._index = 0
+        self._started_at: Optional[float] = None
+
+    def isOpened(self) -> bool:
+        return self._cap.isOpened() and len(self._timestamps) > 0
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        ok, frame = self._cap.read()
+        if not ok or self._index >= len(self._timestamps):
+            # End of the recording: loop it
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._index, self._started_at = 0, None
+            ok, frame = self._cap.read()
+            if not ok:
+                return False, None
+
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now - self._timestamps[0] / self.speed if self.speed else now
+        if self.speed:
+            delay = self._started_at + self._timestamps[self._index] / self.speed - now
+            if delay > 0 and self._stop.wait(delay):
+                return False, None
+        self._index += 1
+        return True, frame
+
+    def get(self, prop_id: int) -> float:
+        return self._cap.get(prop_id)
+
+    def set(self, prop_id: int, value) -> bool:
+        return False
+
+    def release(self):
+        self._cap.release()
+
+
+def list_recordings(directory: str = RECORDING_DIR) -> List[Dict]:
+    """Metadata of every finished recording, newest first"""
+    if not os.path.isdir(directory):
+        return []
+    recordings = []
+    for name in os.listdir(directory):
+        meta_path = os.path.join(directory, name, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                recordings.append(json.load(f))
+    return sorted(recordings, key=lambda r: r.get("started_at") or "", reverse=True)
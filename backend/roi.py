@@ -0,0 +1,140 @@
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional
+
+import cv2
+import numpy as np
+
+from .renderer import DETECTION_COLORS, FrameDetections
+
+ROI_STRIDE = 32  # YOLO input sizes are multiples of the model stride
+
+
+@dataclass(frozen=True)
+class FrameRegion:
+    """The part of a camera's frames its model is run on.
+
+    ``x0, y0, x1, y1`` is the bounding rectangle of the camera's ROI
+    polygons in pixels. ``mask`` marks the pixels of that rectangle that lie
+    inside a polygon, or is None when the rectangle is the whole ROI.
+    """
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    mask: Optional[np.ndarray] = None
+
+    @property
+    def max_imgsz(self) -> int:
+        """Smallest inference size that does not upscale the crop"""
+        longest = max(self.x1 - self.x0, self.y1 - self.y0)
+        return -(-longest // ROI_STRIDE) * ROI_STRIDE
+
+
+def parse_roi(value) -> Optional[List[List[List[float]]]]:
+    """Validate ROI polygons given as [[[x, y], ...], ...] in 0-1 frame fractions"""
+    if value is None or value == [] or value == "":
+        return None
+    if not isinstance(value, list):
+        raise ValueError("roi must be a list of polygons")
+    polygons = []
+    for polygon in value:
+        if not isinstance(polygon, list) or len(polygon) < 3:
+            raise ValueError("each roi polygon needs at least 3 [x, y] points")
+        points = []
+        for point in polygon:
+            if (not isinstance(point, (list, tuple)) or len(point) != 2
+                    or not all(isinstance(c, (int, float)) and 0 <= c <= 1 for c in point)):
+                raise ValueError("roi points must be [x, y] pairs between 0 and 1")
+            points.append([float(point[0]), float(point[1])])
+        polygons.append(points)
+    return polygons
+
+
+def parse_allowed_classes(value) -> Optional[List[str]]:
+    """Validate a class allow-list; only classes the renderer knows can be kept"""
+    if value is None or value == [] or value == "":
+        return None
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(",") if name.strip()]
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        raise ValueError("allowed_classes must be a list of class names")
+    unknown = sorted(set(value) - set(DETECTION_COLORS))
+    if unknown:
+        raise ValueError(
+            f"Unsupported classes {unknown}; choose from {sorted(DETECTION_COLORS)}"
+        )
+    return sorted(set(value))
+
+
+def frame_region(polygons: Optional[List], shape) -> Optional[FrameRegion]:
+    """Pixel region of the ROI polygons for frames of the given shape; None means the whole frame"""
+    if not polygons:
+        return None
+    height, width = shape[:2]
+    scale = np.array([width, height], np.float32)
+    contours = [np.round(np.array(p, np.float32) * scale).astype(np.int32) for p in polygons]
+
+    points = np.concatenate(contours)
+    x0, y0 = np.clip(points.min(axis=0), 0, [width - 1, height - 1])
+    x1, y1 = np.clip(points.max(axis=0) + 1, 1, [width, height])
+    mask = np.zeros((y1 - y0, x1 - x0), np.uint8)
+    cv2.fillPoly(mask, [c - [x0, y0] for c in contours], 1)
+    if mask.all():
+        if (x0, y0, x1, y1) == (0, 0, width, height):
+            return None
+        mask = None
+    return FrameRegion(int(x0), int(y0), int(x1), int(y1), mask)
+
+
+def crop(frame: np.ndarray, region: Optional[FrameRegion]) -> np.ndarray:
+    """View of the frame the model should see"""
+    if region is None:
+        return frame
+    return frame[region.y0:region.y1, region.x0:region.x1]
+
+
+def to_frame(detections: FrameDetections, region: Optional[FrameRegion]) -> FrameDetections:
+    """Map detections made on a crop back to full-frame coordinates.
+
+    Detections whose box centre falls outside every ROI polygon are dropped.
+    Masks stay at crop resolution; ``mask_region`` tells the renderer where
+    they go.
+    """
+    if region is None:
+        return detections
+    mask_region = (region.x0, region.y0, region.x1, region.y1)
+    if not len(detections):
+        return replace(detections, mask_region=mask_region)
+
+    keep = np.ones(len(detections), dtype=bool)
+    if region.mask is not None:
+        centres = ((detections.boxes[:, :2] + detections.boxes[:, 2:]) / 2).astype(np.int32)
+        cx = np.clip(centres[:, 0], 0, region.mask.shape[1] - 1)
+        cy = np.clip(centres[:, 1], 0, region.mask.shape[0] - 1)
+        keep = region.mask[cy, cx].astype(bool)
+
+    offset = np.array([region.x0, region.y0], np.float32)
+    boxes = detections.boxes[keep] + np.tile(offset, 2)
+    keypoints = None
+    if detections.keypoints is not None:
+        keypoints = detections.keypoints[keep].copy()
+        keypoints[..., :2] += offset
+
+    return FrameDetections(
+        boxes=boxes,
+        confidences=detections.confidences[keep],
+        class_names=[n for n, k in zip(detections.class_names, keep) if k],
+        masks=detections.masks[keep] if detections.masks is not None else None,
+        keypoints=keypoints,
+        mask_region=mask_region
+    )
+
+
+def class_ids(names: Dict[int, str], allowed: Optional[Iterable[str]] = None) -> List[int]:
+    """Model class ids for the ``classes=`` predict option.
+
+    Defaults to every class the renderer draws, so other classes are dropped
+    inside the model's NMS instead of after it.
+    """
+    wanted = set(allowed) if allowed else set(DETECTION_COLORS)
+    return sorted(class_id for class_id, name in names.items() if name in wanted)
@@ -0,0 +1,169 @@
+"""Hourly and daily detection rollups backing the stats endpoints.
+
+The event writer increments the rollups in the same transaction as the raw
+events. Stats read closed buckets from the rollups and only count raw rows
+for the current, still-open bucket.
+
+Rebuild the rollups from existing events with:
+    python -m backend.rollups backfill
+"""
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .models import DetectionEvent, DetectionRollupDaily, DetectionRollupHourly
+
+ROLLUP_TABLES = {
+    "hour": DetectionRollupHourly,
+    "day": DetectionRollupDaily,
+}
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its hour or day"""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def increment_rollups(db, rows: Iterable[Dict]):
+    """Add a batch of new events to the rollups (caller commits)"""
+    rows = list(rows)
+    for granularity, table in ROLLUP_TABLES.items():
+        counts = Counter(
+            (
+                row["camera_id"],
+                row["model_type"] or "",
+                row["class_name"] or "",
+                bucket_start(row["timestamp"], granularity),
+            )
+            for row in rows
+        )
+        if not counts:
+            continue
+
+        statement = pg_insert(table).values([
+            {"camera_id": camera_id, "model_type": model_type, "class_name": class_name,
+             "bucket": bucket, "count": count}
+            for (camera_id, model_type, class_name, bucket), count in counts.items()
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[table.camera_id, table.model_type, table.class_name, table.bucket],
+            set_={"count": table.count + statement.excluded.count}
+        ))
+
+
+def _filtered(query, columns, model: str, class_name: str):
+    if model != 'all':
+        query = query.filter(columns.model_type == model)
+    if class_name != 'all':
+        query = query.filter(columns.class_name == class_name)
+    return query
+
+
+def bucket_counts(db, granularity: str, since: datetime,
+                  model: str = 'all', class_name: str = 'all') -> List[Tuple[datetime, int]]:
+    """Detection counts per bucket from `since` up to now, oldest first"""
+    table = ROLLUP_TABLES[granularity]
+    current = bucket_start(datetime.utcnow(), granularity)
+
+    closed = _filtered(
+        db.query(table.bucket, func.sum(table.count))
+            .filter(table.bucket >= since)
+            .filter(table.bucket < current),
+        table, model, class_name
+    ).group_by(table.bucket).all()
+
+    open_count = _filtered(
+        db.query(func.count(DetectionEvent.id))
+            .filter(DetectionEvent.timestamp >= max(current, since)),
+        DetectionEvent, model, class_name
+    ).scalar()
+
+    counts = [(bucket, int(count)) for bucket, count in closed]
+    if open_count:
+        counts.append((current, open_count))
+    return sorted(counts)
+
+
+def counts_by_model_type(db) -> Dict[str, int]:
+    """All-time detection counts per model type"""
+    table = DetectionRollupDaily
+    today = bucket_start(datetime.utcnow(), "day")
+
+    totals = Counter()
+    for model_type, count in (db.query(table.model_type, func.sum(table.count))
+                              .filter(table.bucket < today)
+                              .group_by(table.model_type)):
+        totals[model_type] += int(count)
+    for model_type, count in (db.query(DetectionEvent.model_type, func.count(DetectionEvent.id))
+                              .filter(DetectionEvent.timestamp >= today)
+                              .group_by(DetectionEvent.model_type)):
+        totals[model_type or ""] += count
+    return dict(totals)
+
+
+def class_names(db, model: str = 'all') -> List[str]:
+    """Distinct detected class names, optionally for one model type"""
+    table = DetectionRollupDaily
+    today = bucket_start(datetime.utcnow(), "day")
+
+    closed = _filtered(db.query(table.class_name.distinct()).filter(table.bucket < today),
+                       table, model, 'all')
+    current = _filtered(db.query(DetectionEvent.class_name.distinct())
+                        .filter(DetectionEvent.timestamp >= today),
+                        DetectionEvent, model, 'all')
+    return sorted({name for (name,) in closed.union(current).all() if name})
+
+
+def rebuild_rollups(db):
+    """Recompute all rollups from the raw events (caller commits)"""
+    # Block event writes until we commit so no row is counted twice or missed
+    db.execute(text("LOCK TABLE detection_events IN SHARE MODE"))
+    for granularity, table in ROLLUP_TABLES.items():
+        bucket = func.date_trunc(granularity, DetectionEvent.timestamp)
+        db.execute(delete(table))
+        db.execute(insert(table).from_select(
+            ["camera_id", "model_type", "class_name", "bucket", "count"],
+            select(
+                func.coalesce(DetectionEvent.camera_id, 0),
+                func.coalesce(DetectionEvent.model_type, ""),
+                func.coalesce(DetectionEvent.class_name, ""),
+                bucket,
+                func.count(DetectionEvent.id)
+            )
+            .where(DetectionEvent.timestamp.is_not(None))
+            .group_by(
+                func.coalesce(DetectionEvent.camera_id, 0),
+                func.coalesce(DetectionEvent.model_type, ""),
+                func.coalesce(DetectionEvent.class_name, ""),
+                bucket
+            )
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain detection rollup tables")
+    parser.add_argument("command", choices=["backfill"], help="backfill: rebuild rollups from detection_events")
+    parser.parse_args()
+
+    from .db_settings import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db)
+        db.commit()
+        for granularity, table in ROLLUP_TABLES.items():
+            rows = db.query(func.count()).select_from(table).scalar()
+            print(f"Rebuilt {granularity} rollups: {rows} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
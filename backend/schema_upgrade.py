@@ -0,0 +1,43 @@
+"""In-place upgrades for databases created by an older version of the models.
+
+``Base.metadata.create_all`` only creates missing tables, so indexes and
+columns added to an existing table are applied here. Every step is
+idempotent and runs on each startup from ``init_db``.
+"""
+import logging
+
+from sqlalchemy import inspect
+
+from .models import Base
+
+
+def add_missing_columns(conn):
+    """Add columns declared on the models to existing tables that lack them"""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(
+                f'ALTER TABLE "{table.name}" ADD COLUMN IF NOT EXISTS "{column.name}" {column_type}'
+            )
+            logging.info(f"Added column {table.name}.{column.name}")
+
+
+def create_missing_indexes(conn):
+    """Create every index declared on the models that the database lacks"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def upgrade_schema(engine):
+    """Bring an existing database up to date with the models"""
+    with engine.begin() as conn:
+        add_missing_columns(conn)
+        create_missing_indexes(conn)
+    logging.info("Database schema is up to date")
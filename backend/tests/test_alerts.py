@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from backend.alerts import AlertEngine, Observation, RuleState, parse_alert_rules
+
+ZONE = [[0.5, 0.0], [1.0, 0.0], [1.0, 1.0], [0.5, 1.0]]  # Right half of the frame
+
+
+def observation(*boxes, timestamp=0.0, class_name="person", track_ids=None, camera_id=1):
+    return Observation(
+        camera_id=camera_id,
+        timestamp=timestamp,
+        class_names=[class_name] * len(boxes),
+        boxes=np.array(boxes, np.float32).reshape(-1, 4),
+        track_ids=np.array(track_ids) if track_ids is not None else None,
+        frame_size=(100, 100)
+    )
+
+
+def rule(**fields):
+    return parse_alert_rules([fields])[0]
+
+
+def engine(rules=None):
+    return AlertEngine(rules_for=lambda camera_id: rules, camera_name=lambda camera_id: f"Camera {camera_id}",
+                       default_rules="")
+
+
+def test_parse_alert_rules_fills_in_defaults():
+    assert parse_alert_rules(None) is None
+    assert parse_alert_rules("") is None
+    assert parse_alert_rules('[{"type": "count", "class_name": "person", "threshold": 2}]') == [{
+        "type": "count", "class_name": "person", "cooldown": 60.0, "name": "count person", "threshold": 2
+    }]
+    assert rule(type="presence", seconds=5, cooldown=0, name="Loiter") == {
+        "type": "presence", "class_name": None, "cooldown": 0.0, "name": "Loiter", "seconds": 5.0
+    }
+
+
+@pytest.mark.parametrize("rules, message", [
+    ("{", "JSON list"),
+    ({"type": "count"}, "list of rule objects"),
+    ([{"type": "speed"}], "Unknown alert rule type"),
+    ([{"type": "count", "class_name": "dog", "threshold": 1}], "Unsupported class"),
+    ([{"type": "count", "threshold": 1, "cooldown": -1}], "cooldown"),
+    ([{"type": "presence", "seconds": 0}], "seconds > 0"),
+    ([{"type": "count", "threshold": 1.5}], "integer threshold"),
+    ([{"type": "zone_entry", "zone": [[0, 0], [1, 1]]}], "zone_entry zone"),
+])
+def test_parse_alert_rules_rejects_invalid_rules(rules, message):
+    with pytest.raises(ValueError, match=message):
+        parse_alert_rules(rules)
+
+
+def test_presence_fires_after_the_class_stayed_in_view():
+    presence = rule(type="presence", class_name="person", seconds=5)
+    state = RuleState()
+    check = engine()._check_presence
+
+    assert check(presence, state, observation([0, 0, 10, 10], timestamp=100.0)) is None
+    assert check(presence, state, observation([0, 0, 10, 10], timestamp=104.0)) is None
+    assert check(presence, state, observation([0, 0, 10, 10], timestamp=105.0))["seconds"] == 5.0
+    assert check(presence, state, observation([0, 0, 10, 10], timestamp=106.0, class_name="bottle")) is None
+    assert check(presence, state, observation([0, 0, 10, 10], timestamp=107.0)) is None  # Starts over
+
+
+def test_count_fires_above_the_threshold():
+    count = rule(type="count", class_name="person", threshold=2)
+    check = engine()._check_count
+
+    assert check(count, RuleState(), observation([0, 0, 1, 1], [2, 2, 3, 3])) is None
+    details = check(count, RuleState(), observation([0, 0, 1, 1], [2, 2, 3, 3], [4, 4, 5, 5]))
+    assert details["count"] == 3
+    assert check(rule(type="count", threshold=0), RuleState(), observation([0, 0, 1, 1], class_name="bottle"))
+
+
+def test_zone_entry_fires_when_a_track_moves_into_the_zone():
+    zone = rule(type="zone_entry", class_name="person", zone=ZONE)
+    state = RuleState()
+    check = engine()._check_zone_entry
+
+    assert check(zone, state, observation([10, 10, 20, 20], track_ids=[1])) is None
+    assert check(zone, state, observation([60, 10, 70, 20], [10, 10, 20, 20], track_ids=[1, 2]))["track_ids"] == [1]
+    assert check(zone, state, observation([65, 10, 75, 20], track_ids=[1])) is None  # Still inside
+    assert check(zone, state, observation([10, 10, 20, 20], track_ids=[1])) is None
+    assert check(zone, state, observation([60, 10, 70, 20], track_ids=[1]))["track_ids"] == [1]
+    assert check(zone, RuleState(), observation([60, 10, 70, 20])) is None  # Untracked detections
+
+
+def test_evaluate_applies_the_cooldown_and_resets_state_when_rules_change():
+    rules = parse_alert_rules([{"type": "count", "class_name": "person", "threshold": 0, "cooldown": 10}])
+    alerts = engine(rules)
+
+    for timestamp in (0.0, 5.0, 10.0):
+        alerts._evaluate(observation([0, 0, 1, 1], timestamp=timestamp))
+    assert [alert["id"] for alert in alerts.recent()] == [2, 1]
+    assert alerts.recent(camera_id=2) == []
+    assert alerts.recent(after_id=1)[0]["camera_name"] == "Camera 1"
+
+    alerts.rules_for = lambda camera_id: [dict(rules[0], cooldown=60.0)]
+    alerts._evaluate(observation([0, 0, 1, 1], timestamp=11.0))
+    assert len(alerts.recent()) == 3  # Edited rules start without a cooldown
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.camera_registry import CameraRegistry, etag_matches
+from backend.models import Base, Camera
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add_all([
+            Camera(source_name="Door", stream_type="live", stream="0"),
+            Camera(source_name="Yard", stream_type="File", stream="yard.mp4"),
+        ])
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+class CountingFactory:
+    def __init__(self, factory):
+        self.factory = factory
+        self.sessions = 0
+
+    def __call__(self):
+        self.sessions += 1
+        return self.factory()
+
+
+def test_lookups_are_served_from_memory_until_invalidated(session_factory):
+    factory = CountingFactory(session_factory)
+    registry = CameraRegistry(factory)
+
+    assert registry.name(1) == "Door"
+    assert [c.source_name for c in registry.live()] == ["Door"]
+    assert registry.get(3) is None and registry.name(3) == "Camera 3"
+    assert factory.sessions == 1
+
+    with session_factory() as db:
+        db.add(Camera(source_name="Garage", stream_type="live", stream="1"))
+        db.commit()
+    assert registry.get(3) is None  # Not reloaded yet
+    registry.invalidate()
+    assert registry.name(3) == "Garage"
+    assert factory.sessions == 2
+
+
+def test_etag_follows_the_camera_list(session_factory):
+    registry = CameraRegistry(session_factory)
+    etag, payload = registry.snapshot()
+    assert etag.startswith('"') and etag.endswith('"')
+    assert [c["source_name"] for c in json.loads(payload)] == ["Door", "Yard"]
+
+    registry.invalidate()
+    assert registry.snapshot()[0] == etag  # Reloaded but unchanged
+
+    with session_factory() as db:
+        db.get(Camera, 2).location = "Back"
+        db.commit()
+    registry.invalidate()
+    assert registry.snapshot()[0] != etag
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz",W/"abc" ', True),
+    ("*", True),
+    ('"abcd"', False),
+    ('"xabc"', False),
+    ('"xyz"', False),
+    ("", False),
+    (None, False),
+])
+def test_if_none_match_compares_whole_tags(header, matches):
+    assert etag_matches(header, '"abc"') is matches
@@ -0,0 +1,46 @@
+import pytest
+
+from backend.clip_recorder import FrameRing
+
+
+@pytest.fixture
+def ring(tmp_path):
+    ring = FrameRing(str(tmp_path / "camera.ring"), capacity=100, slots=8)
+    yield ring
+    ring.close()
+
+
+def jpeg(index, size=30):
+    return bytes([index]) * size
+
+
+def test_frames_are_returned_oldest_first_within_the_time_range(ring):
+    for i in range(3):
+        assert ring.append(float(i), jpeg(i))
+
+    assert ring.frames(0.0, 2.0) == [(0.0, jpeg(0)), (1.0, jpeg(1)), (2.0, jpeg(2))]
+    assert ring.frames(0.5, 1.5) == [(1.0, jpeg(1))]
+    assert ring.frames(5.0, 6.0) == []
+
+
+def test_wrapping_overwrites_the_oldest_frames(ring):
+    for i in range(5):
+        ring.append(float(i), jpeg(i))
+
+    # Three 30-byte frames fit; the fourth skips the last 10 bytes and starts over
+    assert ring.frames(0.0, 10.0) == [(2.0, jpeg(2)), (3.0, jpeg(3)), (4.0, jpeg(4))]
+
+
+def test_index_slots_wrap_independently_of_the_data(ring):
+    for i in range(20):
+        ring.append(float(i), jpeg(i, size=5))
+
+    frames = ring.frames(0.0, 100.0)
+    assert [t for t, _ in frames] == [float(i) for i in range(12, 20)]
+    assert all(data == jpeg(int(t), size=5) for t, data in frames)
+
+
+def test_frames_larger_than_the_ring_are_refused(ring):
+    assert not ring.append(0.0, jpeg(0, size=101))
+    assert ring.append(1.0, jpeg(1, size=100))
+    assert ring.frames(0.0, 1.0) == [(1.0, jpeg(1, size=100))]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.event_queries import EventFilter, decode_cursor, encode_cursor, page
+from backend.models import Base, DetectionEvent
+
+START = datetime(2026, 1, 1, 12)
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", encode_cursor(START, 1)[:-4] + "AAAA"])
+def test_malformed_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # Ids 1-6, two events per second so that the id breaks ties
+    session.add_all([
+        DetectionEvent(camera_id=1 + i % 2, model_type="objectDetection", class_name="person",
+                       timestamp=START + timedelta(seconds=i // 2))
+        for i in range(6)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def all_pages(db, filters, limit):
+    ids, cursor = [], None
+    while True:
+        events, cursor = page(db, filters, limit=limit, cursor=cursor)
+        ids.append([event["id"] for event in events])
+        if cursor is None:
+            return ids
+
+
+def test_pages_run_newest_first_without_gaps_or_repeats(db):
+    assert all_pages(db, EventFilter(), limit=4) == [[6, 5, 4, 3], [2, 1]]
+    assert all_pages(db, EventFilter(), limit=3) == [[6, 5, 4], [3, 2, 1]]
+    assert all_pages(db, EventFilter(), limit=6) == [[6, 5, 4, 3, 2, 1]]
+
+
+def test_pages_apply_the_filter(db):
+    assert all_pages(db, EventFilter(camera_id=1), limit=2) == [[5, 3], [1]]
+    filters = EventFilter(start=START + timedelta(seconds=1), end=START + timedelta(seconds=2))
+    assert all_pages(db, filters, limit=10) == [[4, 3]]
+
+
+def test_aware_bounds_are_compared_as_utc(db):
+    start = (START + timedelta(seconds=2)).replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=2)))
+    assert all_pages(db, EventFilter(start=start), limit=10) == [[6, 5]]
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import event_sink
+from backend.event_sink import EventSink
+from backend.models import Base, DetectionEvent
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    # The rollup upsert is PostgreSQL-only; record the batches it is given instead
+    batches = []
+    monkeypatch.setattr(event_sink, "increment_rollups", lambda db, rows: batches.append(len(rows)))
+    factory = sessionmaker(bind=engine)
+    factory.batches = batches
+    yield factory
+    engine.dispose()
+
+
+def stored(session_factory):
+    with session_factory() as db:
+        return db.execute(select(func.count(DetectionEvent.id))).scalar()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_full_batches_are_written_without_waiting_for_the_interval(session_factory):
+    sink = EventSink(session_factory, camera_name=lambda camera_id: f"Camera {camera_id}",
+                     flush_rows=3, flush_interval_ms=60_000)
+    sink.start()
+    for i in range(7):
+        sink.submit("person", "objectDetection", camera_id=1, track_id=i)
+
+    assert wait_for(lambda: len(session_factory.batches) == 2)
+    assert session_factory.batches == [3, 3]
+    sink.stop()  # Flushes the last, partial batch
+    assert session_factory.batches == [3, 3, 1]
+    assert stored(session_factory) == 7
+
+
+def test_a_partial_batch_is_written_once_the_interval_is_up(session_factory):
+    sink = EventSink(session_factory, camera_name=lambda camera_id: f"Camera {camera_id}",
+                     flush_rows=100, flush_interval_ms=100)
+    sink.start()
+    try:
+        submitted_at = time.monotonic()
+        sink.submit("person", "objectDetection", camera_id=1)
+        sink.submit("bottle", "objectDetection", camera_id=2, camera_name="Kitchen")
+
+        assert wait_for(lambda: session_factory.batches == [2])
+        assert 0.1 <= time.monotonic() - submitted_at < 2.0
+        with session_factory() as db:
+            names = db.execute(select(DetectionEvent.camera_name).order_by(DetectionEvent.id)).scalars().all()
+        assert names == ["Camera 1", "Kitchen"]
+    finally:
+        sink.stop()
+
+
+def test_events_are_dropped_when_the_queue_is_full(session_factory):
+    sink = EventSink(session_factory, camera_name=str, max_queue=1)
+    assert sink.submit("person", "objectDetection", camera_id=1)
+    assert not sink.submit("person", "objectDetection", camera_id=1)
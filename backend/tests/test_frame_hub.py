@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import cv2
+import numpy as np
+
+from backend import frame_hub
+from backend.frame_hub import JPEG_TIERS, FrameHub, encode_jpeg
+
+
+def frame(value=0):
+    return np.full((48, 64, 3), value, np.uint8)
+
+
+def test_every_publish_gets_a_newer_sequence_number_across_cameras():
+    hub = FrameHub()
+    hub.publish(1, frame())
+    hub.publish(2, frame())
+    seq, jpeg = hub.wait_for_frame(1, timeout=0)
+    assert seq == 1 and jpeg.startswith(b"\xff\xd8")
+
+    hub.remove(1)
+    hub.publish(1, frame())  # A restarted camera never repeats a number
+    assert hub.wait_for_frame(1, last_seq=seq, timeout=0)[0] == 3
+
+
+def test_wait_for_frame_blocks_until_a_newer_frame_and_times_out_without_one():
+    hub = FrameHub()
+    hub.publish(1, frame())
+    assert hub.wait_for_frame(1, last_seq=1, timeout=0.05) == (1, None)
+
+    publisher = threading.Timer(0.05, hub.publish, args=(1, frame(255)))
+    publisher.start()
+    seq, jpeg = hub.wait_for_frame(1, last_seq=1, timeout=5)
+    publisher.join()
+    assert seq == 2 and jpeg is not None
+
+
+def test_next_frame_is_woken_by_publish_from_another_thread():
+    hub = FrameHub()
+
+    async def view():
+        assert await hub.next_frame(1, timeout=0.05) == (0, None)
+        threading.Timer(0.05, hub.publish, args=(1, frame())).start()
+        return await hub.next_frame(1, timeout=5)
+
+    seq, jpeg = asyncio.run(view())
+    assert seq == 1 and jpeg is not None
+    assert hub._waiters == {}
+
+
+def test_remove_releases_waiting_viewers():
+    hub = FrameHub()
+    hub.publish(1, frame())
+
+    async def view():
+        threading.Timer(0.05, hub.remove, args=(1,)).start()
+        return await hub.next_frame(1, last_seq=1, timeout=5)
+
+    assert asyncio.run(view()) == (1, None)
+    assert 1 not in hub
+
+
+def test_tiers_are_encoded_lazily_and_once_per_frame(monkeypatch):
+    encoded = []
+    monkeypatch.setattr(frame_hub, "encode_jpeg",
+                        lambda image, tier: encoded.append(tier) or encode_jpeg(image, tier))
+    hub = FrameHub()
+    hub.publish(1, np.zeros((600, 1920, 3), np.uint8))
+    assert encoded == []  # Nobody watching, nothing encoded
+
+    full = hub.latest(1, "full")
+    assert hub.latest(1, "full") is full
+    thumbnail = hub.latest(1, "thumbnail")
+    assert encoded == ["full", "thumbnail"]
+    assert len(thumbnail) < len(full)
+
+    hub.publish(1, np.zeros((600, 1920, 3), np.uint8))
+    hub.latest(1, "thumbnail")
+    assert encoded == ["full", "thumbnail", "thumbnail"]
+
+
+def test_thumbnail_tier_is_downscaled_to_its_width():
+    jpeg = encode_jpeg(np.zeros((600, 1920, 3), np.uint8), "thumbnail")
+    image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert image.shape[:2] == (150, JPEG_TIERS["thumbnail"][0])
+
+
+def test_viewers_are_counted_while_subscribed():
+    hub = FrameHub()
+    with hub.subscribe(1):
+        with hub.subscribe(1):
+            assert hub.viewers(1) == 2
+        assert hub.viewers(1) == 1
+    assert hub.viewers(1) == 0
+    assert hub.viewers(2) == 0
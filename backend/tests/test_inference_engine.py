@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+
+from backend.inference_engine import InferenceScheduler
+
+
+class FakeModel:
+    """Stands in for a YOLO model: records every call and labels each frame's result"""
+    task = "detect"
+
+    def __init__(self, error=None, gate=None):
+        self.calls = []
+        self.error = error
+        self.gate = gate
+        self.called = threading.Event()
+
+    def __call__(self, frames, verbose=False, **kwargs):
+        self.calls.append((list(frames), kwargs))
+        self.called.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return [f"result {frame}" for frame in frames]
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = InferenceScheduler(batch_size=4, max_wait_ms=200)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+
+def test_frames_from_several_threads_share_one_call_and_get_their_own_result(scheduler):
+    model = FakeModel()
+    results = {}
+
+    def camera(frame):
+        results[frame] = scheduler.infer(model, frame, timeout=5, imgsz=320)
+
+    threads = [threading.Thread(target=camera, args=(f"frame {i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.calls) == 1
+    frames, kwargs = model.calls[0]
+    assert sorted(frames) == [f"frame {i}" for i in range(4)]
+    assert kwargs == {"imgsz": 320}
+    assert results == {f"frame {i}": f"result frame {i}" for i in range(4)}
+
+
+def test_batches_are_split_by_predict_options_and_capped_at_batch_size(scheduler):
+    model = FakeModel()
+    futures = [scheduler.submit(model, i, imgsz=640) for i in range(5)]
+    futures.append(scheduler.submit(model, 5, imgsz=320))
+
+    assert [f.result(timeout=5) for f in futures] == [f"result {i}" for i in range(6)]
+    # The first four fill a batch; the last two differ in imgsz and run as separate calls
+    assert sorted((len(frames), kwargs["imgsz"]) for frames, kwargs in model.calls) == [
+        (1, 320), (1, 640), (4, 640)
+    ]
+
+
+def test_a_failed_call_fails_every_frame_in_it(scheduler):
+    model = FakeModel(error=RuntimeError("out of memory"))
+    futures = [scheduler.submit(model, i) for i in range(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="out of memory"):
+            future.result(timeout=5)
+
+
+def test_stop_fails_frames_still_queued():
+    scheduler = InferenceScheduler(batch_size=1, max_wait_ms=0)
+    scheduler.start()
+    gate = threading.Event()
+    model = FakeModel(gate=gate)
+    running = scheduler.submit(model, 0)
+    queued = scheduler.submit(model, 1)
+    assert model.called.wait(5)  # The worker is now busy with the first frame
+
+    scheduler.stop(timeout=0.1)
+    gate.set()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        queued.result(timeout=5)
+    assert running.result(timeout=5) == "result 0"
+    with pytest.raises(RuntimeError, match="not running"):
+        scheduler.submit(model, 2)
@@ -0,0 +1,50 @@
+from backend.load_controller import LoadController, build_levels
+
+LEVELS = [(0, 640), (10, 640), (10, 320), (5, 320)]
+
+
+def controller(*cameras):
+    load = LoadController(cpu_budget=80, levels=LEVELS)
+    for camera_id, priority, duration in cameras:
+        load.register(camera_id, priority)
+        load.record(camera_id, duration)
+    return load
+
+
+def test_build_levels_alternates_frame_rate_and_size():
+    assert build_levels([0, 15, 10], [640, 320]) == [(0, 640), (15, 640), (15, 320), (10, 320)]
+
+
+def test_overload_degrades_the_costliest_lowest_priority_camera():
+    load = controller((1, 0, 0.01), (2, 0, 0.05), (3, 5, 0.2))
+    for camera_id in (1, 2, 3):
+        load._cameras[camera_id].level = 1  # 10 fps: camera 2 costs 0.5s/s, camera 1 0.1s/s
+    assert load.adjust(cpu_percent=95, queue_depth=0) == (2, 2)
+    assert load.target(2) == (10, 320)
+    assert load.target(1) == (10, 640)
+    assert load.target(3) == (10, 640)
+
+
+def test_a_deep_queue_counts_as_overload():
+    load = controller((1, 0, 0.01))
+    assert load.adjust(cpu_percent=10, queue_depth=1) is None  # One frame per camera is fine
+    assert load.adjust(cpu_percent=10, queue_depth=2) == (1, 1)
+    assert load.target(1) == (10, 640)
+
+
+def test_headroom_restores_the_most_degraded_highest_priority_camera():
+    load = controller((1, 0, 0.01), (2, 5, 0.01), (3, 5, 0.01))
+    load._cameras[1].level = 3
+    load._cameras[2].level = 1
+    load._cameras[3].level = 2
+    assert load.adjust(cpu_percent=20, queue_depth=0) == (3, 1)
+    assert load.adjust(cpu_percent=20, queue_depth=1) is None  # Work still queued
+
+
+def test_no_change_between_budget_and_headroom_or_at_the_ends_of_the_ladder():
+    load = controller((1, 0, 0.01))
+    assert load.adjust(cpu_percent=75, queue_depth=0) is None
+    assert load.adjust(cpu_percent=20, queue_depth=0) is None  # Already at full quality
+    load._cameras[1].level = len(LEVELS) - 1
+    assert load.adjust(cpu_percent=95, queue_depth=0) is None
+    assert LoadController(levels=LEVELS).adjust(cpu_percent=95, queue_depth=0) is None
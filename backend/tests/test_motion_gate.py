@@ -0,0 +1,45 @@
+import numpy as np
+
+from backend.motion_gate import MotionGate
+
+
+def frame(value=0):
+    return np.full((120, 160, 3), value, np.uint8)
+
+
+def test_first_frame_is_inferred_and_a_still_scene_is_skipped():
+    gate = MotionGate(camera_id=1, threshold=0.01, refresh_seconds=3600)
+    assert gate.should_infer(frame())
+    assert not gate.should_infer(frame())
+    assert not gate.should_infer(frame(10))  # Below MOTION_PIXEL_DELTA
+
+
+def test_enough_changed_pixels_trigger_inference():
+    gate = MotionGate(camera_id=1, threshold=0.01, refresh_seconds=3600)
+    gate.should_infer(frame())
+    moved = frame()
+    moved[40:80, 60:100] = 255  # About 8% of the frame
+    assert gate.should_infer(moved)
+    assert not gate.should_infer(moved)  # Now the reference
+
+
+def test_changes_are_measured_against_the_last_inferred_frame():
+    gate = MotionGate(camera_id=1, threshold=0.1, refresh_seconds=3600)
+    gate.should_infer(frame())
+    drifted = frame()
+    drifted[:, :10] = 255
+    assert not gate.should_infer(drifted)
+    drifted[:, :20] = 255
+    assert gate.should_infer(drifted)  # Small steps add up
+
+
+def test_force_zero_threshold_and_refresh_always_infer():
+    gate = MotionGate(camera_id=1, threshold=0.01, refresh_seconds=3600)
+    gate.should_infer(frame())
+    assert gate.should_infer(frame(), force=True)
+
+    assert all(MotionGate(camera_id=1, threshold=0).should_infer(frame()) for _ in range(3))
+
+    refreshing = MotionGate(camera_id=1, threshold=0.01, refresh_seconds=0)
+    assert refreshing.should_infer(frame())
+    assert refreshing.should_infer(frame())
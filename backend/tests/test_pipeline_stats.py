@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import pytest
+
+from backend.pipeline_stats import PipelineStats, StageWindow, summarize
+
+
+def test_summarize_reports_milliseconds():
+    assert summarize(0, np.zeros(0)) == {"count": 0}
+    summary = summarize(5, np.array([0.001, 0.002, 0.003, 0.004, 0.010]))
+    assert summary["count"] == 5
+    assert summary["mean_ms"] == 4.0
+    assert summary["p50_ms"] == 3.0
+    assert summary["p99_ms"] == pytest.approx(9.76)
+
+
+def test_stage_window_keeps_only_the_newest_samples():
+    observed = []
+    window = StageWindow(observed.append, size=3)
+    for seconds in (1.0, 2.0, 3.0, 4.0):
+        window.record(seconds)
+
+    count, samples = window.samples()
+    assert count == 4
+    assert sorted(samples) == [2.0, 3.0, 4.0]
+    assert observed == [1.0, 2.0, 3.0, 4.0]  # Every sample still reaches the histogram
+
+
+def test_frame_trace_times_each_stage_from_the_previous_mark():
+    stats = PipelineStats(window=16)
+    trace = stats.trace(camera_id=7, seq=42, captured_at=time.perf_counter() - 0.05)
+    trace.mark("capture")
+    time.sleep(0.02)
+    trace.mark("infer")
+    trace.finish()
+
+    camera = stats.snapshot()["cameras"]["7"]
+    assert camera["last_seq"] == 42
+    assert list(camera["stages"]) == ["capture", "infer", "end_to_end"]  # Pipeline order
+    assert camera["stages"]["capture"]["mean_ms"] >= 50
+    assert 20 <= camera["stages"]["infer"]["mean_ms"] < camera["stages"]["end_to_end"]["mean_ms"]
+
+
+def test_snapshot_filters_by_camera_and_stage_summary_spans_cameras():
+    stats = PipelineStats(window=16)
+    stats.record(1, "infer", 0.010)
+    stats.record(2, "infer", 0.030)
+    stats.record(2, "publish", 0.001)
+
+    assert list(stats.snapshot(camera_id=2)["cameras"]) == ["2"]
+    assert stats.stage_summary("infer")["count"] == 2
+    assert stats.stage_summary("infer")["mean_ms"] == 20.0
+    assert stats.stage_summary("encode") == {"count": 0}
+
+
+def test_remove_forgets_a_camera():
+    stats = PipelineStats(window=16)
+    stats.trace(3, 1, time.perf_counter()).finish()
+    stats.remove(3)
+    assert stats.snapshot()["cameras"] == {}
+    assert stats.last_seq == {}
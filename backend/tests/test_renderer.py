@@ -0,0 +1,87 @@
+import numpy as np
+
+from backend.renderer import DETECTION_COLORS, KEYPOINT_COLOR, MASK_ALPHA, FrameDetections, render
+
+GREY = 100
+
+
+def detections(boxes, class_names, **fields):
+    return FrameDetections(
+        boxes=np.array(boxes, np.float32).reshape(-1, 4),
+        confidences=np.full(len(class_names), 0.9, np.float32),
+        class_names=class_names,
+        **fields
+    )
+
+
+def frame():
+    return np.full((200, 200, 3), GREY, np.uint8)
+
+
+def blended(color):
+    return np.round(GREY * (1 - MASK_ALPHA) + np.array(color) * MASK_ALPHA)
+
+
+def test_render_draws_on_a_copy():
+    original = frame()
+    annotated = render(original, detections([], []))
+    assert (original == GREY).all()
+    assert not (annotated == GREY).all()  # The frame size caption
+
+
+def test_boxes_are_outlined_in_their_class_colour():
+    annotated = render(frame(), detections([[50, 80, 150, 180], [160, 40, 190, 70]], ["person", "bottle"]))
+    assert tuple(annotated[130, 50]) == DETECTION_COLORS["person"]  # Left edge
+    assert tuple(annotated[180, 100]) == DETECTION_COLORS["person"]  # Bottom edge
+    assert tuple(annotated[60, 160]) == DETECTION_COLORS["bottle"]
+    assert tuple(annotated[130, 100]) == (GREY,) * 3  # Inside the box
+
+
+def test_labels_show_the_track_when_there_is_one():
+    boxes = [[50, 100, 150, 180]]
+    by_confidence = render(frame(), detections(boxes, ["person"]))
+    by_track = render(frame(), detections(boxes, ["person"], track_ids=np.array([7])))
+    label_area = (slice(70, 95), slice(50, 150))
+    assert (by_confidence[label_area] == DETECTION_COLORS["person"]).all(axis=2).any()
+    assert not np.array_equal(by_confidence[label_area], by_track[label_area])
+
+
+def test_masks_are_blended_and_later_instances_win_overlaps():
+    masks = np.zeros((2, 200, 200), np.float32)
+    masks[0, 100:150, 100:150] = 1
+    masks[1, 120:170, 120:170] = 1
+    annotated = render(frame(), detections([[0, 0, 1, 1]] * 2, ["bottle", "person"], masks=masks))
+
+    np.testing.assert_allclose(annotated[110, 110], blended(DETECTION_COLORS["bottle"]), atol=1)
+    np.testing.assert_allclose(annotated[130, 130], blended(DETECTION_COLORS["person"]), atol=1)
+    assert tuple(annotated[190, 190]) == (GREY,) * 3
+
+
+def test_masks_keep_their_colour_beyond_255_instances():
+    count = 300
+    masks = np.zeros((count, 200, 200), np.float32)
+    masks[256, 100:150, 100:150] = 1  # Would wrap to background in a uint8 label map
+    masks[257, 160:190, 160:190] = 1  # ...and to instance 0 here
+    names = ["bottle"] * count
+    names[257] = "person"
+    annotated = render(frame(), detections([[0, 0, 1, 1]] * count, names, masks=masks))
+
+    np.testing.assert_allclose(annotated[120, 120], blended(DETECTION_COLORS["bottle"]), atol=1)
+    np.testing.assert_allclose(annotated[175, 175], blended(DETECTION_COLORS["person"]), atol=1)
+
+
+def test_masks_of_a_cropped_region_land_inside_it():
+    masks = np.ones((1, 50, 50), np.float32)
+    region = (100, 100, 150, 150)
+    annotated = render(frame(), detections([[0, 0, 1, 1]], ["person"], masks=masks, mask_region=region))
+    np.testing.assert_allclose(annotated[125, 125], blended(DETECTION_COLORS["person"]), atol=1)
+    assert tuple(annotated[160, 160]) == (GREY,) * 3
+
+
+def test_only_confident_keypoints_are_drawn():
+    keypoints = np.zeros((1, 17, 3), np.float32)
+    keypoints[0, 0] = [100, 100, 0.9]
+    keypoints[0, 1] = [150, 150, 0.1]
+    annotated = render(frame(), detections([[0, 0, 1, 1]], ["person"], keypoints=keypoints))
+    assert tuple(annotated[100, 102]) == KEYPOINT_COLOR
+    assert tuple(annotated[150, 150]) == (GREY,) * 3
@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend.replay import (
+    FrameRecorder, ReplayCapture, is_lockstep_source, is_replay_source, list_recordings,
+    parse_replay_source
+)
+
+
+def test_parse_replay_source_splits_path_and_speed():
+    assert parse_replay_source("replay://recordings/camera1") == ("recordings/camera1", 1.0)
+    assert parse_replay_source("replay:///data/rec?speed=2.5") == ("/data/rec", 2.5)
+    assert parse_replay_source("replay://rec?speed=0") == ("rec", 0.0)
+
+
+@pytest.mark.parametrize("speed", ["-1", "fast", "nan", "inf"])
+def test_parse_replay_source_rejects_bad_speeds(speed):
+    with pytest.raises(ValueError):
+        parse_replay_source(f"replay://rec?speed={speed}")
+
+
+def test_replay_source_kinds():
+    assert is_replay_source("replay://rec")
+    assert not is_replay_source("rtsp://camera/stream")
+    assert not is_replay_source(0)
+    assert is_lockstep_source("replay://rec?speed=0")
+    assert not is_lockstep_source("replay://rec")
+    assert not is_lockstep_source("video.mp4")
+
+
+def record(path, count=5, interval=0.05):
+    """Record count flat frames whose value is 40 * index, interval seconds apart"""
+    recorder = FrameRecorder("cam", path, codec="FFV1", source="test").start()
+    for i in range(count):
+        assert recorder.add(100.0 + i * interval, np.full((24, 32, 3), 40 * i, np.uint8))
+    return recorder.stop()
+
+
+def test_recording_round_trip_in_lockstep(tmp_path):
+    path = str(tmp_path / "rec")
+    info = record(path)
+    assert info["frames"] == 5 and info["dropped"] == 0 and info["error"] is None
+    assert info["duration"] == pytest.approx(0.2)
+    assert [r["name"] for r in list_recordings(str(tmp_path))] == ["rec"]
+
+    capture = ReplayCapture(f"replay://{path}?speed=0")
+    assert capture.isOpened()
+    np.testing.assert_allclose(capture._timestamps, [0.0, 0.05, 0.1, 0.15, 0.2])
+
+    values = []
+    for _ in range(7):  # Two past the end, which loops back to the start
+        ok, frame = capture.read()
+        assert ok and frame.shape == (24, 32, 3)
+        values.append(int(frame[0, 0, 0]))
+    capture.release()
+    assert values == [0, 40, 80, 120, 160, 0, 40]
+
+
+def test_replay_keeps_the_recorded_pace(tmp_path):
+    path = str(tmp_path / "rec")
+    record(path, count=3, interval=0.1)
+
+    capture = ReplayCapture(f"replay://{path}?speed=2")
+    started = time.monotonic()
+    for _ in range(3):
+        assert capture.read()[0]
+    assert time.monotonic() - started == pytest.approx(0.1, abs=0.04)
+    capture.release()
+
+
+def test_stopping_a_replay_ends_its_wait(tmp_path):
+    path = str(tmp_path / "rec")
+    record(path, count=2, interval=30.0)
+
+    stop = threading.Event()
+    capture = ReplayCapture(f"replay://{path}", stop)
+    assert capture.read()[0]
+    threading.Timer(0.05, stop.set).start()
+    started = time.monotonic()
+    assert capture.read() == (False, None)
+    assert time.monotonic() - started < 5
+    capture.release()
+
+
+def test_missing_recording_does_not_open(tmp_path):
+    assert not ReplayCapture(f"replay://{os.path.join(tmp_path, 'missing')}").isOpened()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from backend.renderer import FrameDetections
+from backend.roi import crop, frame_region, parse_roi, to_frame
+
+
+def test_parse_roi_validates_polygons():
+    assert parse_roi(None) is None
+    assert parse_roi([[[0, 0], [1, 0], [1, 1]]]) == [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]]]
+    with pytest.raises(ValueError):
+        parse_roi([[[0, 0], [1, 0]]])
+    with pytest.raises(ValueError):
+        parse_roi([[[0, 0], [1, 0], [1, 1.5]]])
+
+
+def test_full_frame_roi_is_no_region():
+    assert frame_region(None, (480, 640, 3)) is None
+    assert frame_region([[[0, 0], [1, 0], [1, 1], [0, 1]]], (480, 640, 3)) is None
+
+
+def test_rectangle_roi_crops_without_a_mask():
+    region = frame_region([[[0.25, 0.5], [0.75, 0.5], [0.75, 1], [0.25, 1]]], (100, 200, 3))
+    assert (region.x0, region.y0, region.x1, region.y1) == (50, 50, 151, 100)
+    assert region.mask is None
+    assert crop(np.zeros((100, 200, 3)), region).shape == (50, 101, 3)
+    assert region.max_imgsz == 128
+
+
+def test_triangle_roi_keeps_a_mask_of_the_crop():
+    region = frame_region([[[0, 0], [1, 0], [0, 1]]], (100, 100))
+    assert (region.x0, region.y0, region.x1, region.y1) == (0, 0, 100, 100)
+    assert region.mask.shape == (region.y1 - region.y0, region.x1 - region.x0)
+    assert region.mask[5, 5] == 1
+    assert region.mask[90, 90] == 0
+
+
+def test_to_frame_offsets_boxes_and_drops_detections_outside_the_polygon():
+    region = frame_region([[[0.5, 0.5], [1, 0.5], [0.5, 1]]], (200, 200))
+    detections = FrameDetections(
+        boxes=np.array([[0, 0, 10, 10], [80, 80, 99, 99]], np.float32),
+        confidences=np.array([0.9, 0.8], np.float32),
+        class_names=["person", "bottle"],
+        keypoints=np.array([[[5, 5, 1]], [[90, 90, 1]]], np.float32)
+    )
+
+    mapped = to_frame(detections, region)
+
+    assert mapped.class_names == ["person"]
+    np.testing.assert_array_equal(mapped.boxes, [[100, 100, 110, 110]])
+    np.testing.assert_array_equal(mapped.keypoints, [[[105, 105, 1]]])
+    assert mapped.mask_region == (region.x0, region.y0, region.x1, region.y1)
+    np.testing.assert_array_equal(detections.keypoints[0], [[5, 5, 1]])  # Input left untouched
+
+
+def test_to_frame_without_region_returns_detections_unchanged():
+    detections = FrameDetections(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), [])
+    assert to_frame(detections, None) is detections
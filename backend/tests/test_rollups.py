@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.models import Base, DetectionEvent, DetectionRollupHourly
+from backend.rollups import bucket_counts, bucket_start
+
+
+def test_bucket_start_truncates_to_hour_and_day():
+    timestamp = datetime(2026, 3, 14, 15, 9, 26, 535897)
+    assert bucket_start(timestamp, "hour") == datetime(2026, 3, 14, 15)
+    assert bucket_start(timestamp, "day") == datetime(2026, 3, 14)
+    assert bucket_start(datetime(2026, 3, 14, 15), "hour") == datetime(2026, 3, 14, 15)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def rollup(bucket, count, class_name="person"):
+    return DetectionRollupHourly(camera_id=1, model_type="objectDetection",
+                                 class_name=class_name, bucket=bucket, count=count)
+
+
+def event(timestamp, class_name="person"):
+    return DetectionEvent(camera_id=1, model_type="objectDetection",
+                          class_name=class_name, timestamp=timestamp)
+
+
+def test_bucket_counts_reads_closed_buckets_from_rollups_and_the_open_one_from_events(db):
+    current = bucket_start(datetime.utcnow(), "hour")
+    db.add_all([
+        rollup(current - timedelta(hours=5), 7),  # Before `since`
+        rollup(current - timedelta(hours=2), 3),
+        rollup(current - timedelta(hours=2), 4, class_name="bottle"),
+        rollup(current - timedelta(hours=1), 5),
+        rollup(current, 100),  # The open bucket is counted from raw events instead
+        event(current - timedelta(minutes=30)),  # Already in a closed rollup
+        event(current), event(current),
+        event(current, class_name="bottle"),
+    ])
+    db.commit()
+    since = current - timedelta(hours=3)
+
+    assert bucket_counts(db, "hour", since) == [
+        (current - timedelta(hours=2), 7),
+        (current - timedelta(hours=1), 5),
+        (current, 3),
+    ]
+    assert bucket_counts(db, "hour", since, class_name="bottle") == [
+        (current - timedelta(hours=2), 4),
+        (current, 1),
+    ]
+
+
+def test_bucket_counts_leaves_out_an_empty_open_bucket(db):
+    current = bucket_start(datetime.utcnow(), "hour")
+    db.add(rollup(current - timedelta(hours=1), 2))
+    db.commit()
+
+    assert bucket_counts(db, "hour", current - timedelta(hours=1)) == [(current - timedelta(hours=1), 2)]
@@ -0,0 +1,104 @@
+import numpy as np
+
+from backend.renderer import FrameDetections
+from backend.tracker import ObjectTracker
+
+
+def detections(*boxes, class_name="person"):
+    return FrameDetections(
+        boxes=np.array(boxes, np.float32).reshape(-1, 4),
+        confidences=np.full(len(boxes), 0.9, np.float32),
+        class_names=[class_name] * len(boxes)
+    )
+
+
+def test_overlapping_boxes_keep_their_track():
+    tracker = ObjectTracker(iou_threshold=0.3, min_hits=1, max_age=2.0)
+    first = detections([0, 0, 10, 10], [50, 50, 60, 60])
+    tracker.update(first, now=0.0)
+    second = detections([52, 52, 62, 62], [1, 1, 11, 11])
+    tracker.update(second, now=0.1)
+
+    assert list(second.track_ids) == [first.track_ids[1], first.track_ids[0]]
+    assert len(tracker) == 2
+
+
+def test_other_classes_and_distant_boxes_start_new_tracks():
+    tracker = ObjectTracker(iou_threshold=0.3, min_hits=1, max_age=2.0)
+    first = detections([0, 0, 10, 10])
+    tracker.update(first, now=0.0)
+    bottle = detections([0, 0, 10, 10], class_name="bottle")
+    tracker.update(bottle, now=0.1)
+    far = detections([100, 100, 110, 110])
+    tracker.update(far, now=0.2)
+
+    ids = {int(first.track_ids[0]), int(bottle.track_ids[0]), int(far.track_ids[0])}
+    assert len(ids) == 3
+
+
+def test_tracks_are_confirmed_once_at_min_hits():
+    tracker = ObjectTracker(min_hits=3, max_age=2.0)
+    confirmed = []
+    for i in range(5):
+        tracker.update(detections([0, 0, 10, 10]), now=i * 0.1)
+        confirmed.append([track.track_id for track in tracker.confirmed])
+
+    assert confirmed == [[], [], [1], [], []]
+    assert tracker.confirmed == []
+
+
+def test_expired_track_reports_dwell_time():
+    tracker = ObjectTracker(min_hits=2, max_age=1.0)
+    tracker.update(detections([0, 0, 10, 10]), now=10.0)
+    tracker.update(detections([0, 0, 10, 10]), now=10.5)
+    tracker.update(detections([0, 0, 10, 10]), now=11.5)
+
+    assert tracker.update(detections(), now=12.5) == []  # Seen 1s ago: still live
+    ended = tracker.update(detections(), now=12.6)
+    assert len(ended) == 1
+    assert ended[0].track_id == 1
+    assert ended[0].hits == 3
+    assert ended[0].dwell_seconds == 1.5
+    assert len(tracker) == 0
+
+
+def test_unconfirmed_tracks_expire_silently_and_flush_ends_the_rest():
+    tracker = ObjectTracker(min_hits=2, max_age=1.0)
+    tracker.update(detections([0, 0, 10, 10], [50, 50, 60, 60]), now=0.0)
+    tracker.update(detections([0, 0, 10, 10]), now=0.5)
+
+    assert tracker.update(detections(), now=1.2) == []  # Track 2 had a single hit
+    ended = tracker.flush()
+    assert [track.track_id for track in ended] == [1]
+    assert tracker.flush() == []
+
+
+def test_reused_detections_keep_tracks_alive_without_adding_hits():
+    tracker = ObjectTracker(min_hits=3, max_age=1.0)
+    seen = detections([0, 0, 10, 10])
+    tracker.update(seen, now=0.0)
+    tracker.update(seen, now=0.5)
+
+    # The motion gate reuses the last detections for a while
+    for now in (1.0, 1.8, 2.6):
+        assert tracker.refresh(seen, now=now) == []
+        assert tracker.confirmed == []
+    assert len(tracker) == 0  # Still two hits: never confirmed
+
+    assert tracker.refresh(detections(), now=3.0) == []  # Nothing reused: no refresh
+    assert tracker.refresh(detections(), now=3.7) == []  # Expired unconfirmed, so not reported
+    assert tracker.flush() == []
+
+
+def test_refresh_does_not_start_tracks_and_ends_stale_ones():
+    tracker = ObjectTracker(min_hits=1, max_age=1.0)
+    first = detections([0, 0, 10, 10], [50, 50, 60, 60])
+    tracker.update(first, now=0.0)
+    reused = detections([0, 0, 10, 10])
+    reused.track_ids = first.track_ids[:1]
+
+    ended = tracker.refresh(reused, now=1.5)
+    assert [track.track_id for track in ended] == [int(first.track_ids[1])]
+    assert ended[0].dwell_seconds == 0.0
+    assert len(tracker) == 1
+    assert tracker.flush()[0].dwell_seconds == 1.5
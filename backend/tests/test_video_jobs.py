@@ -0,0 +1,102 @@
+from concurrent.futures import Future
+from datetime import timedelta
+
+import cv2
+import numpy as np
+import pytest
+
+from backend import video_jobs
+from backend.renderer import FrameDetections
+from backend.video_jobs import VideoJobManager, event_frames, plan_chunks, probe_video
+
+
+def test_plan_chunks_groups_selected_frames_by_time_range():
+    chunks = plan_chunks([0, 3, 6, 9, 12], source_frames=14, chunk_frames=5)
+    assert [(c.index, c.start, c.end, c.frames) for c in chunks] == [
+        (0, 0, 5, [0, 3]), (1, 5, 10, [6, 9]), (2, 10, 14, [12])
+    ]
+
+
+def test_plan_chunks_skips_ranges_without_selected_frames():
+    chunks = plan_chunks([1, 25], source_frames=30, chunk_frames=10)
+    assert [(c.index, c.start, c.frames) for c in chunks] == [(0, 0, [1]), (1, 20, [25])]
+    assert plan_chunks([], source_frames=30, chunk_frames=10) == []
+    assert len(plan_chunks(list(range(3)), source_frames=3, chunk_frames=0)) == 3
+
+
+def test_event_frames_space_events_out_across_chunk_boundaries():
+    sightings = [
+        {"person": [8, 9]},
+        {"person": [10, 11], "bottle": [15]},
+        {"person": [25, 30]},
+    ]
+    assert event_frames(sightings, fps=10, gap_seconds=2) == [(8, "person"), (15, "bottle"), (30, "person")]
+
+
+def write_video(path, frames=40, fps=10):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 6, np.uint8))
+    writer.release()
+    return str(path)
+
+
+def test_probe_video_reads_rate_and_size_and_rejects_empty_files(tmp_path):
+    assert probe_video(write_video(tmp_path / "clip.mp4")) == (10.0, (64, 48))
+    (tmp_path / "empty.mp4").write_bytes(b"")
+    with pytest.raises(ValueError):
+        probe_video(str(tmp_path / "empty.mp4"))
+
+
+class FakeScheduler:
+    def submit(self, model, frame, **kwargs):
+        future = Future()
+        future.set_result(round(frame.mean() / 6))  # The frame's index, as written by write_video
+        return future
+
+
+class FakeSink:
+    def __init__(self):
+        self.events = []
+
+    def submit(self, class_name, model_type, camera_id, **fields):
+        self.events.append((class_name, fields["timestamp"]))
+        return True
+
+
+def test_a_job_reports_one_event_for_an_object_spanning_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_jobs.model_registry, "get", lambda model_type, backend=None: None)
+    # A person is in view from frame 5 to 15, across the boundary of the 1 s chunks
+    monkeypatch.setattr(video_jobs, "annotate_result", lambda frame, index: (frame, FrameDetections(
+        np.zeros((1, 4), np.float32), np.ones(1, np.float32), ["person"]
+    ) if 5 <= index <= 15 else FrameDetections(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), [])))
+    sink = FakeSink()
+    manager = VideoJobManager(FakeScheduler(), sink, job_dir=str(tmp_path / "jobs"), chunk_seconds=1, workers=2)
+    job = manager.create("clip.mp4", "objectDetection")
+    write_video(job.input_path)
+
+    manager._run(job)
+    manager.stop()
+
+    assert job.status == "completed", job.error
+    assert job.processed_frames == 40
+    assert job.class_frames == {"person": 11}
+    assert job.events == 1
+    assert sink.events == [("person", job.created_at + timedelta(seconds=0.5))]
+    cap = cv2.VideoCapture(job.output_path)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == 40
+    cap.release()
+
+
+def test_a_job_without_selected_frames_fails_with_a_clear_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_jobs.model_registry, "get", lambda model_type, backend=None: None)
+    monkeypatch.setattr(video_jobs, "scan_frames", lambda path: (40, []))
+    manager = VideoJobManager(FakeScheduler(), FakeSink(), job_dir=str(tmp_path / "jobs"))
+    job = manager.create("clip.mp4", "objectDetection", keyframes_only=True)
+    write_video(job.input_path)
+
+    manager._run(job)
+    manager.stop()
+
+    assert job.status == "failed"
+    assert "no keyframes" in job.error
@@ -0,0 +1,171 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .renderer import FrameDetections
+
+# Tracker configuration (overridable through the environment)
+TRACK_IOU_THRESHOLD = float(os.getenv("TRACK_IOU_THRESHOLD", "0.3"))
+TRACK_MIN_HITS = int(os.getenv("TRACK_MIN_HITS", "3"))
+TRACK_MAX_AGE_SECONDS = float(os.getenv("TRACK_MAX_AGE_SECONDS", "2"))
+
+
+@dataclass(frozen=True)
+class Track:
+    """One object seen continuously by one camera, as of when the track was confirmed or ended"""
+    track_id: int
+    class_name: str
+    first_seen: datetime  # UTC
+    dwell_seconds: float
+    hits: int
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU of every box in a (N, 4) against every box in b (M, 4), as (N, M)"""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+class ObjectTracker:
+    """IoU tracker that follows one camera's detections from frame to frame.
+
+    Each frame's boxes are matched greedily, best IoU first, to the live
+    tracks of the same class; unmatched boxes start new tracks. A track is
+    confirmed once it has been matched ``min_hits`` times and ends when it
+    has not been seen for ``max_age`` seconds, which is when it is reported
+    with its dwell time. Ages are measured in seconds rather than frames so
+    that motion-gated or rate-limited cameras keep their tracks. After each
+    ``update``, ``confirmed`` lists the tracks confirmed by that frame.
+    Detections reused for a frame the model did not see go to ``refresh``
+    instead, which keeps their tracks alive without counting a hit.
+
+    Track state is kept as parallel NumPy arrays, one row per live track.
+    """
+
+    def __init__(self, iou_threshold: float = TRACK_IOU_THRESHOLD,
+                 min_hits: int = TRACK_MIN_HITS,
+                 max_age: float = TRACK_MAX_AGE_SECONDS):
+        self.iou_threshold = iou_threshold
+        self.min_hits = max(1, min_hits)
+        self.max_age = max_age
+        self._class_ids: Dict[str, int] = {}
+        self._class_names: List[str] = []
+        self._next_id = 1
+        self._boxes = np.zeros((0, 4), np.float32)
+        self._classes = np.zeros(0, np.int16)
+        self._ids = np.zeros(0, np.int64)
+        self._first_seen = np.zeros(0, np.float64)
+        self._last_seen = np.zeros(0, np.float64)
+        self._hits = np.zeros(0, np.int32)
+        self.confirmed: List[Track] = []  # Tracks that reached min_hits in the last update
+
+    def __len__(self):
+        """Number of confirmed live tracks"""
+        return int(np.count_nonzero(self._hits >= self.min_hits))
+
+    def _class_id(self, class_name: str) -> int:
+        class_id = self._class_ids.get(class_name)
+        if class_id is None:
+            class_id = self._class_ids[class_name] = len(self._class_names)
+            self._class_names.append(class_name)
+        return class_id
+
+    def update(self, detections: FrameDetections, now: Optional[float] = None) -> List[Track]:
+        """Match a frame's detections to tracks and return the tracks that ended.
+
+        ``detections.track_ids`` is set to the track of each detection.
+        """
+        now = time.time() if now is None else now
+        boxes = detections.boxes.astype(np.float32, copy=False)
+        classes = np.array([self._class_id(n) for n in detections.class_names], np.int16)
+        assigned = np.full(len(boxes), -1, np.int64)
+
+        if len(boxes) and len(self._ids):
+            iou = box_iou(boxes, self._boxes)
+            iou[classes[:, None] != self._classes[None, :]] = 0.0
+            while True:
+                det, track = np.unravel_index(np.argmax(iou), iou.shape)
+                if iou[det, track] < self.iou_threshold:
+                    break
+                assigned[det] = track
+                iou[det, :] = 0.0
+                iou[:, track] = 0.0
+
+            matched = assigned >= 0
+            rows = assigned[matched]
+            self._boxes[rows] = boxes[matched]
+            self._last_seen[rows] = now
+            self._hits[rows] += 1
+            assigned[matched] = self._ids[rows]
+
+        new = assigned < 0
+        count = int(np.count_nonzero(new))
+        if count:
+            new_ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+            self._next_id += count
+            assigned[new] = new_ids
+            self._boxes = np.concatenate([self._boxes, boxes[new]])
+            self._classes = np.concatenate([self._classes, classes[new]])
+            self._ids = np.concatenate([self._ids, new_ids])
+            self._first_seen = np.concatenate([self._first_seen, np.full(count, now)])
+            self._last_seen = np.concatenate([self._last_seen, np.full(count, now)])
+            self._hits = np.concatenate([self._hits, np.ones(count, np.int32)])
+
+        detections.track_ids = assigned
+        # Rows matched or created by this frame that have just reached min_hits
+        updated = np.isin(self._ids, assigned)
+        self.confirmed = [self._track(i) for i in np.flatnonzero(updated & (self._hits == self.min_hits))]
+        return self._expire(now - self._last_seen > self.max_age)
+
+    def refresh(self, detections: FrameDetections, now: Optional[float] = None) -> List[Track]:
+        """Mark the tracks of reused detections as still seen and return the tracks that ended.
+
+        Reused detections are not new sightings, so they neither add hits
+        nor start tracks; a false positive on a static scene cannot become
+        confirmed this way.
+        """
+        now = time.time() if now is None else now
+        if detections.track_ids is not None and len(self._ids):
+            self._last_seen[np.isin(self._ids, detections.track_ids)] = now
+        self.confirmed = []
+        return self._expire(now - self._last_seen > self.max_age)
+
+    def flush(self) -> List[Track]:
+        """End every live track, e.g. when the camera stops"""
+        return self._expire(np.ones(len(self._ids), dtype=bool))
+
+    def _track(self, i: int) -> Track:
+        return Track(
+            track_id=int(self._ids[i]),
+            class_name=self._class_names[self._classes[i]],
+            first_seen=datetime.utcfromtimestamp(self._first_seen[i]),
+            dwell_seconds=float(self._last_seen[i] - self._first_seen[i]),
+            hits=int(self._hits[i])
+        )
+
+    def _expire(self, expired: np.ndarray) -> List[Track]:
+        """Drop the selected tracks, returning the confirmed ones among them"""
+        if not expired.any():
+            return []
+
+        finished = [self._track(i) for i in np.flatnonzero(expired & (self._hits >= self.min_hits))]
+
+        keep = ~expired
+        self._boxes = self._boxes[keep]
+        self._classes = self._classes[keep]
+        self._ids = self._ids[keep]
+        self._first_seen = self._first_seen[keep]
+        self._last_seen = self._last_seen[keep]
+        self._hits = self._hits[keep]
+        return finished
@@ -0,0 +1,427 @@
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+
+from .model_registry import model_registry
+from .renderer import annotate_result
+
+# Offline video configuration (overridable through the environment)
+VIDEO_JOB_DIR = os.getenv("VIDEO_JOB_DIR", "video_jobs")
+VIDEO_CHUNK_SECONDS = float(os.getenv("VIDEO_CHUNK_SECONDS", "30"))
+VIDEO_JOB_WORKERS = int(os.getenv("VIDEO_JOB_WORKERS", "4"))
+VIDEO_JOB_HISTORY = int(os.getenv("VIDEO_JOB_HISTORY", "20"))
+
+VIDEO_CAMERA_ID = 0  # camera_id stored on events that come from uploaded videos
+VIDEO_EVENT_GAP_SECONDS = 10.0  # Same spacing as live cameras, measured in video time
+VIDEO_BATCH_FRAMES = 8  # Frames a chunk has in flight at the scheduler at once
+OUTPUT_FOURCC = "mp4v"
+
+
+@dataclass
+class VideoChunk:
+    """A contiguous range of source frames and the ones selected from it"""
+    index: int
+    start: int
+    end: int
+    frames: List[int]
+
+
+@dataclass
+class VideoJob:
+    """State and results of one uploaded video"""
+    id: str
+    filename: str
+    model_type: str
+    directory: str
+    frame_stride: int = 1
+    keyframes_only: bool = False
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    error: Optional[str] = None
+    source_fps: float = 0.0
+    source_frames: int = 0
+    total_frames: int = 0  # Frames selected for analysis
+    processed_frames: int = 0
+    unreadable_frames: int = 0  # Selected frames the decoder could not read
+    events: int = 0
+    class_frames: Counter = field(default_factory=Counter)  # Frames each class appeared in
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def input_path(self) -> str:
+        return os.path.join(self.directory, "input" + os.path.splitext(self.filename)[1].lower())
+
+    @property
+    def output_path(self) -> str:
+        return os.path.join(self.directory, "annotated.mp4")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def record_frame(self, class_names: List[str]):
+        with self._lock:
+            self.processed_frames += 1
+            self.class_frames.update(set(class_names))
+
+    def record_unreadable(self, frames: int):
+        with self._lock:
+            self.unreadable_frames += frames
+
+    def to_dict(self) -> Dict:
+        """Job status, progress and results as returned by the API"""
+        with self._lock:
+            end = self.finished_at or time.perf_counter()
+            elapsed = end - self.started_at if self.started_at else 0.0
+            fps = self.processed_frames / elapsed if elapsed > 0 else 0.0
+            done = self.processed_frames + self.unreadable_frames
+            remaining = max(0, self.total_frames - done)
+            return {
+                "job_id": self.id,
+                "filename": self.filename,
+                "model_type": self.model_type,
+                "frame_stride": self.frame_stride,
+                "keyframes_only": self.keyframes_only,
+                "status": self.status,
+                "error": self.error,
+                "created_at": self.created_at.isoformat(),
+                "source_fps": round(self.source_fps, 2),
+                "source_frames": self.source_frames,
+                "total_frames": self.total_frames,
+                "processed_frames": self.processed_frames,
+                "unreadable_frames": self.unreadable_frames,
+                "progress": round(done / self.total_frames, 4) if self.total_frames else 0.0,
+                "frames_per_second": round(fps, 2),
+                "elapsed_seconds": round(elapsed, 1),
+                "eta_seconds": round(remaining / fps, 1) if fps > 0 and not self.finished else None,
+                "events": self.events,
+                "class_frames": dict(self.class_frames),
+                "output_ready": self.status == "completed",
+            }
+
+
+def scan_frames(path: str):
+    """Count frames and find keyframes by demuxing only, without decoding"""
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_FORMAT, -1])
+    frames, keyframes = 0, []
+    try:
+        while cap.grab():
+            if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                keyframes.append(frames)
+            frames += 1
+    finally:
+        cap.release()
+    return frames, keyframes
+
+
+def probe_video(path: str) -> Tuple[float, Tuple[int, int]]:
+    """Frame rate and (width, height) of a video; ValueError if not even its first frame decodes"""
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened() or not cap.read()[0]:
+            raise ValueError("The video could not be opened or has no frames")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+    return fps, size
+
+
+def plan_chunks(selected: List[int], source_frames: int, chunk_frames: int) -> List[VideoChunk]:
+    """Split the selected frames into time chunks of chunk_frames source frames"""
+    chunk_frames = max(1, chunk_frames)
+    chunks = []
+    for start in range(0, source_frames, chunk_frames):
+        end = min(source_frames, start + chunk_frames)
+        frames = [i for i in selected if start <= i < end]
+        if frames:
+            chunks.append(VideoChunk(len(chunks), start, end, frames))
+    return chunks
+
+
+def event_frames(sightings: List[Dict[str, List[int]]], fps: float,
+                 gap_seconds: float = VIDEO_EVENT_GAP_SECONDS) -> List[Tuple[int, str]]:
+    """(frame index, class) of each event, at most one per class every gap_seconds of video.
+
+    ``sightings`` holds, for each chunk in video order, the frames each class
+    was seen in. They are merged before spacing the events out, so an object
+    seen on both sides of a chunk boundary is not reported twice.
+    """
+    merged: Dict[str, List[int]] = {}
+    for chunk_sightings in sightings:
+        for class_name, indices in chunk_sightings.items():
+            merged.setdefault(class_name, []).extend(indices)
+
+    events = []
+    for class_name, indices in merged.items():
+        last_event = float("-inf")
+        for index in indices:
+            video_time = index / fps
+            if video_time - last_event >= gap_seconds:
+                last_event = video_time
+                events.append((index, class_name))
+    return sorted(events)
+
+
+class VideoJobManager:
+    """Runs uploaded videos through the models as background jobs.
+
+    A job scans the file, selects frames (every ``frame_stride``-th frame, or
+    only keyframes, which are reached by seeking instead of decoding
+    everything in between) and splits them into time chunks. Chunks are
+    decoded in parallel on a shared thread pool and their frames go through
+    the same batching ``InferenceScheduler`` as the live cameras. Each chunk
+    writes its own annotated part file; the parts are joined into one output
+    video when the job completes. Events are saved then too, spaced out over
+    the whole video and timestamped at the upload time plus their position in
+    the video.
+    """
+
+    def __init__(self, scheduler, event_sink, job_dir: str = VIDEO_JOB_DIR,
+                 chunk_seconds: float = VIDEO_CHUNK_SECONDS,
+                 workers: int = VIDEO_JOB_WORKERS,
+                 history: int = VIDEO_JOB_HISTORY):
+        self.scheduler = scheduler
+        self.event_sink = event_sink
+        self.job_dir = job_dir
+        self.chunk_seconds = chunk_seconds
+        self.history = max(1, history)
+        self._chunk_pool = ThreadPoolExecutor(max(1, workers), thread_name_prefix="🎞️ Video Chunk")
+        self._jobs: "OrderedDict[str, VideoJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def create(self, filename: str, model_type: str, frame_stride: int = 1,
+               keyframes_only: bool = False) -> VideoJob:
+        """Register a job and create its directory; the caller saves the upload to input_path"""
+        job_id = uuid.uuid4().hex
+        directory = os.path.join(self.job_dir, job_id)
+        os.makedirs(directory, exist_ok=True)
+        job = VideoJob(
+            id=job_id,
+            filename=os.path.basename(filename or "video.mp4"),
+            model_type=model_type,
+            directory=directory,
+            frame_stride=max(1, frame_stride),
+            keyframes_only=keyframes_only
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+            self._forget_old_jobs()
+        return job
+
+    def start(self, job: VideoJob):
+        """Process a job whose input has been saved"""
+        threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"🎞️ Video Job {job.id[:8]}",
+            daemon=True
+        ).start()
+
+    def get(self, job_id: str) -> Optional[VideoJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[VideoJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def discard(self, job: VideoJob):
+        """Drop a job that never started, e.g. because its upload failed"""
+        with self._lock:
+            self._jobs.pop(job.id, None)
+        shutil.rmtree(job.directory, ignore_errors=True)
+
+    def stop(self):
+        """Cancel running jobs and stop the chunk workers"""
+        self._stopping = True
+        self._chunk_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forget_old_jobs(self):
+        """Keep at most `history` jobs, removing the oldest finished ones and their files"""
+        for job in list(self._jobs.values()):
+            if len(self._jobs) <= self.history:
+                break
+            if job.finished:
+                del self._jobs[job.id]
+                shutil.rmtree(job.directory, ignore_errors=True)
+
+    def _run(self, job: VideoJob):
+        job.started_at = time.perf_counter()
+        job.status = "running"
+        try:
+            model = model_registry.get(job.model_type)
+
+            job.source_fps, size = probe_video(job.input_path)
+            job.source_frames, keyframes = scan_frames(job.input_path)
+            candidates = keyframes if job.keyframes_only else range(job.source_frames)
+            selected = list(candidates)[::job.frame_stride]
+            job.total_frames = len(selected)
+            if not selected:
+                raise ValueError("No frames were selected for analysis" +
+                                 (" (the video has no keyframes)" if job.keyframes_only else ""))
+
+            chunks = plan_chunks(selected, job.source_frames, int(self.chunk_seconds * job.source_fps))
+            # Keep the output's playback speed close to the source
+            output_fps = max(1.0, job.source_fps * len(selected) / max(1, job.source_frames))
+
+            futures = [
+                self._chunk_pool.submit(self._process_chunk, job, chunk, model, size, output_fps)
+                for chunk in chunks
+            ]
+            parts, sightings = zip(*(future.result() for future in futures))
+
+            self._join_parts(list(parts), job.output_path, size, output_fps)
+            job.events = self._save_events(job, list(sightings))
+            job.status = "completed"
+        except Exception as e:
+            job.status = "cancelled" if self._stopping else "failed"
+            job.error = str(e)
+            logging.error(f"Video job {job.id} failed: {str(e)}")
+            for name in os.listdir(job.directory):
+                if name.startswith("part_"):
+                    os.remove(os.path.join(job.directory, name))
+        finally:
+            job.finished_at = time.perf_counter()
+
+    def _process_chunk(self, job: VideoJob, chunk: VideoChunk, model, size,
+                       output_fps) -> Tuple[str, Dict[str, List[int]]]:
+        """Decode, infer and annotate one chunk into its own part file.
+
+        Returns the part's path and the frames each class was seen in.
+        """
+        part_path = os.path.join(job.directory, f"part_{chunk.index:05d}.mp4")
+        cap = cv2.VideoCapture(job.input_path)
+        writer = cv2.VideoWriter(part_path, cv2.VideoWriter_fourcc(*OUTPUT_FOURCC), output_fps, size)
+        sightings: Dict[str, List[int]] = {}
+        try:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, chunk.start)
+            position = chunk.start
+            batch = []
+            for index in chunk.frames:
+                if self._stopping or job.status != "running":
+                    raise RuntimeError("Job cancelled")
+
+                if job.keyframes_only:
+                    # Seeking to a keyframe decodes just that frame
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                else:
+                    # grab() skips a frame without converting it to BGR
+                    while position < index and cap.grab():
+                        position += 1
+                ok, frame = cap.read()
+                position = index + 1
+                if not ok:
+                    # The rest of the chunk cannot be decoded: report it instead of ending short silently
+                    missing = len(chunk.frames) - chunk.frames.index(index)
+                    job.record_unreadable(missing)
+                    logging.warning(
+                        f"Video job {job.id}: could not decode frame {index}, "
+                        f"skipping the last {missing} frames of chunk {chunk.index}"
+                    )
+                    break
+
+                batch.append((index, frame, self.scheduler.submit(model, frame)))
+                if len(batch) >= VIDEO_BATCH_FRAMES:
+                    self._finish_batch(job, batch, writer, sightings)
+                    batch = []
+            self._finish_batch(job, batch, writer, sightings)
+        finally:
+            writer.release()
+            cap.release()
+        return part_path, sightings
+
+    @staticmethod
+    def _finish_batch(job: VideoJob, batch, writer, sightings: Dict[str, List[int]]):
+        """Wait for a batch of inference results, then annotate, write and record them"""
+        for index, frame, future in batch:
+            annotated_frame, detections = annotate_result(frame, future.result())
+            writer.write(annotated_frame)
+            for class_name in set(detections.class_names):
+                sightings.setdefault(class_name, []).append(index)
+            job.record_frame(detections.class_names)
+
+    def _save_events(self, job: VideoJob, sightings: List[Dict[str, List[int]]]) -> int:
+        """Queue the job's events, in video order; returns how many were accepted"""
+        events = 0
+        for index, class_name in event_frames(sightings, job.source_fps):
+            events += self.event_sink.submit(
+                class_name, job.model_type, VIDEO_CAMERA_ID,
+                timestamp=job.created_at + timedelta(seconds=index / job.source_fps),
+                camera_name=f"Video: {job.filename}"
+            )
+        return events
+
+    @staticmethod
+    def _join_parts(parts: List[str], output_path: str, size, output_fps: float):
+        """Concatenate the chunk part files, in order, into the output video.
+
+        The parts share codec, size and frame rate, so ffmpeg's concat demuxer
+        joins them by copying the encoded stream; nothing is decoded or
+        encoded a second time.
+        """
+        if len(parts) == 1:
+            os.replace(parts[0], output_path)
+            return
+        ffmpeg = ffmpeg_executable()
+        if ffmpeg is None:
+            logging.warning("ffmpeg not found (pip install imageio-ffmpeg); re-encoding video parts to join them")
+            _reencode_parts(parts, output_path, size, output_fps)
+            return
+
+        list_path = os.path.join(os.path.dirname(output_path), "parts.txt")
+        with open(list_path, "w") as f:
+            for part in parts:
+                f.write(f"file '{os.path.abspath(part)}'\n")
+        try:
+            process = subprocess.run(
+                [ffmpeg, "-v", "error", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+                 "-c", "copy", "-movflags", "+faststart", output_path],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+            )
+            if process.returncode != 0:
+                raise RuntimeError(f"Joining video parts failed: {process.stderr.decode(errors='replace').strip()}")
+        finally:
+            os.remove(list_path)
+        for part in parts:
+            os.remove(part)
+
+
+def ffmpeg_executable() -> Optional[str]:
+    """The ffmpeg binary bundled with imageio-ffmpeg, else one on the PATH"""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg")
+
+
+def _reencode_parts(parts: List[str], output_path: str, size, output_fps: float):
+    """Fallback join without ffmpeg: decode every part and encode it again"""
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*OUTPUT_FOURCC), output_fps, size)
+    try:
+        for part in parts:
+            cap = cv2.VideoCapture(part)
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    break  # End of the part
+                writer.write(frame)
+            cap.release()
+            os.remove(part)
+    finally:
+        writer.release()
@@ -162,6 +162,12 @@ const SplitViewContainer = styled(Box)(({ theme }) => ({
     gridTemplateColumns: 'repeat(auto-fit, minmax(400px, 1fr))',
 }));
 
+// The backend pushes a new JPEG part whenever the camera produces a frame;
+// the grid only needs thumbnails, and the timestamp makes the browser open
+// a fresh stream after a restart
+const streamUrl = (cameraId, tier = 'thumbnail') =>
+    `http://localhost:8000/stream/${cameraId}?tier=${tier}&t=${Date.now()}`;
+
 // Main component
 const LiveAnalysis = () => {
     const [cameras, setCameras] = useState([]);
@@ -193,7 +199,7 @@ const LiveAnalysis = () => {
                         return {
                             ...camera,
                             isStreaming: isActive,
-                            videoSrc: isActive ? URL.createObjectURL(frameResponse.data) : '',
+                            videoSrc: isActive ? streamUrl(camera.id) : '',
                         };
                     } catch (error) {
                         return {
@@ -214,57 +220,6 @@ const LiveAnalysis = () => {
         checkExistingStreams();
     }, []);
 
-    // Modify the frame fetching useEffect
-    useEffect(() => {
-        const intervals = {};
-        
-        // Create separate intervals for each streaming camera
-        cameras.forEach(camera => {
-            if (camera.isStreaming) {
-                intervals[camera.id] = setInterval(async () => {
-                    try {
-                        const response = await axios.get(
-                            `http://localhost:8000/process_frame/${camera.id}`,
-                            { responseType: 'blob' }
-                        );
-                        
-                        const url = URL.createObjectURL(response.data);
-                        
-                        setCameras(prevCameras => {
-                            return prevCameras.map(prevCamera => {
-                                if (prevCamera.id === camera.id) {
-                                    // Cleanup old URL
-                                    if (prevCamera.videoSrc) {
-                                        URL.revokeObjectURL(prevCamera.videoSrc);
-                                    }
-                                    return { ...prevCamera, videoSrc: url };
-                                }
-                                return prevCamera;
-                            });
-                        });
-                    } catch (error) {
-                        console.error(`Error fetching frame for camera ${camera.id}:`, error);
-                    }
-                }, 100); // 100ms interval for each camera
-            }
-        });
-        
-        // Cleanup function
-        return () => {
-            // Clear all intervals
-            Object.values(intervals).forEach(interval => clearInterval(interval));
-            
-            // Cleanup URLs if stopping all streams
-            if (!isStreaming) {
-                cameras.forEach(camera => {
-                    if (camera.videoSrc) {
-                        URL.revokeObjectURL(camera.videoSrc);
-                    }
-                });
-            }
-        };
-    }, [cameras, isStreaming]);
-
     const startWebcamStream = async () => {
         try {
             // Start all cameras with selected model
@@ -277,6 +232,7 @@ const LiveAnalysis = () => {
             const updatedCameras = cameras.map(camera => ({
                 ...camera,
                 isStreaming: true,
+                videoSrc: streamUrl(camera.id),
             }));
             
             setCameras(updatedCameras);
@@ -315,6 +271,7 @@ const LiveAnalysis = () => {
             const updatedCameras = cameras.map(camera => ({
                 ...camera,
                 isStreaming: camera.id === cameraId ? true : camera.isStreaming,
+                videoSrc: camera.id === cameraId ? streamUrl(camera.id) : camera.videoSrc,
             }));
             
             setCameras(updatedCameras);
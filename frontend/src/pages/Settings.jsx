@@ -110,7 +110,11 @@ const Settings = () => {
     source_name: '',
     stream_type: 'live',
     stream: '',
-    location: ''
+    location: '',
+    motion_threshold: '',
+    priority: '',
+    allowed_classes: '',
+    model_backend: ''
   });
 
   useEffect(() => {
@@ -134,7 +138,11 @@ const Settings = () => {
         source_name: camera.source_name,
         stream_type: camera.stream_type,
         stream: camera.stream,
-        location: camera.location
+        location: camera.location,
+        motion_threshold: camera.motion_threshold ?? '',
+        priority: camera.priority ?? '',
+        allowed_classes: (camera.allowed_classes || []).join(', '),
+        model_backend: camera.model_backend ?? ''
       });
     } else {
       setEditingCamera(null);
@@ -142,7 +150,11 @@ const Settings = () => {
         source_name: '',
         stream_type: 'live',
         stream: '',
-        location: ''
+        location: '',
+        motion_threshold: '',
+        priority: '',
+        allowed_classes: '',
+        model_backend: ''
       });
     }
     setShowCameraDialog(true);
@@ -155,7 +167,11 @@ const Settings = () => {
       source_name: '',
       stream_type: 'live',
       stream: '',
-      location: ''
+      location: '',
+      motion_threshold: '',
+      priority: '',
+      allowed_classes: '',
+      model_backend: ''
     });
   };
 
@@ -473,6 +489,55 @@ const Settings = () => {
                   }}
                 />
               </Grid>
+              <Grid item xs={12}>
+                <TextField
+                  fullWidth
+                  type="number"
+                  label="Motion Threshold"
+                  value={cameraData.motion_threshold}
+                  onChange={(e) => setCameraData({...cameraData, motion_threshold: e.target.value})}
+                  inputProps={{ min: 0, max: 1, step: 0.001 }}
+                  helperText="Share of pixels that must change before a frame is analysed again (blank for default, 0 to analyse every frame)"
+                />
+              </Grid>
+              <Grid item xs={12}>
+                <TextField
+                  fullWidth
+                  type="number"
+                  label="Priority"
+                  value={cameraData.priority}
+                  onChange={(e) => setCameraData({...cameraData, priority: e.target.value})}
+                  inputProps={{ step: 1 }}
+                  helperText="Higher priority cameras keep their frame rate and resolution longest when the system is overloaded (blank for 0)"
+                />
+              </Grid>
+              <Grid item xs={12}>
+                <TextField
+                  fullWidth
+                  label="Allowed Classes"
+                  value={cameraData.allowed_classes}
+                  onChange={(e) => setCameraData({...cameraData, allowed_classes: e.target.value})}
+                  helperText="Comma-separated classes to detect, e.g. person, bottle (blank for all)"
+                />
+              </Grid>
+              <Grid item xs={12}>
+                <FormControl fullWidth>
+                  <InputLabel>Model Backend</InputLabel>
+                  <Select
+                    value={cameraData.model_backend}
+                    onChange={(e) => setCameraData({...cameraData, model_backend: e.target.value})}
+                    label="Model Backend"
+                  >
+                    <MenuItem value="">Default</MenuItem>
+                    <MenuItem value="pytorch">PyTorch</MenuItem>
+                    <MenuItem value="onnx">ONNX Runtime</MenuItem>
+                    <MenuItem value="onnx-int8">ONNX Runtime (INT8)</MenuItem>
+                    <MenuItem value="openvino">OpenVINO</MenuItem>
+                    <MenuItem value="openvino-fp16">OpenVINO (FP16)</MenuItem>
+                    <MenuItem value="openvino-int8">OpenVINO (INT8)</MenuItem>
+                  </Select>
+                </FormControl>
+              </Grid>
             </Grid>
           </DialogContent>
           <DialogActions sx={{ px: 3, pb: 3 }}>
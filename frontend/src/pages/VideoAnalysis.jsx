@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import {
     Box,
@@ -59,6 +59,24 @@ const VideoAnalysis = () => {
     const [uploadProgress, setUploadProgress] = useState(0);
     const [isProcessing, setIsProcessing] = useState(false);
     const [selectedFile, setSelectedFile] = useState(null);
+    const [job, setJob] = useState(null);
+
+    // Poll the analysis job until it finishes
+    useEffect(() => {
+        if (!job || !['queued', 'running'].includes(job.status)) return;
+        const timer = setTimeout(async () => {
+            try {
+                const response = await axios.get(`http://localhost:8000/api/video-jobs/${job.job_id}`);
+                setJob(response.data);
+            } catch (error) {
+                console.error('Error fetching video job:', error);
+                setJob({ ...job, status: 'failed', error: 'Lost track of the analysis job' });
+            }
+        }, 1000);
+        return () => clearTimeout(timer);
+    }, [job]);
+
+    const jobActive = job && ['queued', 'running'].includes(job.status);
 
     const handleFileSelect = (event) => {
         const file = event.target.files[0];
@@ -75,8 +93,9 @@ const VideoAnalysis = () => {
         formData.append('model_type', selectedModel);
 
         setIsProcessing(true);
+        setJob(null);
         try {
-            await axios.post('http://localhost:8000/upload_video', formData, {
+            const response = await axios.post('http://localhost:8000/upload_video', formData, {
                 headers: {
                     'Content-Type': 'multipart/form-data',
                 },
@@ -87,6 +106,7 @@ const VideoAnalysis = () => {
                     setUploadProgress(progress);
                 },
             });
+            setJob(response.data);
             
             setUploadProgress(0);
             setSelectedFile(null);
@@ -136,7 +156,7 @@ const VideoAnalysis = () => {
                                         <FormControlLabel
                                             key={value}
                                             value={value}
-                                            disabled={isProcessing}
+                                            disabled={isProcessing || jobActive}
                                             control={<Radio />}
                                             label={label}
                                         />
@@ -218,7 +238,7 @@ const VideoAnalysis = () => {
                                 <ControlButton
                                     variant="contained"
                                     color="secondary"
-                                    disabled={!selectedFile || isProcessing}
+                                    disabled={!selectedFile || isProcessing || jobActive}
                                     onClick={handleUpload}
                                     fullWidth
                                 >
@@ -250,7 +270,37 @@ const VideoAnalysis = () => {
                                     </Typography>
                                 </>
                             )}
-                            {!isProcessing && !selectedFile && (
+                            {!isProcessing && job && (
+                                <>
+                                    {jobActive && (
+                                        <CircularProgress
+                                            variant={job.total_frames ? "determinate" : "indeterminate"}
+                                            value={job.progress * 100}
+                                        />
+                                    )}
+                                    <Typography variant="body1" color="text.secondary">
+                                        {jobActive
+                                            ? `Analysing ${job.filename}: ${job.processed_frames}/${job.total_frames} frames`
+                                                + ` (${job.frames_per_second} fps`
+                                                + (job.eta_seconds != null ? `, ${Math.ceil(job.eta_seconds)}s left)` : ')')
+                                            : `${job.filename}: ${job.status}${job.error ? ` - ${job.error}` : ''}`}
+                                    </Typography>
+                                    {job.status === 'completed' && (
+                                        <>
+                                            <Typography variant="body2" color="text.secondary">
+                                                {job.events} detection events, {job.processed_frames} frames analysed
+                                            </Typography>
+                                            <ControlButton
+                                                variant="outlined"
+                                                href={`http://localhost:8000/api/video-jobs/${job.job_id}/output`}
+                                            >
+                                                Download Annotated Video
+                                            </ControlButton>
+                                        </>
+                                    )}
+                                </>
+                            )}
+                            {!isProcessing && !job && !selectedFile && (
                                 <Typography variant="h6" color="text.secondary">
                                     Select a video file to begin analysis
                                 </Typography>